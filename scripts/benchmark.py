@@ -0,0 +1,230 @@
+#!/usr/bin/python3
+from __future__ import annotations
+
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+
+from collections.abc import Callable
+from pathlib import Path
+
+
+# ------ Benchmark paths ------
+SCRIPTS_PATH = Path(__file__).parent.resolve()
+ROOT_PATH = SCRIPTS_PATH.parent.resolve()
+PROJECT_PATH = ROOT_PATH.joinpath("src").resolve()
+
+# The benchmarks run offscreen, the window is never shown.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+# The caches on disk go to a scratch directory, the user ones are left untouched.
+CACHE_PATH = Path(tempfile.mkdtemp(prefix="doggo-benchmark-"))
+atexit.register(shutil.rmtree, CACHE_PATH, ignore_errors=True)
+os.environ["DOGGO_CACHE_DIR"] = str(CACHE_PATH)
+sys.path.insert(0, str(PROJECT_PATH))
+
+import pygame as pg
+
+from doggo import ASSETS_PATH
+from doggo import config
+from doggo import prepare
+from doggo.clock import VirtualClock
+from doggo.dog import StateID
+from doggo.dog.brain import Brain
+from doggo.world import World
+from loguru import logger
+
+
+Benchmark = tuple[str, Callable[[], object]]
+
+
+def build_world(
+    render_size: tuple[int, int] | None = None,
+    dogs: int = 1,
+    clock: VirtualClock | None = None,
+) -> World:
+    """Build a world with the default settings, rendered offscreen."""
+    return World(
+        title=config.WORLD_TITLE,
+        size=(config.WORLD_WIDTH, config.WORLD_HEIGHT),
+        icon=ASSETS_PATH.joinpath("icon.png"),
+        fps=config.WORLD_FPS,
+        render_size=render_size,
+        clock=clock or VirtualClock(),
+        dogs=dogs,
+    )
+
+
+def runtime_benchmarks() -> list[Benchmark]:
+    """Benchmarks of the work done at each frame."""
+    clock = VirtualClock()
+    brain = Brain.from_config(state_configs=config.DOG_STATES, clock=clock)
+    dog = prepare.build_dog(clock=clock)
+    probs = [1 / len(StateID)] * len(StateID)
+
+    def brain_update() -> None:
+        clock.advance(1 / config.WORLD_FPS)
+        brain.update()
+
+    def dog_update() -> None:
+        clock.advance(1 / config.WORLD_FPS)
+        dog.update(dt=1 / config.WORLD_FPS, now=clock.now())
+
+    return [
+        ("brain_update", brain_update),
+        ("state_random_with_probs", lambda: StateID.random_with_probs(probs)),
+        ("body_get_image", lambda: dog.body.get_image(dog.brain, now=clock.now())),
+        ("dog_update", dog_update),
+    ]
+
+
+def render_benchmarks() -> list[Benchmark]:
+    """Benchmarks of the rendering of a frame, at the world size and scaled."""
+    benchmarks: list[Benchmark] = []
+    for name, render_size in (
+        ("world_render", None),
+        ("world_render_scaled", (1280, 400)),
+    ):
+        world = build_world(render_size=render_size)
+        benchmarks.append((name, world.render))
+
+    # A whole kennel, moving at each frame.
+    clock = VirtualClock()
+    kennel = build_world(render_size=(1280, 400), dogs=100, clock=clock)
+
+    def kennel_frame() -> None:
+        clock.advance(1 / config.WORLD_FPS)
+        kennel.get_dt()
+        kennel.update()
+        kennel.render()
+
+    benchmarks.append(("world_frame_scaled_100_dogs", kennel_frame))
+
+    return benchmarks
+
+
+def startup_benchmarks() -> list[Benchmark]:
+    """Benchmarks of the loading of the assets, with cold caches."""
+
+    def clear_caches() -> None:
+        prepare.get_atlas.cache_clear()
+        for path in CACHE_PATH.iterdir():
+            path.unlink()
+
+    def build_dog() -> None:
+        clear_caches()
+        prepare.get_frame_store.cache_clear()
+        prepare.build_dog()
+
+    def build_landscape() -> None:
+        clear_caches()
+        prepare.build_landscape()
+
+    return [
+        ("startup_build_dog", build_dog),
+        ("startup_build_landscape", build_landscape),
+    ]
+
+
+def measure(func: Callable[[], object], repeat: int) -> dict[str, float | int]:
+    """Time the function, in seconds per call."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    timings = [timing / number for timing in timer.repeat(repeat=repeat, number=number)]
+
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "stdev": statistics.stdev(timings) if repeat > 1 else 0.0,
+    }
+
+
+def get_commit() -> str | None:
+    """Return the current commit of the repository, if any."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_PATH, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(repeat: int, selection: str | None) -> dict[str, object]:
+    """Run the selected benchmarks and return the report, with the environment."""
+    results = {}
+    # The worlds come first, they set up the display the assets are converted for.
+    for group in (render_benchmarks, runtime_benchmarks, startup_benchmarks):
+        for name, func in group():
+            if selection and selection not in name:
+                continue
+            logger.info("Benchmark {}.", name)
+            results[name] = measure(func, repeat=repeat)
+
+    return {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "pygame": pg.version.ver,
+        "platform": platform.platform(),
+        "video_driver": os.environ["SDL_VIDEODRIVER"],
+        "results": results,
+    }
+
+
+def compare(report: dict[str, object], baseline_path: Path, threshold: float) -> bool:
+    """Print the changes against a previous report, return False on regression."""
+    baseline = json.loads(baseline_path.read_text())
+    ok = True
+    results: dict[str, dict[str, float]] = report["results"]  # type: ignore[assignment]
+    for name, result in results.items():
+        if name not in baseline["results"]:
+            continue
+        ratio = result["median"] / baseline["results"][name]["median"]
+        regression = ratio > 1 + threshold
+        ok = ok and not regression
+        print(
+            f"{name:<28}{ratio:>8.2f}x{'  REGRESSION' if regression else ''}",
+            file=sys.stderr,
+        )
+
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Doggo benchmark script.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timings per benchmark.")
+    parser.add_argument("--select", type=str, default=None, help="Benchmark filter.")
+    parser.add_argument("--output", type=Path, default=None, help="JSON report path.")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline report.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Slowdown ratio over the baseline counted as a regression.",
+    )
+
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+    # Keep the logs of the benchmarked code out of the way.
+    logger.disable("doggo")
+
+    report = run_benchmarks(repeat=args.repeat, selection=args.select)
+    output = json.dumps(report, indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        args.output.write_text(output + "\n")
+
+    if args.compare is not None and not compare(report, args.compare, args.threshold):
+        sys.exit(1)
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import os
 import sys
 
 from pathlib import Path
 
+
+if os.getenv("DOGGO_STARTUP_TIMING", "False").lower() in ("1", "true"):
+    # Start as early as possible, to time all the imports of doggo.
+    from doggo import startup
+
+    startup.start()
+
 from doggo.config import COMPILED_ENV
 
 
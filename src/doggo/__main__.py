@@ -1,29 +1,297 @@
 from __future__ import annotations
 
+import argparse
+import time
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
 from doggo import ASSETS_PATH
 from doggo import config
+from doggo import startup
+from doggo.clock import ScaledClock
 from doggo.config import COMPILED_ENV
 from doggo.config import WIN
+from doggo.log import setup_logging
+from doggo.prepare import get_behavior
+from doggo.prepare import load_behavior
 from doggo.world import World
 
 
+if TYPE_CHECKING:
+    from doggo.sweep import TransitionKey
+
+
 if COMPILED_ENV and WIN:
     # Import the PyInstaller splash screen module only if the app is compiled and
     # running on Windows.
     import pyi_splash
 
 
+def positive_int(text: str) -> int:
+    """Parse a strictly positive integer argument."""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+
+    return value
+
+
+def positive_float(text: str) -> float:
+    """Parse a strictly positive number argument."""
+    value = float(text)
+    if not value > 0:
+        raise argparse.ArgumentTypeError(f"must be positive, got {value}")
+
+    return value
+
+
+def grid_axis(text: str) -> tuple[TransitionKey, list[float]]:
+    """Parse a sweep grid axis, the sweep module is only loaded when sweeping."""
+    from doggo.sweep import parse_grid_axis
+
+    try:
+        return parse_grid_axis(text)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(prog="doggo", description=config.WORLD_TITLE)
+    subparsers = parser.add_subparsers(dest="command")
+
+    simulate_parser = subparsers.add_parser(
+        "simulate",
+        help="Run the dog brains headless, on a virtual clock, and report stats.",
+    )
+    simulate_parser.add_argument(
+        "--days", type=positive_float, default=1.0, help="Simulated days (default: 1)."
+    )
+    simulate_parser.add_argument(
+        "--dogs",
+        type=positive_int,
+        default=1,
+        help="Number of simulated dogs (default: 1).",
+    )
+    simulate_parser.add_argument("--seed", type=int, default=None, help="RNG seed.")
+
+    subparsers.add_parser(
+        "analyze",
+        help="Compute the long run behavior of the dog brains from their transitions.",
+    )
+
+    sweep_parser = subparsers.add_parser(
+        "sweep",
+        help="Simulate a grid of transition probabilities over all the cores.",
+    )
+    sweep_parser.add_argument(
+        "--grid",
+        type=grid_axis,
+        action="append",
+        required=True,
+        metavar="SOURCE:TARGET=P1,P2,...",
+        help="Probabilities of a transition to sweep, can be repeated.",
+    )
+    sweep_parser.add_argument(
+        "--replicates",
+        type=positive_int,
+        default=4,
+        help="Runs per variant (default: 4).",
+    )
+    sweep_parser.add_argument(
+        "--days", type=positive_float, default=1.0, help="Simulated days (default: 1)."
+    )
+    sweep_parser.add_argument(
+        "--dogs", type=positive_int, default=100, help="Dogs per run (default: 100)."
+    )
+    sweep_parser.add_argument("--seed", type=int, default=None, help="RNG seed.")
+    sweep_parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=None,
+        help="Processes (default: all cores).",
+    )
+    sweep_parser.add_argument(
+        "--output", type=Path, default=Path("sweep"), help="Output folder."
+    )
+
+    behavior_parser = subparsers.add_parser(
+        "behavior",
+        help="Write the behavior profile of the dogs as JSON, to start a new one.",
+    )
+    behavior_parser.add_argument("path", type=Path, help="Profile file to write.")
+
+    replay_parser = subparsers.add_parser(
+        "replay",
+        help="Replay the transitions of a recorded run through the brains, and time it.",
+    )
+    replay_parser.add_argument("path", type=Path, help="Transition log to replay.")
+
+    return parser
+
+
+def simulate(days: float, dogs: int, seed: int | None) -> None:
+    """Simulate the dog brains and print the behavior statistics."""
+    from doggo.simulation import simulate
+
+    start = time.perf_counter()
+    report = simulate(
+        state_configs=get_behavior().state_configs,
+        dogs=dogs,
+        duration=days * 86400,
+        seed=seed,
+    )
+    elapsed = time.perf_counter() - start
+
+    print(report)
+    print(
+        f"\nSimulated in {elapsed:.2f}s "
+        f"({report.transitions / max(elapsed, 1e-9):,.0f} transitions/s)."
+    )
+
+
+def sweep(args: argparse.Namespace) -> None:
+    """Run a sweep of the transition probabilities and write the results."""
+    from doggo.sweep import Sweep
+    from doggo.sweep import run_sweep
+
+    grid = dict(args.grid)
+    try:
+        sweep = Sweep(
+            state_configs=get_behavior().state_configs,
+            grid=grid,
+            replicates=args.replicates,
+            dogs=args.dogs,
+            duration=args.days * 86400,
+            seed=args.seed,
+        )
+    except ValueError as error:
+        raise SystemExit(f"doggo sweep: error: {error}") from None
+
+    start = time.perf_counter()
+    rows = run_sweep(sweep=sweep, output=args.output, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    print(f"Swept {rows} runs in {elapsed:.2f}s, results in {args.output}.")
+
+
+def analyze() -> None:
+    """Analyze the dog brains Markov chain and print the behavior statistics."""
+    from doggo.dog.brain import BehaviorAnalysis
+
+    start = time.perf_counter()
+    report = str(
+        BehaviorAnalysis.from_config(state_configs=get_behavior().state_configs)
+    )
+    elapsed = time.perf_counter() - start
+
+    print(report)
+    print(f"\nAnalyzed in {elapsed * 1000:.1f}ms.")
+
+
+def behavior(path: Path) -> None:
+    """Write the current behavior profile to a JSON file."""
+    import json
+
+    from doggo.behavior import dump_profile
+
+    path.write_text(json.dumps(dump_profile(get_behavior()), indent=2))
+    print(f"Behavior profile written to {path}.")
+
+
+def replay(path: Path) -> None:
+    """Replay the transitions of a log and print how long it took."""
+    from doggo.recorder import read_transitions
+    from doggo.recorder import replay
+
+    transitions = list(read_transitions(path))
+    start = time.perf_counter()
+    brains = replay(transitions=transitions, state_configs=get_behavior().state_configs)
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"Replayed {len(transitions)} transitions of {len(brains)} dog(s) in "
+        f"{elapsed:.3f}s ({len(transitions) / max(elapsed, 1e-9):,.0f} transitions/s)."
+    )
+
+
 def run() -> None:
     """Run Doggo.
 
-    Initialize the pygame and start the world.
+    Initialize the pygame and start the world, or run the given command.
     """
+    startup.mark("imports")
+    setup_logging(level=config.DOGGO_LOG_LEVEL, max_size=config.LOG_QUEUE_SIZE)
+    args = build_parser().parse_args()
+
+    if args.command == "simulate":
+        simulate(days=args.days, dogs=args.dogs, seed=args.seed)
+        return
+
+    if args.command == "sweep":
+        sweep(args)
+        return
+
+    if args.command == "analyze":
+        analyze()
+        return
+
+    if args.command == "behavior":
+        behavior(path=args.path)
+        return
+
+    if args.command == "replay":
+        replay(path=args.path)
+        return
+
+    # Only the world uses the settings, the commands print their reports alone.
+    config.log_settings()
+
+    profiler = None
+    if config.DOGGO_PROFILER:
+        # The profiler needs numpy, only loaded when profiling.
+        from doggo.profiler import FrameProfiler
+
+        profiler = FrameProfiler(budget=1 / config.WORLD_FPS)
+
+    watcher = None
+    if config.DOGGO_BEHAVIOR:
+        from doggo.behavior import ProfileWatcher
+
+        watcher = ProfileWatcher(path=Path(config.DOGGO_BEHAVIOR), load=load_behavior)
+
+    recorder = player = None
+    if config.DOGGO_REPLAY:
+        from doggo.recorder import TransitionPlayer
+        from doggo.recorder import read_transitions
+
+        player = TransitionPlayer(read_transitions(Path(config.DOGGO_REPLAY)))
+    if config.DOGGO_RECORD:
+        from doggo.recorder import TransitionRecorder
+
+        recorder = TransitionRecorder(Path(config.DOGGO_RECORD))
+
     world = World(
         title=config.WORLD_TITLE,
         size=(config.WORLD_WIDTH, config.WORLD_HEIGHT),
         icon=ASSETS_PATH.joinpath("icon.png"),
         fps=config.WORLD_FPS,
+        time_step=config.WORLD_TIME_STEP,
         render_size=config.WORLD_RENDER_SIZE,
+        clock=(
+            ScaledClock(scale=config.DOGGO_TIME_SCALE)
+            if config.DOGGO_TIME_SCALE != 1
+            else None
+        ),
+        dirty_rects=config.DOGGO_DIRTY_RECTS,
+        prescale=config.DOGGO_PRESCALE,
+        dogs=config.DOGGO_DOGS,
+        profiler=profiler,
+        seed=config.DOGGO_SEED,
+        recorder=recorder,
+        player=player,
+        watcher=watcher,
     )
 
     if COMPILED_ENV and WIN:
@@ -0,0 +1,140 @@
+# Atlas module caches the sliced sprites on disk, for a fast startup.
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import struct
+
+from typing import TYPE_CHECKING
+from typing import Final
+
+import pygame as pg
+
+from loguru import logger
+
+from doggo import ASSETS_PATH
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+    from pathlib import Path
+
+
+MAGIC = b"DOGGOATL"
+HEADER = struct.Struct(f"<{len(MAGIC)}sI")  # Magic, index size.
+# The byte order of the 32 bits ARGB pixels of the displays, on little endian.
+PIXEL_FORMAT: Final = "BGRA"
+
+
+def hash_assets(path: Path = ASSETS_PATH) -> str:
+    """Return a hash of the path, size and modification time of the assets files.
+
+    Only the files metadata is read, so the hash is cheap to compute at each start.
+    """
+    digest = hashlib.sha256(PIXEL_FORMAT.encode())
+    for file in sorted(p for p in path.glob("**/*") if p.is_file()):
+        stat = file.stat()
+        digest.update(file.relative_to(path).as_posix().encode())
+        digest.update(struct.pack("<qq", stat.st_size, stat.st_mtime_ns))
+
+    return digest.hexdigest()[:16]
+
+
+def dog_frame_key(fur: int, row: int, column: int, flip_x: bool) -> str:
+    """Return the atlas key of a dog frame."""
+    return f"dogs/{fur:02d}/{row}/{column}/{int(flip_x)}"
+
+
+def landscape_layer_key(biome: int, row: int) -> str:
+    """Return the atlas key of a landscape layer."""
+    return f"landscape/{biome:02d}/{row}"
+
+
+class SpriteAtlas:
+    """A single file holding already sliced and flipped frames.
+
+    The file starts with a header and a JSON index mapping each frame key to its
+    offset and size, followed by the raw pixels of the frames. It's memory mapped and
+    the frames are created straight from the mapped pixels, without any decoding.
+
+    The pixels are stored in the format the frames are converted to for the display,
+    so the frames are blitted as they are, without a converted copy.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = path
+        with path.open("rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, index_size = HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise ValueError(f"Not a sprite atlas: {path}")
+
+        index = json.loads(self._buffer[HEADER.size : HEADER.size + index_size])
+        self._data_offset: int = HEADER.size + index_size
+        self._index: dict[str, tuple[int, int, int]] = {
+            key: tuple(entry) for key, entry in index.items()
+        }
+
+    @classmethod
+    def build(cls, path: Path, frames: Iterable[tuple[str, pg.Surface]]) -> None:
+        """Write the given frames into an atlas file."""
+        index: dict[str, tuple[int, int, int]] = {}
+        pixels = bytearray()
+        for key, frame in frames:
+            index[key] = (len(pixels), *frame.get_size())
+            pixels += pg.image.tobytes(frame, PIXEL_FORMAT)
+
+        encoded_index = json.dumps(index).encode()
+        # Write aside then rename, so a partially written atlas is never loaded.
+        tmp_path = path.with_suffix(".tmp")
+        with tmp_path.open("wb") as file:
+            file.write(HEADER.pack(MAGIC, len(encoded_index)))
+            file.write(encoded_index)
+            file.write(pixels)
+        tmp_path.replace(path)
+
+    def get(self, key: str) -> pg.Surface | None:
+        """Return a frame of the atlas, sharing the mapped pixels."""
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+
+        offset, width, height = entry
+        start = self._data_offset + offset
+        pixels = memoryview(self._buffer)[start : start + width * height * 4]
+
+        return pg.image.frombuffer(pixels, (width, height), PIXEL_FORMAT)
+
+    def __contains__(self, key: str) -> bool:
+        """Whether the atlas holds the given frame."""
+        return key in self._index
+
+    def __len__(self) -> int:
+        """Number of frames in the atlas."""
+        return len(self._index)
+
+
+def load_atlas(
+    cache_path: Path,
+    build_frames: Callable[[], Iterable[tuple[str, pg.Surface]]],
+    assets_path: Path = ASSETS_PATH,
+) -> SpriteAtlas:
+    """Load the atlas of the current assets, building it first if needed.
+
+    The atlas file is keyed by the hash of the assets files metadata, so any change
+    under the assets folder invalidates it, and the stale atlases are removed. The frames to store are
+    only built when the atlas is missing.
+    """
+    atlas_path = cache_path.joinpath(f"atlas-{hash_assets(assets_path)}.bin")
+
+    if not atlas_path.exists():
+        logger.debug("Build sprite atlas: {}", atlas_path)
+        cache_path.mkdir(parents=True, exist_ok=True)
+        for stale_path in cache_path.glob("atlas-*.bin"):
+            stale_path.unlink()
+        SpriteAtlas.build(path=atlas_path, frames=build_frames())
+
+    return SpriteAtlas(path=atlas_path)
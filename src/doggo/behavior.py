@@ -0,0 +1,246 @@
+# Behavior module loads the dog behavior profiles, from TOML or JSON files.
+from __future__ import annotations
+
+import json
+import math
+import tomllib
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+from loguru import logger
+
+from doggo.clock import MonotonicClock
+from doggo.dog import StateID
+from doggo.dog.brain import TransitionTable
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from doggo.clock import Clock
+    from doggo.dog.brain import StateConfig
+
+
+STATE_KEYS = {"transitions", "time_range", "speed", "animation_time_rate", "sprite"}
+
+
+class BehaviorProfile:
+    """The behavior of the dogs, compiled once into the tables the dogs use.
+
+    The transition table is shared by all the brains, the sprite configuration is
+    used to build the frame tables of the bodies.
+    """
+
+    def __init__(
+        self,
+        state_configs: list[StateConfig],
+        sprite_conf_per_state: dict[StateID, tuple[int, int]],
+    ) -> None:
+        self.state_configs: list[StateConfig] = sorted(
+            state_configs, key=lambda state_config: state_config["id"]
+        )
+        self.sprite_conf_per_state: dict[StateID, tuple[int, int]] = (
+            sprite_conf_per_state
+        )
+        self.transitions: TransitionTable = TransitionTable(
+            matrix=[
+                [state_config["transitions"][state_id] for state_id in StateID]
+                for state_config in self.state_configs
+            ]
+        )
+
+
+def parse_profile(
+    data: Any,
+    default_sprite_conf: dict[StateID, tuple[int, int]],
+    sprite_size: tuple[int, int],
+) -> tuple[list[StateConfig], dict[StateID, tuple[int, int]]]:
+    """Validate a profile and return its state and sprite configurations.
+
+    Every problem is reported at once. The transitions missing from a state are
+    impossible ones, and the sprite of a state defaults to the given one.
+    """
+    errors: list[str] = []
+    states = data.get("states") if isinstance(data, dict) else None
+    if not isinstance(states, dict):
+        raise ValueError("The profile must have a 'states' table")
+
+    unknown_states = set(states) - {state_id.name for state_id in StateID}
+    missing_states = {state_id.name for state_id in StateID} - set(states)
+    errors += [f"unknown state {name}" for name in sorted(unknown_states)]
+    errors += [f"missing state {name}" for name in sorted(missing_states)]
+
+    state_configs: list[StateConfig] = []
+    sprite_conf_per_state = dict(default_sprite_conf)
+    for state_id in StateID:
+        state = states.get(state_id.name)
+        if not isinstance(state, dict):
+            continue
+
+        name = state_id.name
+        errors += [
+            f"{name}: unknown key {key}" for key in sorted(set(state) - STATE_KEYS)
+        ]
+
+        transitions = state.get("transitions", {})
+        if not isinstance(transitions, dict):
+            errors.append(f"{name}: transitions must be a table")
+            continue
+        unknown_targets = set(transitions) - {target.name for target in StateID}
+        errors += [
+            f"{name}: unknown transition to {key}" for key in sorted(unknown_targets)
+        ]
+        probs = {target: transitions.get(target.name, 0.0) for target in StateID}
+        if not all(isinstance(p, int | float) and 0 <= p <= 1 for p in probs.values()):
+            errors.append(f"{name}: transition probabilities must be within [0, 1]")
+        elif not math.isclose(sum(probs.values()), 1.0):
+            errors.append(f"{name}: transition probabilities must sum to 1")
+
+        time_range = state.get("time_range")
+        if not (
+            isinstance(time_range, list)
+            and len(time_range) == 2
+            and all(isinstance(bound, int) for bound in time_range)
+            and 0 < time_range[0] <= time_range[1]
+        ):
+            errors.append(f"{name}: time_range must be two positive ordered integers")
+            continue
+
+        state_config: StateConfig = {
+            "id": state_id,
+            "transitions": {target: float(p) for target, p in probs.items()},
+            "time_range": (time_range[0], time_range[1]),
+        }
+        if "speed" in state:
+            if not isinstance(state["speed"], int) or state["speed"] < 0:
+                errors.append(f"{name}: speed must be a positive integer")
+            state_config["speed"] = state["speed"]
+        if "animation_time_rate" in state:
+            rate = state["animation_time_rate"]
+            if not isinstance(rate, int | float) or rate <= 0:
+                errors.append(f"{name}: animation_time_rate must be positive")
+            state_config["animation_time_rate"] = rate
+        if "sprite" in state:
+            sprite = state["sprite"]
+            rows, columns = sprite_size
+            if not (
+                isinstance(sprite, list)
+                and len(sprite) == 2
+                and all(isinstance(value, int) for value in sprite)
+                and 0 < sprite[0] <= columns
+                and 0 <= sprite[1] < rows
+            ):
+                errors.append(
+                    f"{name}: sprite must be [frames, row] within the sprite sheet"
+                )
+                continue
+            sprite_conf_per_state[state_id] = (sprite[0], sprite[1])
+
+        state_configs.append(state_config)
+
+    if errors:
+        raise ValueError("Invalid behavior profile: " + "; ".join(errors))
+
+    return state_configs, sprite_conf_per_state
+
+
+def read_profile(
+    path: Path,
+    default_sprite_conf: dict[StateID, tuple[int, int]],
+    sprite_size: tuple[int, int],
+) -> BehaviorProfile:
+    """Read, validate and compile a TOML or JSON behavior profile."""
+    content = path.read_bytes()
+    if path.suffix == ".json":
+        data = json.loads(content)
+    else:
+        data = tomllib.loads(content.decode())
+    state_configs, sprite_conf_per_state = parse_profile(
+        data, default_sprite_conf=default_sprite_conf, sprite_size=sprite_size
+    )
+    profile = BehaviorProfile(
+        state_configs=state_configs,
+        sprite_conf_per_state=sprite_conf_per_state,
+    )
+    logger.debug("Behavior profile compiled: {}", path)
+
+    return profile
+
+
+def dump_profile(profile: BehaviorProfile) -> dict[str, Any]:
+    """Return the profile as a JSON ready mapping, e.g. to start a new one."""
+    return {
+        "states": {
+            state_config["id"].name: {
+                "transitions": {
+                    target.name: p
+                    for target, p in state_config["transitions"].items()
+                    if p
+                },
+                "time_range": list(state_config["time_range"]),
+                **{
+                    key: state_config[key]
+                    for key in ("speed", "animation_time_rate")
+                    if key in state_config
+                },
+                "sprite": list(profile.sprite_conf_per_state[state_config["id"]]),
+            }
+            for state_config in profile.state_configs
+        }
+    }
+
+
+class ProfileWatcher:
+    """Watch a behavior profile file for changes.
+
+    The file modification time is checked at most once per interval, a single stat
+    call, so the watcher can be polled at each frame.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        load: Callable[[Path], BehaviorProfile],
+        interval: float = 1.0,
+        clock: Clock | None = None,
+    ) -> None:
+        self.path: Path = path
+        self.load: Callable[[Path], BehaviorProfile] = load
+        self.interval: float = interval
+        self.clock: Clock = clock or MonotonicClock()
+        self._next_check: float = self.clock.now() + interval
+        self._mtime: int | None = self._get_mtime()
+
+    def _get_mtime(self) -> int | None:
+        """Return the modification time of the file, None if it's missing."""
+        try:
+            return self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def poll(self) -> BehaviorProfile | None:
+        """Return the new profile if the file changed, otherwise None.
+
+        A profile which can't be loaded, e.g. while still being edited, is skipped
+        with a warning and the current one stays.
+        """
+        now = self.clock.now()
+        if now < self._next_check:
+            return None
+
+        self._next_check = now + self.interval
+        mtime = self._get_mtime()
+        if mtime is None or mtime == self._mtime:
+            return None
+
+        self._mtime = mtime
+        try:
+            profile = self.load(self.path)
+        except (OSError, ValueError) as error:
+            logger.warning("Behavior profile not reloaded: {}.", error)
+            return None
+
+        logger.info("Behavior profile reloaded: {}", self.path)
+        return profile
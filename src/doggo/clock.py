@@ -0,0 +1,63 @@
+# Clock module provides the time sources used by the world and the dogs.
+from __future__ import annotations
+
+import time
+
+from typing import Protocol
+
+
+class Clock(Protocol):
+    """A source of time, in seconds."""
+
+    # How fast the clock runs compared to the real time.
+    scale: float
+
+    def now(self) -> float:
+        """Return the current time."""
+        ...
+
+
+class MonotonicClock:
+    """The real time, backed by `time.perf_counter`."""
+
+    scale: float = 1.0
+
+    def now(self) -> float:
+        """Return the current time."""
+        return time.perf_counter()
+
+
+class VirtualClock:
+    """A frozen clock, only moving forward when told to."""
+
+    scale: float = 1.0
+
+    def __init__(self, start: float = 0.0) -> None:
+        self._now: float = start
+
+    def now(self) -> float:
+        """Return the current time."""
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward."""
+        assert seconds >= 0, "A clock can't go back in time"
+        self._now += seconds
+
+
+class ScaledClock:
+    """A clock running faster, or slower, than its source.
+
+    Useful to fast-forward the world, e.g. at 100x for soak tests and benchmarks.
+    """
+
+    def __init__(self, scale: float, source: Clock | None = None) -> None:
+        assert scale > 0, "The clock scale must be positive"
+
+        self.scale: float = scale
+        self.source: Clock = source or MonotonicClock()
+        self._origin: float = self.source.now()
+
+    def now(self) -> float:
+        """Return the current time."""
+        return self._origin + (self.source.now() - self._origin) * self.scale
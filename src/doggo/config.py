@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 import sys
 
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from loguru import logger
@@ -19,12 +20,75 @@ COMPILED_ENV = getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS")
 WIN = sys.platform.startswith("win")
 
 DOGGO_7_9_SCREEN = os.getenv("DOGGO_7_9_SCREEN", "False").lower() in ("1", "true")
-logger.debug(f"7.9 screen: {DOGGO_7_9_SCREEN}")
+# Speed up (or slow down) the time of the world, e.g. 100 to fast-forward.
+DOGGO_TIME_SCALE = float(os.getenv("DOGGO_TIME_SCALE", "1"))
+# Only redraw the areas of the screen which changed, instead of the whole frame.
+DOGGO_DIRTY_RECTS = os.getenv("DOGGO_DIRTY_RECTS", "False").lower() in ("1", "true")
+# Scale the assets once at load time instead of the whole frame at each frame.
+DOGGO_PRESCALE = os.getenv("DOGGO_PRESCALE", "True").lower() in ("1", "true")
+# Number of dogs living in the world.
+DOGGO_DOGS = int(os.getenv("DOGGO_DOGS", "1"))
+if DOGGO_DOGS < 1:
+    raise ValueError(f"DOGGO_DOGS must be at least 1, got {DOGGO_DOGS}")
+# Render rate of the world, the simulation runs at its own fixed rate.
+DOGGO_FPS = int(os.getenv("DOGGO_FPS", "30"))
+# Seed of the random draws, for reproducible runs.
+DOGGO_SEED = int(seed) if (seed := os.getenv("DOGGO_SEED")) else None
+# Write the transitions of the brains to this file.
+DOGGO_RECORD = os.getenv("DOGGO_RECORD")
+# Play the transitions of this file instead of drawing them.
+DOGGO_REPLAY = os.getenv("DOGGO_REPLAY")
+# Behavior profile of the dogs, a TOML or JSON file reloaded when changed.
+DOGGO_BEHAVIOR = os.getenv("DOGGO_BEHAVIOR")
+# Load the sliced sprites from an atlas cached on disk instead of decoding the assets.
+DOGGO_ATLAS = os.getenv("DOGGO_ATLAS", "False").lower() in ("1", "true")
+# Time each phase of the frames and log the statistics.
+DOGGO_PROFILER = os.getenv("DOGGO_PROFILER", "False").lower() in ("1", "true")
+# Log the cost of the imports and initialization steps until the first frame.
+DOGGO_STARTUP_TIMING = os.getenv("DOGGO_STARTUP_TIMING", "False").lower() in (
+    "1",
+    "true",
+)
+
+# Minimum level of the logs, the messages below it are skipped.
+DOGGO_LOG_LEVEL = os.getenv("DOGGO_LOG_LEVEL", "DEBUG").upper()
+LOG_QUEUE_SIZE = 1024  # Messages waiting to be written, the next ones are dropped
+
+
+def log_settings() -> None:
+    """Log the settings read from the environment, once the logging is set up."""
+    logger.debug("7.9 screen: {}", DOGGO_7_9_SCREEN)
+    logger.debug("Time scale: {}", DOGGO_TIME_SCALE)
+    logger.debug("Dirty rects: {}", DOGGO_DIRTY_RECTS)
+    logger.debug("Prescale: {}", DOGGO_PRESCALE)
+    logger.debug("Dogs: {}", DOGGO_DOGS)
+    logger.debug("FPS: {}", DOGGO_FPS)
+    logger.debug("Seed: {}", DOGGO_SEED)
+    logger.debug("Record: {}", DOGGO_RECORD)
+    logger.debug("Replay: {}", DOGGO_REPLAY)
+    logger.debug("Behavior: {}", DOGGO_BEHAVIOR)
+    logger.debug("Sprite atlas: {}", DOGGO_ATLAS)
+    logger.debug("Profiler: {}", DOGGO_PROFILER)
+    logger.debug("Startup timing: {}", DOGGO_STARTUP_TIMING)
+    logger.debug("Log level: {}", DOGGO_LOG_LEVEL)
+
+
+# --- Cache configuration ---
+
+if WIN:
+    _CACHE_ROOT = Path(os.getenv("LOCALAPPDATA", Path.home().joinpath("AppData/Local")))
+elif sys.platform == "darwin":
+    _CACHE_ROOT = Path.home().joinpath("Library/Caches")
+else:
+    _CACHE_ROOT = Path(os.getenv("XDG_CACHE_HOME", Path.home().joinpath(".cache")))
+CACHE_PATH = Path(os.getenv("DOGGO_CACHE_DIR", _CACHE_ROOT.joinpath("doggo")))
 
 # --- World configuration ---
 
 WORLD_TITLE = "Doggo"
-WORLD_FPS = 30
+WORLD_FPS = DOGGO_FPS
+# Fixed time step of the simulation, whatever the render rate.
+WORLD_TIME_STEP = 1 / 60
 # Screen size to Ratio 16:5 to fit 7.9" screen.
 WORLD_WIDTH = 340
 WORLD_HEIGHT = 106
@@ -33,11 +97,13 @@ WORLD_GROUND = (
     WORLD_HEIGHT - WORLD_GROUND_HEIGHT
 )  # The ground level in the world, where the dog can walk on.
 WORLD_RENDER_SIZE = (1280, 400) if DOGGO_7_9_SCREEN else None
+DOG_GROUND_DEPTH = 8  # How far behind the ground a dog of the pack can walk
 
 # --- Dog sprite sheet configuration ---
 
 SPRITE_SIZE = (9, 8)  # rows, columns in the sprite sheet
 SPRITE_DIRECTION = Direction.LEFT  # Default direction of the sprite
+SPRITE_FRAME_STORE_SIZE = 512  # Frames of the unused furs kept in memory
 # For each state, (number of frames, row index in the sprite sheet)
 SPRITE_CONF_PER_STATE = {
     StateID.IDLE: (6, 0),
@@ -5,8 +5,6 @@ import random
 from enum import IntEnum
 from enum import auto
 
-import numpy as np
-
 
 class StateID(IntEnum):
     """The possible states of the dog."""
@@ -25,15 +23,18 @@ class StateID(IntEnum):
     STAND_AND_BARK = auto()
     SLEEP = auto()
 
+    # Defined before the random method, which shadows the module in the annotations.
     @classmethod
-    def random(cls) -> StateID:
-        """Return a random state."""
-        return random.choice(list(cls))  # nosec
+    def random_with_probs(
+        cls, p: list[float], rng: random.Random | None = None
+    ) -> StateID:
+        """Return a random state based on the given probabilities."""
+        return cls((rng or random).choices(list(cls), weights=p)[0])  # nosec
 
     @classmethod
-    def random_with_probs(cls, p: list[float]) -> StateID:
-        """Return a random state based on the given probabilities."""
-        return cls(np.random.choice(list(cls), p=p))
+    def random(cls, rng: random.Random | None = None) -> StateID:
+        """Return a random state."""
+        return (rng or random).choice(list(cls))  # nosec
 
     def __str__(self) -> str:
         """Human-readable representation of the state."""
@@ -1,19 +1,20 @@
 from __future__ import annotations
 
+import math
 import random
+import weakref
 
-from collections import defaultdict
+from collections import OrderedDict
 from enum import IntEnum
 from enum import auto
-from itertools import cycle
 from typing import TYPE_CHECKING
-from typing import Iterator
 
 import pygame as pg
 
 from loguru import logger
 
 from doggo import ASSETS_PATH
+from doggo.atlas import dog_frame_key
 from doggo.dog import StateID
 from doggo.dog.brain import Direction
 
@@ -21,7 +22,9 @@ from doggo.dog.brain import Direction
 if TYPE_CHECKING:
     from pathlib import Path
 
+    from doggo.atlas import SpriteAtlas
     from doggo.dog.brain import Brain
+    from doggo.dog.brain import State
 
 
 class Fur(IntEnum):
@@ -39,10 +42,10 @@ class Fur(IntEnum):
     ORANGE = auto()
 
     @classmethod
-    def random(cls) -> Fur:
+    def random(cls, rng: random.Random | None = None) -> Fur:
         """Return a random fur color."""
-        fur_color = random.choice(list(cls))  # nosec
-        logger.debug(f"Dog fur color: {fur_color.name}")
+        fur_color = (rng or random).choice(list(cls))  # nosec
+        logger.debug("Dog fur color: {}", fur_color.name)
 
         return fur_color
 
@@ -59,6 +62,8 @@ class Body:
         sprite_size: tuple[int, int],
         default_direction: Direction,
         sprite_conf_per_state: dict[StateID, tuple[int, int]],
+        scale: tuple[float, float] | None = None,
+        frame_store: FrameStore | None = None,
     ) -> None:
         """Initialize the body of the dog.
 
@@ -68,41 +73,271 @@ class Body:
         (columns, rows).
         States sprites config is a dictionary that contains the configuration of the
         sprites for each state.
+        Scale is the (x, y) factor applied once to all the sprites, when the world is
+        rendered at another size than its own.
+        Frame store is where the frames are taken from, share it between bodies to
+        share their frames.
         """
         assert sprite_conf_per_state.keys() == set(StateID), (
             f"Sprite configuration must be defined for all the states, missing: "
             f"{set(StateID) - sprite_conf_per_state.keys()}"
         )
 
-        self.__asked_image: tuple[StateID, Direction] | None = None
-        self.__current_image: Iterator[pg.Surface] | None = None
         self.fur: Fur = fur
         self.default_direction: Direction = default_direction
+        self.scale: tuple[float, float] | None = scale
 
-        nb_row, nb_column = sprite_size
-        asset_path = ASSETS_PATH.joinpath(f"dogs/{fur:02d}.png")
-        self.sprite_sheet = SpriteSheet(path=asset_path, columns=nb_column, rows=nb_row)
-
-        self.images: dict[StateID, dict[Direction, list[pg.Surface]]] = defaultdict(
-            lambda: defaultdict(list)
+        self.frame_store: FrameStore = (
+            FrameStore(sprite_size=sprite_size) if frame_store is None else frame_store
+        )
+        assert self.frame_store.sprite_size == sprite_size, (
+            f"The frame store sprite size {self.frame_store.sprite_size} doesn't match "
+            f"the body one {sprite_size}"
+        )
+        # The frames of the fur are kept in the store as long as the body lives.
+        self.frame_store.add_user(fur=fur, body=self)
+        # The size of the frames in the world, whatever their scale.
+        self.frame_size: tuple[int, int] = self.frame_store.get_frame(
+            fur=fur, loc=(0, 0)
+        ).get_size()
+
+        # Shared by all the bodies of the same fur and scale.
+        self.images: FrameTable = self.frame_store.get_frame_table(
+            fur=fur,
+            sprite_conf_per_state=sprite_conf_per_state,
+            default_direction=default_direction,
+            scale=scale,
         )
-        for state, (col, row) in sprite_conf_per_state.items():
-            for direction in Direction:
-                for i in range(col):
-                    flip_x = direction != self.default_direction
-                    sprite = self.sprite_sheet.get_sprite((i, row), flip_x=flip_x)
-                    self.images[state][direction].append(sprite)
+        # The collision masks of the frames, built with the frames.
+        self.masks: MaskTable = self.frame_store.get_mask_table(
+            fur=fur,
+            sprite_conf_per_state=sprite_conf_per_state,
+            default_direction=default_direction,
+            scale=scale,
+        )
+
+    @staticmethod
+    def get_frame_index(state: State, now: float) -> int:
+        """Return the index of the animation frame of the state at the given time.
+
+        The index is computed from the time elapsed since the state started, so any
+        time can be sampled, and the frames are skipped after a long frame instead of
+        slowing the animation down.
+        """
+        return math.floor((now - state.started_at) / state.animation_time_rate)
+
+    def get_image(self, brain: Brain, now: float) -> pg.Surface:
+        """Return the pose of the dog at the given time, based on the brain state."""
+        state = brain.current_state
+        frames = self.images[state.id][state.direction]
+
+        return frames[self.get_frame_index(state=state, now=now) % len(frames)]
+
+    def get_mask(self, brain: Brain, now: float) -> pg.mask.Mask:
+        """Return the collision mask of the pose of the dog at the given time."""
+        state = brain.current_state
+        masks = self.masks[state.id][state.direction]
+
+        return masks[self.get_frame_index(state=state, now=now) % len(masks)]
+
+
+FrameKey = tuple[Fur, int, int, bool, tuple[float, float] | None]
+FrameTable = dict[StateID, dict[Direction, tuple[pg.Surface, ...]]]
+MaskTable = dict[StateID, dict[Direction, tuple[pg.mask.Mask, ...]]]
+FrameTableKey = tuple[
+    Fur,
+    tuple[tuple[StateID, tuple[int, int]], ...],
+    Direction,
+    tuple[float, float] | None,
+]
+
+
+class FrameStore:
+    """A store of the dog frames, shared by the bodies.
+
+    Frames are keyed by (fur, row, column, flip, scale), so identical frames, e.g. of
+    states sharing a sprite sheet row, are only sliced once and the same surface is
+    handed out to all the bodies. Unflipped and unscaled frames are subsurfaces of the
+    sprite sheet and don't copy any pixel.
+
+    Once the store holds more frames than its budget, the least recently used furs
+    no living body uses are evicted whole, with their sprite sheet, frame and mask
+    tables. The furs of the living bodies are always kept, so their bodies keep
+    sharing the same tables, and the budget only bounds the frames of the unused
+    furs on top of them.
+
+    When an atlas is given, the frames are taken from it instead of slicing the
+    sprite sheets, which are then never decoded.
+
+    The collision masks of the frames are built once, with the frame tables, and
+    shared the same way, they are never built while the dogs are drawn.
+    """
 
-    def get_image(self, brain: Brain) -> pg.Surface:
-        """Return the pose of the dog based on the brain config."""
-        state = brain.current_state.id
-        direction = brain.current_state.direction
+    def __init__(
+        self,
+        sprite_size: tuple[int, int],
+        max_frames: int = 512,
+        atlas: SpriteAtlas | None = None,
+    ) -> None:
+        self.sprite_size: tuple[int, int] = sprite_size
+        self.max_frames: int = max_frames
+        self.atlas: SpriteAtlas | None = atlas
+        self._sprite_sheets: dict[Fur, SpriteSheet] = {}
+        # The frames of each fur, from the least to the most recently used fur.
+        self._frames: OrderedDict[Fur, dict[FrameKey, pg.Surface]] = OrderedDict()
+        self._users: dict[Fur, weakref.WeakSet[Body]] = {}
+        self._frame_tables: dict[FrameTableKey, FrameTable] = {}
+        self._masks: dict[FrameKey, pg.mask.Mask] = {}
+        self._mask_tables: dict[FrameTableKey, MaskTable] = {}
+
+    def add_user(self, fur: Fur, body: Body) -> None:
+        """Keep the frames of the fur while the body lives."""
+        self._users.setdefault(fur, weakref.WeakSet()).add(body)
+
+    def get_sprite_sheet(self, fur: Fur) -> SpriteSheet:
+        """Return the sprite sheet of the given fur, loaded only once."""
+        if fur not in self._sprite_sheets:
+            nb_row, nb_column = self.sprite_size
+            asset_path = ASSETS_PATH.joinpath(f"dogs/{fur:02d}.png")
+            self._sprite_sheets[fur] = SpriteSheet(
+                path=asset_path, columns=nb_column, rows=nb_row
+            )
+
+        return self._sprite_sheets[fur]
+
+    def get_frame(
+        self,
+        fur: Fur,
+        loc: tuple[int, int],
+        flip_x: bool = False,
+        scale: tuple[float, float] | None = None,
+    ) -> pg.Surface:
+        """Return the frame at the given location (column, row) of the fur sheet."""
+        key = (fur, loc[1], loc[0], flip_x, scale)
+        frames = self._frames.setdefault(fur, {})
+        self._frames.move_to_end(fur)
+        frame = frames.get(key)
+        if frame is not None:
+            return frame
+
+        frame = None
+        if self.atlas is not None:
+            frame = self.atlas.get(dog_frame_key(fur, loc[1], loc[0], flip_x))
+        if frame is None:
+            frame = self.get_sprite_sheet(fur=fur).get_sprite(loc, flip_x=flip_x)
+        if scale is not None:
+            width, height = frame.get_size()
+            frame = pg.transform.scale(
+                frame, (round(width * scale[0]), round(height * scale[1]))
+            )
+
+        frames[key] = frame
+        if len(self) > self.max_frames:
+            self._evict_unused()
+
+        return frame
+
+    def _evict_unused(self) -> None:
+        """Evict the least recently used furs no body uses, down to the budget.
+
+        The most recently used fur is kept, it's the one being built.
+        """
+        *furs, _ = self._frames
+        for fur in furs:
+            if len(self) <= self.max_frames:
+                break
+            if not self._users.get(fur):
+                self._evict(fur)
+
+    def _evict(self, fur: Fur) -> None:
+        """Forget everything built for the given fur."""
+        del self._frames[fur]
+        self._users.pop(fur, None)
+        self._sprite_sheets.pop(fur, None)
+        self._frame_tables = {
+            key: table for key, table in self._frame_tables.items() if key[0] != fur
+        }
+        self._mask_tables = {
+            key: table for key, table in self._mask_tables.items() if key[0] != fur
+        }
+        self._masks = {key: mask for key, mask in self._masks.items() if key[0] != fur}
+
+    def get_mask(self, frame: pg.Surface, key: FrameKey) -> pg.mask.Mask:
+        """Return the collision mask of a frame, built only once per frame key."""
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._masks[key] = pg.mask.from_surface(frame)
+
+        return mask
+
+    def get_frame_table(
+        self,
+        fur: Fur,
+        sprite_conf_per_state: dict[StateID, tuple[int, int]],
+        default_direction: Direction,
+        scale: tuple[float, float] | None = None,
+    ) -> FrameTable:
+        """Return the frames of each state and direction, built only once.
+
+        The collision masks of the frames are built at the same time.
+        """
+        key = (
+            fur,
+            tuple(sorted(sprite_conf_per_state.items())),
+            default_direction,
+            scale,
+        )
+        if key not in self._frame_tables:
+            frame_table: FrameTable = {}
+            mask_table: MaskTable = {}
+            for state, (nb_column, row) in sprite_conf_per_state.items():
+                frame_table[state] = {}
+                mask_table[state] = {}
+                for direction in Direction:
+                    flip_x = direction != default_direction
+                    frames = tuple(
+                        self.get_frame(
+                            fur=fur, loc=(column, row), flip_x=flip_x, scale=scale
+                        )
+                        for column in range(nb_column)
+                    )
+                    frame_table[state][direction] = frames
+                    mask_table[state][direction] = tuple(
+                        self.get_mask(frame, key=(fur, row, column, flip_x, scale))
+                        for column, frame in enumerate(frames)
+                    )
+            self._frame_tables[key] = frame_table
+            self._mask_tables[key] = mask_table
+
+        return self._frame_tables[key]
+
+    def get_mask_table(
+        self,
+        fur: Fur,
+        sprite_conf_per_state: dict[StateID, tuple[int, int]],
+        default_direction: Direction,
+        scale: tuple[float, float] | None = None,
+    ) -> MaskTable:
+        """Return the collision masks of each state and direction, built only once."""
+        self.get_frame_table(
+            fur=fur,
+            sprite_conf_per_state=sprite_conf_per_state,
+            default_direction=default_direction,
+            scale=scale,
+        )
 
-        if self.__asked_image != (state, direction) or self.__current_image is None:
-            self.__asked_image = (state, direction)
-            self.__current_image = cycle(self.images[state][direction])
+        return self._mask_tables[
+            (
+                fur,
+                tuple(sorted(sprite_conf_per_state.items())),
+                default_direction,
+                scale,
+            )
+        ]
 
-        return next(self.__current_image)
+    def __len__(self) -> int:
+        """Number of frames in the store."""
+        return sum(len(frames) for frames in self._frames.values())
 
 
 class SpriteSheet:
@@ -123,6 +358,7 @@ class SpriteSheet:
         """Return a sprite from the sprite sheet based on the location.
 
         The location is a tuple (column, row) of the sprite in the sprite sheet.
+        Unflipped sprites are subsurfaces sharing the pixels of the sprite sheet.
         """
         if loc[0] >= self.columns or loc[1] >= self.rows:
             raise ValueError(f"Sprite location is out of bounds: {loc}")
@@ -131,8 +367,7 @@ class SpriteSheet:
         y = loc[1] * self.sprite_size[1]
 
         area = pg.Rect(x, y, *self.sprite_size)
-        image = pg.Surface(self.sprite_size, pg.SRCALPHA)
-        image.blit(self._sprite_sheet, dest=(0, 0), area=area)
+        image = self._sprite_sheet.subsurface(area)
 
         if flip_x or flip_y:
             image = pg.transform.flip(image, flip_x, flip_y)
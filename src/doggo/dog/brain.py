@@ -1,18 +1,34 @@
 from __future__ import annotations
 
+import math
 import random
-import time
 
 from enum import IntEnum
 from enum import auto
+from functools import cached_property
+from typing import TYPE_CHECKING
 from typing import NotRequired
 from typing import TypedDict
 
 from loguru import logger
 
+from doggo.clock import MonotonicClock
 from doggo.dog import StateID
 
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import numpy as np
+    import numpy.typing as npt
+
+    from doggo.clock import Clock
+    from doggo.dog.scheduler import Scheduler
+    from doggo.recorder import Transition
+    from doggo.recorder import TransitionPlayer
+    from doggo.recorder import TransitionRecorder
+
+
 class Direction(IntEnum):
     """The possible directions of the dog."""
 
@@ -20,9 +36,9 @@ class Direction(IntEnum):
     RIGHT = auto()
 
     @classmethod
-    def random(cls) -> Direction:
+    def random(cls, rng: random.Random | None = None) -> Direction:
         """Return a random direction."""
-        return cls(random.getrandbits(1))
+        return cls((rng or random).getrandbits(1))
 
 
 StateConfig = TypedDict(
@@ -56,12 +72,12 @@ class State:
             f"The number of transitions of state {id} must be equal "
             f"to the number of states"
         )
-        assert sum(transitions.values()) == 1, (
+        assert math.isclose(sum(transitions.values()), 1.0), (
             f"The sum of the transition probabilities of state {id} "
             f"must be equal to 1"
         )
 
-        self._clock: float = time.time()
+        self.started_at: float = 0.0
         self.id: StateID = id
         # We want to be sure that the order of the transitions is the same as the one
         # of the StateID enum.
@@ -71,27 +87,301 @@ class State:
         self.direction: Direction = direction or Direction.random()
         self.speed: int = speed
         self.animation_time_rate: float = animation_time_rate
-        self.wind_up()
+        self.wind_up(now=self.started_at)
 
-    def __call__(self) -> State:
+    def __call__(self, now: float, rng: random.Random | None = None) -> State:
         """Renew the state for a new iteration."""
-        self.wind_up()
-        self.direction = Direction.random()
+        self.wind_up(now=now, rng=rng)
+        self.direction = Direction.random(rng=rng)
 
         return self
 
-    def is_done(self) -> bool:
+    def is_done(self, now: float) -> bool:
         """Return whether the state is done or not."""
-        return self.countdown <= time.time() - self._clock
+        return self.countdown <= now - self.started_at
 
-    def wind_up(self) -> None:
+    def wind_up(self, now: float, rng: random.Random | None = None) -> None:
         """Wind up the state for a new iteration."""
-        self._clock = time.time()
-        self.countdown = random.randint(*self.time_range)  # nosec
+        self.started_at = now
+        self.countdown = (rng or random).randint(*self.time_range)  # nosec
 
-    def get_next_state_id(self) -> StateID:
+    def get_next_state_id(self, rng: random.Random | None = None) -> StateID:
         """Return the next state based on the transition probabilities."""
-        return StateID.random_with_probs(self.transitions)
+        return StateID.random_with_probs(self.transitions, rng=rng)
+
+
+class TransitionTable:
+    """The transition probabilities of all the states compiled once.
+
+    Each row of the transition matrix is turned into a Walker alias table, so picking
+    the next state costs a single random draw and two lookups, whatever the number of
+    states. The tables are plain lists, numpy is only loaded for batch sampling.
+    """
+
+    def __init__(self, matrix: Sequence[Sequence[float]]) -> None:
+        size = len(StateID)
+        assert len(matrix) == size and all(len(row) == size for row in matrix), (
+            f"The transition matrix must be of shape {(size, size)}, "
+            f"got {(len(matrix), len(matrix[0]) if len(matrix) else 0)}"
+        )
+        assert all(
+            math.isclose(sum(row), 1.0) for row in matrix
+        ), "The sum of the transition probabilities of each state must be equal to 1"
+
+        self._size: int = size
+        self._state_ids: tuple[StateID, ...] = tuple(StateID)
+        self._rows: list[list[float]] = [[float(p) for p in row] for row in matrix]
+        self._probs: list[list[float]] = []
+        self._aliases: list[list[int]] = []
+        for weights in self._rows:
+            probs, aliases = self._build_alias(weights)
+            self._probs.append(probs)
+            self._aliases.append(aliases)
+
+    @classmethod
+    def from_states(cls, states: Sequence[State]) -> TransitionTable:
+        """Compile the transitions of the given states, ordered by state id."""
+        return cls(
+            matrix=[state.transitions for state in sorted(states, key=lambda s: s.id)]
+        )
+
+    @staticmethod
+    def _build_alias(weights: list[float]) -> tuple[list[float], list[int]]:
+        """Build the alias table of a probability vector (Vose's method)."""
+        size = len(weights)
+        total = sum(weights)
+        probs = [weight * size / total for weight in weights]
+        aliases = list(range(size))
+        small = [i for i in range(size) if probs[i] < 1.0]
+        large = [i for i in range(size) if probs[i] >= 1.0]
+
+        while small and large:
+            less, more = small.pop(), large.pop()
+            aliases[less] = more
+            probs[more] -= 1.0 - probs[less]
+            (small if probs[more] < 1.0 else large).append(more)
+
+        # Leftovers are only due to floating point rounding, they are certain picks.
+        for index in small + large:
+            probs[index] = 1.0
+
+        return probs, aliases
+
+    @cached_property
+    def matrix(self) -> npt.NDArray[np.float64]:
+        """The transition matrix, rows are the current states."""
+        import numpy as np
+
+        return np.array(self._rows, dtype=np.float64)
+
+    @cached_property
+    def probs(self) -> npt.NDArray[np.float64]:
+        """The alias tables probabilities, one row per state."""
+        import numpy as np
+
+        return np.array(self._probs, dtype=np.float64)
+
+    @cached_property
+    def aliases(self) -> npt.NDArray[np.intp]:
+        """The alias tables aliases, one row per state."""
+        import numpy as np
+
+        return np.array(self._aliases, dtype=np.intp)
+
+    def next_state_id(self, state_id: StateID, rng: random.Random) -> StateID:
+        """Pick the next state from the given one."""
+        draw = rng.random() * self._size
+        column = int(draw)
+        if draw - column < self._probs[state_id][column]:
+            return self._state_ids[column]
+
+        return self._state_ids[self._aliases[state_id][column]]
+
+    def sample(
+        self, state_ids: npt.NDArray[np.intp], rng: np.random.Generator
+    ) -> npt.NDArray[np.intp]:
+        """Pick the next state of each of the given states in one batch."""
+        import numpy as np
+
+        draws = rng.random(len(state_ids)) * self._size
+        columns = draws.astype(np.intp)
+        keep = draws - columns < self.probs[state_ids, columns]
+
+        return np.where(keep, columns, self.aliases[state_ids, columns])
+
+
+class BehaviorAnalysis:
+    """The long run behavior of the brains, computed from the Markov chain.
+
+    The states form a Markov chain whose transition matrix is given by the state
+    configurations, and each stay lasts the mean of its time range. The statistics a
+    long simulation would estimate are solved exactly with a few linear systems.
+    """
+
+    def __init__(
+        self, matrix: Sequence[Sequence[float]], dwell_times: Sequence[float]
+    ) -> None:
+        import numpy as np
+
+        size = len(StateID)
+        assert len(dwell_times) == size, f"The dwell times must be of size {size}"
+        self._transitions: TransitionTable = TransitionTable(matrix=matrix)
+        self.dwell_times: npt.NDArray[np.float64] = np.array(
+            dwell_times, dtype=np.float64
+        )
+
+    @classmethod
+    def from_config(cls, state_configs: list[StateConfig]) -> BehaviorAnalysis:
+        """Analyze the states of a configuration list."""
+        configs = sorted(state_configs, key=lambda config: config["id"])
+
+        return cls(
+            matrix=[
+                [config["transitions"][state_id] for state_id in StateID]
+                for config in configs
+            ],
+            # The countdown is drawn uniformly from the time range, bounds included.
+            dwell_times=[sum(config["time_range"]) / 2 for config in configs],
+        )
+
+    @property
+    def matrix(self) -> npt.NDArray[np.float64]:
+        """The transition matrix, rows are the current states."""
+        return self._transitions.matrix
+
+    @cached_property
+    def reachability(self) -> npt.NDArray[np.bool_]:
+        """Whether each state (column) can be reached from each state (row)."""
+        import numpy as np
+
+        reach = self.matrix > 0
+        # Warshall's transitive closure.
+        for k in range(len(reach)):
+            reach |= np.outer(reach[:, k], reach[k])
+
+        return reach
+
+    @cached_property
+    def stationary_distribution(self) -> npt.NDArray[np.float64]:
+        """Share of the transitions leading to each state, in the long run.
+
+        Solves `pi P = pi` with the probabilities summing to 1. A chain with several
+        closed classes has many solutions, any one of them is returned.
+        """
+        import numpy as np
+
+        size = len(self.matrix)
+        system = np.vstack([self.matrix.T - np.eye(size), np.ones(size)])
+        target = np.zeros(size + 1)
+        target[-1] = 1.0
+        distribution, *_ = np.linalg.lstsq(system, target, rcond=None)
+
+        # Only the rounding errors can make a probability negative.
+        distribution = np.clip(distribution, 0.0, None)
+
+        return np.asarray(distribution / distribution.sum(), dtype=np.float64)
+
+    @cached_property
+    def time_share(self) -> npt.NDArray[np.float64]:
+        """Share of the time spent in each state, in the long run."""
+        import numpy as np
+
+        weighted = self.stationary_distribution * self.dwell_times
+
+        return np.asarray(weighted / weighted.sum(), dtype=np.float64)
+
+    def first_passage_times(
+        self, costs: npt.NDArray[np.float64]
+    ) -> npt.NDArray[np.float64]:
+        """Expected cost to reach each state (column) from each state (row).
+
+        Each stay costs its state cost, the stay in the target state isn't counted.
+        The cost to go back to the state itself is the mean recurrence cost. The cost
+        is infinite from the states which may never reach the target, i.e. which can
+        fall into a closed class without it.
+        """
+        import numpy as np
+
+        size = len(self.matrix)
+        moves = self.matrix > 0
+        passage = np.full((size, size), np.inf)
+        for target in range(size):
+            others = np.arange(size) != target
+            # The states which surely reach the target: the ones which can't leave
+            # for a state unable to reach it, without going through the target.
+            sure = self.reachability[:, target] & others
+            while True:
+                leaving = moves[:, others & ~sure].any(axis=1)
+                if not (sure & leaving).any():
+                    break
+                sure &= ~leaving
+            sources = np.flatnonzero(sure)
+            # m_i = cost_i + sum_k P_ik m_k for all k != target.
+            system = np.eye(len(sources)) - self.matrix[np.ix_(sources, sources)]
+            passage[sources, target] = np.linalg.solve(system, costs[sources])
+            # Only the actual moves are summed, so the infinite costs don't meet the
+            # impossible moves.
+            nexts = np.flatnonzero(moves[target] & others)
+            step = self.matrix[target, nexts] @ passage[nexts, target]
+            passage[target, target] = costs[target] + step
+
+        return passage
+
+    @cached_property
+    def mean_first_passage_steps(self) -> npt.NDArray[np.float64]:
+        """Expected number of transitions to reach each state from each state."""
+        import numpy as np
+
+        return self.first_passage_times(costs=np.ones(len(self.matrix)))
+
+    @cached_property
+    def mean_first_passage_times(self) -> npt.NDArray[np.float64]:
+        """Expected time, in seconds, to reach each state from each state."""
+        return self.first_passage_times(costs=self.dwell_times)
+
+    @property
+    def unreachable_states(self) -> list[StateID]:
+        """The states no other state leads to, only possible as initial states."""
+        import numpy as np
+
+        reach = self.reachability & ~np.eye(len(self.matrix), dtype=bool)
+
+        return [StateID(int(index)) for index in np.flatnonzero(~reach.any(axis=0))]
+
+    @property
+    def absorbing_states(self) -> list[StateID]:
+        """The states the dog never leaves once in."""
+        import numpy as np
+
+        return [
+            StateID(int(index))
+            for index in np.flatnonzero(np.isclose(np.diag(self.matrix), 1.0))
+        ]
+
+    def __str__(self) -> str:
+        """Human-readable report."""
+        lines = [
+            f"{'state':<20}{'stationary':>12}{'time share':>12}"
+            f"{'mean dwell':>12}{'recurrence':>12}",
+        ]
+        for state_id in StateID:
+            lines.append(
+                f"{state_id!s:<20}"
+                f"{self.stationary_distribution[state_id]:>11.2%} "
+                f"{self.time_share[state_id]:>11.2%} "
+                f"{self.dwell_times[state_id]:>11.1f}s"
+                f"{self.mean_first_passage_times[state_id, state_id]:>11.0f}s"
+            )
+
+        lines += [
+            "",
+            "Unreachable states: "
+            + (", ".join(map(str, self.unreachable_states)) or "none"),
+            "Absorbing states: "
+            + (", ".join(map(str, self.absorbing_states)) or "none"),
+        ]
+
+        return "\n".join(lines)
 
 
 class Brain:
@@ -101,46 +391,165 @@ class Brain:
     It's a simple state machine that changes the state based on the transition
     probabilities. The remaining time of the current state is defined randomly at each
     state change.
+
+    The transitions are compiled once into a `TransitionTable` and all the random
+    draws go through the brain own random generator, so a brain can be seeded. An
+    already compiled table can be shared by the brains of the same states. The
+    time is read from the given clock, unless the caller already knows it. The logs
+    of the brain carry the id of its dog. A recorder can log the transitions, and a
+    player can feed recorded transitions back instead of the random draws.
     """
 
     def __init__(
-        self, states: list[State], default_state_id: None | StateID = None
+        self,
+        states: list[State],
+        default_state_id: None | StateID = None,
+        rng: random.Random | None = None,
+        clock: Clock | None = None,
+        dog_id: int = 0,
+        transitions: TransitionTable | None = None,
     ) -> None:
-        states.sort(key=lambda state: state.id)
-        self._states = tuple(states)
-
-        registered_states = {state.id for state in self._states}
-        assert registered_states == set(StateID), (
-            f"The states must be defined for all the states, missing: "
-            f"{set(StateID) - registered_states}"
+        self._states: tuple[State, ...] = self._register_states(states)
+        self.dog_id: int = dog_id
+        # Set when a scheduler wakes the brain up, instead of updating it each frame.
+        self.scheduler: Scheduler | None = None
+        self.recorder: TransitionRecorder | None = None
+        self.player: TransitionPlayer | None = None
+        self.logger = logger.bind(dog_id=dog_id)
+        self.rng: random.Random = rng or random.Random()
+        self.clock: Clock = clock or MonotonicClock()
+        self.transitions: TransitionTable = transitions or TransitionTable.from_states(
+            self._states
         )
-
         initial_state_id = (
-            StateID.random() if default_state_id is None else default_state_id
+            StateID.random(rng=self.rng)
+            if default_state_id is None
+            else default_state_id
+        )
+        self.current_state: State = self._states[initial_state_id](
+            now=self.clock.now(), rng=self.rng
         )
-        self.current_state: State = self._states[initial_state_id]()
 
     @classmethod
     def from_config(
-        cls, state_configs: list[StateConfig], default_state_id: None | StateID = None
+        cls,
+        state_configs: list[StateConfig],
+        default_state_id: None | StateID = None,
+        rng: random.Random | None = None,
+        clock: Clock | None = None,
+        dog_id: int = 0,
+        transitions: TransitionTable | None = None,
     ) -> Brain:
         """Create a brain from a configuration list."""
         states = [State(**state_config) for state_config in state_configs]
 
-        return cls(states=states, default_state_id=default_state_id)
+        return cls(
+            states=states,
+            default_state_id=default_state_id,
+            rng=rng,
+            clock=clock,
+            dog_id=dog_id,
+            transitions=transitions,
+        )
 
-    def change_state(self, state_id: StateID) -> None:
-        """Change the current state of the brain."""
-        self.current_state = self._states[state_id]()
-        logger.info(
-            f"Dog's brain decided to {self.current_state.id} for "
-            f"{self.current_state.countdown}s."
+    @staticmethod
+    def _register_states(states: list[State]) -> tuple[State, ...]:
+        """Order the states by id, making sure they are all defined."""
+        registered_states = {state.id for state in states}
+        assert registered_states == set(StateID), (
+            f"The states must be defined for all the states, missing: "
+            f"{set(StateID) - registered_states}"
         )
 
-    def update(self) -> None:
+        return tuple(sorted(states, key=lambda state: state.id))
+
+    def reload(
+        self,
+        state_configs: list[StateConfig],
+        transitions: TransitionTable | None = None,
+    ) -> None:
+        """Swap the states for new ones, e.g. from an edited behavior profile.
+
+        The current state carries on until its countdown is over, so the dog isn't
+        interrupted, the next transitions follow the new states.
+        """
+        states = self._register_states(
+            [State(**state_config) for state_config in state_configs]
+        )
+        current_state = states[self.current_state.id]
+        current_state.started_at = self.current_state.started_at
+        current_state.countdown = self.current_state.countdown
+        current_state.direction = self.current_state.direction
+
+        self._states = states
+        self.transitions = transitions or TransitionTable.from_states(states)
+        self.current_state = current_state
+
+    def change_state(
+        self,
+        state_id: StateID,
+        now: float | None = None,
+        countdown: int | None = None,
+        direction: Direction | None = None,
+    ) -> None:
+        """Change the current state of the brain.
+
+        The countdown and the direction are drawn randomly, unless given.
+        """
+        now = self.clock.now() if now is None else now
+        self.current_state = self._states[state_id](now=now, rng=self.rng)
+        if countdown is not None:
+            self.current_state.countdown = countdown
+        if direction is not None:
+            self.current_state.direction = direction
+        # Formatted only if the level is logged, the fields are kept in the record.
+        self.logger.info(
+            "Dog's brain decided to {state} for {countdown}s.",
+            state=self.current_state.id,
+            countdown=self.current_state.countdown,
+        )
+        if self.recorder is not None:
+            self.recorder.record(self)
+        if self.scheduler is not None:
+            self.scheduler.schedule(self)
+
+    @property
+    def deadline(self) -> float:
+        """The time when the current state will be done."""
+        return self.current_state.started_at + self.current_state.countdown
+
+    def update(self, now: float | None = None) -> None:
         """Update the current brain state."""
-        if self.current_state.is_done():
-            self.change_state(state_id=self.current_state.get_next_state_id())
+        now = self.clock.now() if now is None else now
+        if self.current_state.is_done(now=now):
+            self.transition(now=now)
+
+    def transition(self, now: float | None = None) -> None:
+        """Move on to the next state, picked from the transition probabilities.
+
+        When replaying, the next recorded transition is played instead.
+        """
+        if self.player is not None:
+            transition = self.player.next(self.dog_id)
+            if transition is not None:
+                self.play(transition, now=now)
+                return
+
+        self.change_state(
+            state_id=self.transitions.next_state_id(
+                state_id=self.current_state.id, rng=self.rng
+            ),
+            now=now,
+        )
+
+    def play(self, transition: Transition, now: float | None = None) -> None:
+        """Change to the state of a recorded transition."""
+        self.change_state(
+            state_id=transition.state,
+            now=now,
+            countdown=transition.countdown,
+            direction=transition.direction,
+        )
 
     def __repr__(self) -> str:
         """String representation of the brain."""
@@ -4,13 +4,15 @@ import random
 
 from typing import TYPE_CHECKING
 
+import pygame as pg
+
 from doggo.dog import StateID
 from doggo.dog.body import Body
 from doggo.dog.brain import Direction
 
 
 if TYPE_CHECKING:
-    import pygame as pg
+    from collections.abc import Sequence
 
     from doggo.dog.brain import Brain
 
@@ -23,16 +25,33 @@ class Dog:
     """
 
     def __init__(
-        self, brain: Brain, body: Body, world_ground: int, world_width: int
+        self,
+        brain: Brain,
+        body: Body,
+        world_ground: int,
+        world_width: int,
+        rng: random.Random | None = None,
+        terrain: Sequence[int] | None = None,
     ) -> None:
         self.brain: Brain = brain
         self.body: Body = body
+        self.world_ground: int = world_ground
         self.world_width: int = world_width
-        self.current_animation_time_rate: float = 0.0
-        self.image: pg.Surface = self.body.get_image(brain=self.brain)
-        self.rect = self.image.get_rect()
-        self.x = float(random.randint(0, self.world_width - self.rect.width))  # nosec
-        self.rect.bottomleft = (int(self.x), world_ground)
+        # How much the ground rises above the world ground, in each column.
+        self.terrain: Sequence[int] | None = terrain
+        # The time the image was sampled at, to find its collision mask.
+        self.sampled_at: float = self.brain.current_state.started_at
+        self.image: pg.Surface = self.body.get_image(
+            brain=self.brain, now=self.sampled_at
+        )
+        self.rect = pg.Rect((0, 0), self.body.frame_size)
+        self.x = float(
+            (rng or random).randint(0, self.world_width - self.rect.width)  # nosec
+        )
+        # The fraction of pixel dropped from the rect, kept for the scaled screens.
+        self.subpixel_x: float = 0.0
+        self.place(self.x)
+        self.prev_x: float = self.x
         self.clone: _BoundaryClone = _BoundaryClone(self)
 
     @property
@@ -50,18 +69,22 @@ class Dog:
         """The current state of the dog."""
         return self.brain.current_state.id
 
-    def update(self, dt: float) -> None:
-        """Update the dog."""
-        self.brain.update()
+    def update(self, dt: float, now: float | None = None) -> None:
+        """Update the dog.
+
+        The current time can be given to share a single clock read between dogs. A
+        brain woken up by a scheduler isn't updated here.
+        """
+        now = self.brain.clock.now() if now is None else now
+        # Simulate from the last step position, not the interpolated one.
+        self.prev_x = self.x
+        self.rect.x = int(self.x)
+        if self.brain.scheduler is None:
+            self.brain.update(now=now)
 
-        # Manage the doggo's animation.
-        self.current_animation_time_rate += dt
-        if (
-            self.current_animation_time_rate
-            >= self.brain.current_state.animation_time_rate
-        ):
-            self.current_animation_time_rate = 0.0
-            self.image = self.body.get_image(brain=self.brain)
+        # Manage the doggo's animation, sampled from the time spent in the state.
+        self.sampled_at = now
+        self.image = self.body.get_image(brain=self.brain, now=now)
 
         # Manage world boundaries.
         if self.rect.right < 0:
@@ -75,13 +98,98 @@ class Dog:
         else:
             self.x += self.speed * dt
 
-        self.rect.x = int(self.x)
+        self.place(self.x)
         self.clone.update()  # Don't forget to update the clone after the dog.
 
+    def interpolate(self, alpha: float) -> None:
+        """Place the dog between its last two steps, alpha being the step fraction.
+
+        The dog isn't interpolated when wrapping around the world boundaries.
+        """
+        x = self.x
+        if abs(x - self.prev_x) < self.world_width / 2:
+            x = self.prev_x + (x - self.prev_x) * alpha
+
+        self.place(x)
+        self.clone.update()
+
+    def place(self, x: float) -> None:
+        """Place the dog at the given position of the world, on the ground."""
+        self.rect.x = int(x)
+        self.subpixel_x = x - self.rect.x
+        self.rect.bottom = self.get_ground(self.rect.centerx)
+
+    def get_ground(self, x: int) -> int:
+        """Return the ground of the dog at the given column of the world."""
+        if self.terrain is None:
+            return self.world_ground
+
+        return self.world_ground - self.terrain[x % len(self.terrain)]
+
+    def get_next_change_time(self, now: float) -> float:
+        """Return the time of the next visible change of the dog, at the latest.
+
+        A moving dog changes all the time, otherwise the dog only changes with its
+        next animation frame or its next state.
+        """
+        if self.speed:
+            return now
+
+        state = self.brain.current_state
+        next_frame = (
+            state.started_at
+            + (self.body.get_frame_index(state=state, now=now) + 1)
+            * state.animation_time_rate
+        )
+
+        return min(next_frame, self.brain.deadline)
+
+    def to_screen(self, rect: pg.Rect) -> pg.Rect:
+        """Map a rect of the world to the screen, where the frames may be scaled.
+
+        On a scaled screen, the position keeps the fraction of pixel dropped from the
+        rect, and is only rounded once scaled.
+        """
+        if self.body.scale is None:
+            return rect.copy()
+
+        scale_x, scale_y = self.body.scale
+        return self.image.get_rect(
+            topleft=(
+                round((rect.x + self.subpixel_x) * scale_x),
+                round(rect.y * scale_y),
+            )
+        )
+
+    def collide_point(self, pos: tuple[int, int]) -> bool:
+        """Whether the point of the screen is on a visible pixel of the dog.
+
+        The areas of the dog and its clone are tested first, the collision mask of
+        the current frame is only looked up when the point is within one of them.
+        """
+        areas = [self.to_screen(self.rect)]
+        if self.clone.visible:
+            areas.append(self.to_screen(self.clone.rect))
+
+        for area in areas:
+            if area.collidepoint(pos):
+                mask = self.body.get_mask(brain=self.brain, now=self.sampled_at)
+                if mask.get_at((pos[0] - area.x, pos[1] - area.y)):
+                    return True
+
+        return False
+
+    def get_blits(self) -> list[tuple[pg.Surface, pg.Rect]]:
+        """Return the images to draw and their areas on the screen."""
+        blits = [(self.image, self.to_screen(self.rect))]
+        if self.clone.visible:
+            blits.append((self.image, self.to_screen(self.clone.rect)))
+
+        return blits
+
     def draw(self, screen: pg.Surface) -> None:
         """Render the dog."""
-        screen.blit(self.image, dest=self.rect)
-        self.clone.draw(screen=screen)
+        screen.fblits(self.get_blits())
 
 
 class _BoundaryClone:
@@ -106,8 +214,5 @@ class _BoundaryClone:
             self.rect.x = self.dog.rect.x - self.dog.world_width
         else:
             self.visible = False
-
-    def draw(self, screen: pg.Surface) -> None:
-        """Render the clone."""
-        if self.visible:
-            screen.blit(self.dog.image, dest=self.rect)
+        # Both stand on the same column of the wrapping terrain.
+        self.rect.y = self.dog.rect.y
@@ -0,0 +1,153 @@
+# Pool module steps many dog brains at once, for the headless simulations.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from doggo.dog import StateID
+from doggo.dog.brain import Direction
+from doggo.dog.brain import State
+from doggo.dog.brain import TransitionTable
+
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    from doggo.dog.brain import StateConfig
+
+
+class BrainPool:
+    """A pool of brains stepped all at once.
+
+    Instead of holding `State` objects, the pool keeps the state of each brain in
+    contiguous numpy arrays (current state ids, deadlines, directions, speeds and
+    animation rates). Updating the pool finds the expired brains with a single
+    comparison and picks all their next states in one batch from the compiled
+    `TransitionTable`, so thousands of brains cost about as much as a few ones.
+    """
+
+    def __init__(
+        self,
+        states: list[State],
+        size: int,
+        now: float = 0.0,
+        default_state_id: None | StateID = None,
+        rng: np.random.Generator | None = None,
+        transitions: TransitionTable | None = None,
+    ) -> None:
+        """Initialize the pool.
+
+        Transitions, if given, is the already compiled table of the states, e.g.
+        shared by the pools of the same states.
+        """
+        states = sorted(states, key=lambda state: state.id)
+
+        registered_states = {state.id for state in states}
+        assert registered_states == set(StateID), (
+            f"The states must be defined for all the states, missing: "
+            f"{set(StateID) - registered_states}"
+        )
+
+        self.size: int = size
+        self.rng: np.random.Generator = rng or np.random.default_rng()
+        self.transitions: TransitionTable = (
+            TransitionTable.from_states(states) if transitions is None else transitions
+        )
+
+        # Per state tables, indexed by state id.
+        self._min_countdowns = np.array([s.time_range[0] for s in states])
+        self._max_countdowns = np.array([s.time_range[1] for s in states])
+        self._speeds = np.array([s.speed for s in states])
+        self._animation_time_rates = np.array([s.animation_time_rate for s in states])
+
+        # Per brain arrays, indexed by brain.
+        self.state_ids: npt.NDArray[np.intp] = np.empty(size, dtype=np.intp)
+        self.started_at: npt.NDArray[np.float64] = np.empty(size, dtype=np.float64)
+        self.countdowns: npt.NDArray[np.int64] = np.empty(size, dtype=np.int64)
+        self.deadlines: npt.NDArray[np.float64] = np.empty(size, dtype=np.float64)
+        self.directions: npt.NDArray[np.int8] = np.empty(size, dtype=np.int8)
+        self.speeds: npt.NDArray[np.int64] = np.empty(size, dtype=np.int64)
+        self.animation_time_rates: npt.NDArray[np.float64] = np.empty(
+            size, dtype=np.float64
+        )
+
+        if default_state_id is None:
+            initial_state_ids = self.rng.integers(len(StateID), size=size)
+        else:
+            initial_state_ids = np.full(size, default_state_id, dtype=np.intp)
+        self.change_states(np.arange(size), initial_state_ids, now=now)
+
+    @classmethod
+    def from_config(
+        cls,
+        state_configs: list[StateConfig],
+        size: int,
+        now: float = 0.0,
+        default_state_id: None | StateID = None,
+        rng: np.random.Generator | None = None,
+        transitions: TransitionTable | None = None,
+    ) -> BrainPool:
+        """Create a pool of brains from a configuration list."""
+        states = [State(**state_config) for state_config in state_configs]
+
+        return cls(
+            states=states,
+            size=size,
+            now=now,
+            default_state_id=default_state_id,
+            rng=rng,
+            transitions=transitions,
+        )
+
+    def change_states(
+        self,
+        indices: npt.NDArray[np.intp],
+        state_ids: npt.NDArray[np.intp],
+        now: float,
+    ) -> None:
+        """Change the current state of the brains at the given indices."""
+        countdowns = self.rng.integers(
+            self._min_countdowns[state_ids],
+            self._max_countdowns[state_ids],
+            endpoint=True,
+        )
+
+        self.state_ids[indices] = state_ids
+        self.started_at[indices] = now
+        self.countdowns[indices] = countdowns
+        self.deadlines[indices] = now + countdowns
+        self.directions[indices] = self.rng.integers(len(Direction), size=len(indices))
+        self.speeds[indices] = self._speeds[state_ids]
+        self.animation_time_rates[indices] = self._animation_time_rates[state_ids]
+
+    def update(self, now: float) -> npt.NDArray[np.intp]:
+        """Update the brains and return the indices of the ones which changed."""
+        expired, _, _ = self.step(now)
+
+        return expired
+
+    def step(
+        self, now: float
+    ) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp], npt.NDArray[np.float64]]:
+        """Update the brains and return what changed.
+
+        Return the indices of the brains which changed, the states they left and the
+        time they stayed in them.
+        """
+        expired = np.flatnonzero(self.deadlines <= now)
+        left_state_ids = self.state_ids[expired]
+        stay_times = now - self.started_at[expired]
+        if len(expired):
+            next_state_ids = self.transitions.sample(left_state_ids, self.rng)
+            self.change_states(expired, next_state_ids, now=now)
+
+        return expired, left_state_ids, stay_times
+
+    def __len__(self) -> int:
+        """Number of brains in the pool."""
+        return self.size
+
+    def __repr__(self) -> str:
+        """String representation of the pool."""
+        return f"{self.__class__.__name__}({self.size})"
@@ -0,0 +1,72 @@
+# Scheduler module wakes the dog brains up only when their state expires.
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from doggo.dog.brain import Brain
+
+
+class Scheduler:
+    """A min-heap of the brains keyed on the deadline of their current state.
+
+    Updating the scheduler only pops the brains whose state expired, so the cost of a
+    frame depends on the number of transitions, not on the number of brains. The
+    brains reschedule themselves on each state change; the entries left behind are
+    skipped when they reach the top of the heap.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, Brain]] = []
+        self._counter = itertools.count()
+        # The entry of each brain which is still valid.
+        self._entries: dict[Brain, int] = {}
+
+    def add(self, brain: Brain) -> None:
+        """Let the scheduler wake the brain up."""
+        brain.scheduler = self
+        self.schedule(brain)
+
+    def schedule(self, brain: Brain) -> None:
+        """(Re)schedule the brain at the deadline of its current state."""
+        entry = next(self._counter)
+        self._entries[brain] = entry
+        heapq.heappush(self._heap, (brain.deadline, entry, brain))
+
+    def update(self, now: float) -> list[Brain]:
+        """Change the state of the expired brains, and return them."""
+        expired = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, entry, brain = heapq.heappop(heap)
+            if self._entries.get(brain) != entry:
+                continue
+            if brain.deadline > now:
+                # The state was extended since it was scheduled.
+                self.schedule(brain)
+                continue
+            expired.append(brain)
+
+        # Popped first, so a brain changes at most once per update.
+        for brain in expired:
+            brain.transition(now=now)
+
+        return expired
+
+    @property
+    def next_deadline(self) -> float:
+        """The time of the next state change, infinite if there's no brain."""
+        heap = self._heap
+        while heap and self._entries.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
+
+        return heap[0][0] if heap else math.inf
+
+    def __len__(self) -> int:
+        """Number of scheduled brains."""
+        return len(self._entries)
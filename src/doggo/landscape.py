@@ -1,27 +1,34 @@
 from __future__ import annotations
 
 import random
+import statistics
 
 from enum import IntEnum
+from typing import TYPE_CHECKING
 
 import pygame as pg
 
 from loguru import logger
 
 from doggo import ASSETS_PATH
+from doggo.atlas import landscape_layer_key
 from doggo.dog.body import SpriteSheet
 
 
+if TYPE_CHECKING:
+    from doggo.atlas import SpriteAtlas
+
+
 class Biome(IntEnum):
     """The possible biomes of the game."""
 
     MOUNTAIN = 0
 
     @classmethod
-    def random(cls) -> Biome:
-        """Return a random fur color."""
-        biome_type = random.choice(list(cls))  # nosec
-        logger.debug(f"Landscape biome: {biome_type.name}")
+    def random(cls, rng: random.Random | None = None) -> Biome:
+        """Return a random biome."""
+        biome_type = (rng or random).choice(list(cls))  # nosec
+        logger.debug("Landscape biome: {}", biome_type.name)
 
         return biome_type
 
@@ -39,13 +46,96 @@ class LandscapeLayer:
 
 
 class Landscape:
-    """The landscape of the game."""
+    """The landscape of the game.
+
+    The layers are prepared once for the fastest blits: the background is baked with
+    the sky color into an opaque display format surface, and the foreground is RLE
+    accelerated since it's mostly made of transparent runs.
+
+    The terrain of the foreground is also measured once, into a heightmap giving the
+    top of the ground in each column of the world, so it's never read from the
+    pixels afterwards.
+    """
 
     path = ASSETS_PATH.joinpath("landscape")
+    sky_color = (135, 206, 235)
+
+    def __init__(
+        self,
+        biome: Biome,
+        size: tuple[int, int] | None = None,
+        atlas: SpriteAtlas | None = None,
+    ) -> None:
+        """Initialize the landscape.
+
+        Size is the size of the layers on the screen, they are scaled once here when
+        the world is rendered at another size than its own.
+        Atlas, if given, provides the layers without decoding the landscape image.
+        """
+        self.atlas: SpriteAtlas | None = atlas
+        self.biome: Biome | None = None
+        self.size: tuple[int, int] | None = None
+        self.load(biome=biome, size=size)
+
+    def load(self, biome: Biome, size: tuple[int, int] | None = None) -> None:
+        """Build the layers, only if the biome or the size changed."""
+        if self.biome is not None and (biome, size) == (self.biome, self.size):
+            return
+
+        background, foreground = self._load_layers(biome=biome)
+        # Measured before any scaling, the dogs walk in the world coordinates.
+        heightmap = self.build_heightmap(foreground)
+
+        if size is not None:
+            background = pg.transform.scale(background, size)
+            foreground = pg.transform.scale(foreground, size)
+
+        sky = pg.Surface(background.get_size())
+        sky.fill(self.sky_color)
+        sky.blit(background, (0, 0))
+        foreground = foreground.convert_alpha()
+        foreground.set_alpha(255, pg.RLEACCEL)
+
+        self.biome = biome
+        self.size = size
+        self.heightmap: tuple[int, ...] = heightmap
+        self.background = LandscapeLayer(image=sky.convert())
+        self.foreground = LandscapeLayer(image=foreground)
+
+    @staticmethod
+    def build_heightmap(layer: pg.Surface, radius: int = 4) -> tuple[int, ...]:
+        """Return the top of the ground in each column of the layer.
+
+        The ground is the unbroken opaque run reaching the bottom of the layer, so the
+        floating pixels are ignored. The grass blades and flowers standing on it are
+        smoothed out by a median over the neighbouring columns, wrapping around like
+        the world does.
+        """
+        width, height = layer.get_size()
+        mask = pg.mask.from_surface(layer)
+        tops = []
+        for x in range(width):
+            y = height
+            while y > 0 and mask.get_at((x, y - 1)):
+                y -= 1
+            tops.append(y)
+
+        return tuple(
+            statistics.median_low(
+                tops[(x + offset) % width] for offset in range(-radius, radius + 1)
+            )
+            for x in range(width)
+        )
+
+    def _load_layers(self, biome: Biome) -> tuple[pg.Surface, pg.Surface]:
+        """Return the background and foreground images of the biome."""
+        if self.atlas is not None:
+            background = self.atlas.get(landscape_layer_key(biome, 1))
+            foreground = self.atlas.get(landscape_layer_key(biome, 0))
+            if background is not None and foreground is not None:
+                return background, foreground
 
-    def __init__(self, biome: Biome) -> None:
         asset_path = self.path.joinpath(f"{biome:02d}.png")
         sprite_sheet = SpriteSheet(path=asset_path, columns=1, rows=2)
 
-        self.background = LandscapeLayer(image=sprite_sheet.get_sprite((0, 1)))
-        self.foreground = LandscapeLayer(image=sprite_sheet.get_sprite((0, 0)))
+        return sprite_sheet.get_sprite((0, 1)), sprite_sheet.get_sprite((0, 0))
@@ -0,0 +1,99 @@
+# Log module writes the logs from a background thread, off the frame loop.
+from __future__ import annotations
+
+import atexit
+import queue
+import sys
+import threading
+import traceback
+
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+
+if TYPE_CHECKING:
+    from typing import TextIO
+
+    from loguru import Message
+    from loguru import Record
+
+
+def format_record(record: Record) -> str:
+    """Format a record like the default loguru format, with its extra fields."""
+    line = (
+        f"{record['time']:%Y-%m-%d %H:%M:%S.%f}"[:-3]
+        + f" | {record['level'].name:<8} | "
+        f"{record['name']}:{record['function']}:{record['line']} - "
+        f"{record['message']}"
+    )
+    if record["extra"]:
+        line += " | " + " ".join(
+            f"{key}={value}" for key, value in record["extra"].items()
+        )
+    line += "\n"
+
+    if record["exception"] is not None:
+        type_, value, trace = record["exception"]
+        line += "".join(traceback.format_exception(type_, value, trace))
+
+    return line
+
+
+class QueueSink:
+    """A loguru sink writing the messages from a background thread.
+
+    The frame loop only puts the messages in a bounded queue, without waiting. When
+    the queue is full, e.g. the output is too slow, the messages are dropped and
+    counted, and the count is written once the queue is drained. The lines are
+    formatted by the background thread as well. The count is shared by both threads,
+    it's only read and updated under a lock.
+    """
+
+    def __init__(self, stream: TextIO, max_size: int = 1024) -> None:
+        self.stream: TextIO = stream
+        self.dropped: int = 0
+        self._dropped_lock = threading.Lock()
+        self._queue: queue.Queue[Message | None] = queue.Queue(maxsize=max_size)
+        self._thread = threading.Thread(target=self._run, name="doggo-log", daemon=True)
+        self._thread.start()
+
+    def write(self, message: Message) -> None:
+        """Queue the message, or drop it if the queue is full."""
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def _run(self) -> None:
+        """Write the queued messages until the sink is stopped."""
+        while (message := self._queue.get()) is not None:
+            self.stream.write(format_record(message.record))
+            if self._queue.empty():
+                with self._dropped_lock:
+                    dropped, self.dropped = self.dropped, 0
+                if dropped:
+                    self.stream.write(f"{dropped} log messages dropped.\n")
+                self.stream.flush()
+
+    def stop(self) -> None:
+        """Write the remaining messages and stop the thread."""
+        self._queue.put(None)
+        self._thread.join(timeout=1.0)
+
+
+def setup_logging(
+    level: str = "DEBUG", max_size: int = 1024, stream: TextIO | None = None
+) -> QueueSink:
+    """Replace the default loguru output by a background one.
+
+    The messages below the given level are skipped before being formatted. The queue
+    is drained when the interpreter exits.
+    """
+    logger.remove()
+    sink = QueueSink(stream=stream or sys.stderr, max_size=max_size)
+    logger.add(sink, level=level, format="{message}", colorize=False)
+    atexit.register(logger.remove)
+
+    return sink
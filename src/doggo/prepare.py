@@ -1,35 +1,195 @@
 # Prepare module is responsible for building the World dependencies.
 from __future__ import annotations
 
+import random
+
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from doggo import ASSETS_PATH
 from doggo import config
+from doggo.atlas import SpriteAtlas
+from doggo.atlas import dog_frame_key
+from doggo.atlas import landscape_layer_key
+from doggo.atlas import load_atlas
+from doggo.behavior import BehaviorProfile
+from doggo.behavior import read_profile
 from doggo.dog.body import Body
+from doggo.dog.body import FrameStore
 from doggo.dog.body import Fur
+from doggo.dog.body import SpriteSheet
 from doggo.dog.brain import Brain
 from doggo.dog.dog import Dog
 from doggo.landscape import Biome
 from doggo.landscape import Landscape
 
 
-def build_dog() -> Dog:
-    """Build the dog."""
-    brain = Brain.from_config(state_configs=config.DOG_STATES)
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from collections.abc import Sequence
+
+    import pygame as pg
+
+    from doggo.clock import Clock
+
+
+def iter_asset_frames() -> Iterator[tuple[str, pg.Surface]]:
+    """Slice and flip all the frames of the assets, for the sprite atlas."""
+    nb_row, nb_column = config.SPRITE_SIZE
+    for asset_path in sorted(ASSETS_PATH.joinpath("dogs").glob("*.png")):
+        fur = int(asset_path.stem)
+        sprite_sheet = SpriteSheet(path=asset_path, columns=nb_column, rows=nb_row)
+        for row in range(nb_row):
+            for column in range(nb_column):
+                for flip_x in (False, True):
+                    key = dog_frame_key(fur, row, column, flip_x)
+                    yield key, sprite_sheet.get_sprite((column, row), flip_x=flip_x)
+
+    for asset_path in sorted(ASSETS_PATH.joinpath("landscape").glob("*.png")):
+        biome = int(asset_path.stem)
+        sprite_sheet = SpriteSheet(path=asset_path, columns=1, rows=2)
+        for row in range(sprite_sheet.rows):
+            key = landscape_layer_key(biome, row)
+            yield key, sprite_sheet.get_sprite((0, row))
+
+
+@cache
+def get_atlas() -> SpriteAtlas | None:
+    """Load the sprite atlas, built on the first run. None if it's disabled."""
+    if not config.DOGGO_ATLAS:
+        return None
+
+    try:
+        return load_atlas(cache_path=config.CACHE_PATH, build_frames=iter_asset_frames)
+    except (OSError, ValueError) as error:
+        logger.warning("Sprite atlas unavailable, assets are decoded: {}.", error)
+        return None
+
+
+@cache
+def get_frame_store() -> FrameStore:
+    """Return the frame store shared by all the dogs."""
+    return FrameStore(
+        sprite_size=config.SPRITE_SIZE,
+        max_frames=config.SPRITE_FRAME_STORE_SIZE,
+        atlas=get_atlas(),
+    )
+
+
+def load_behavior(path: Path) -> BehaviorProfile:
+    """Load a behavior profile file with the sprite settings of the world."""
+    return read_profile(
+        path,
+        default_sprite_conf=config.SPRITE_CONF_PER_STATE,
+        sprite_size=config.SPRITE_SIZE,
+    )
+
+
+@cache
+def get_behavior() -> BehaviorProfile:
+    """Return the behavior profile of the dogs, compiled once for all the dogs.
+
+    It's loaded from the profile file when given, otherwise from the configuration.
+    """
+    if config.DOGGO_BEHAVIOR:
+        return load_behavior(Path(config.DOGGO_BEHAVIOR))
+
+    return BehaviorProfile(
+        state_configs=config.DOG_STATES,
+        sprite_conf_per_state=config.SPRITE_CONF_PER_STATE,
+    )
+
+
+def build_dog(
+    clock: Clock | None = None,
+    scale: tuple[float, float] | None = None,
+    dog_id: int = 0,
+    fur: Fur | None = None,
+    ground: int = config.WORLD_GROUND,
+    rng: random.Random | None = None,
+    terrain: Sequence[int] | None = None,
+) -> Dog:
+    """Build the dog.
+
+    Scale is applied to the sprites when the world is rendered at another size. The
+    terrain, if given, is how much the ground rises in each column. The fur is random
+    unless given. All the random draws come from the given generator,
+    the brain gets its own generator seeded from it, so a seeded run is reproducible.
+    """
+    behavior = get_behavior()
+    brain = Brain.from_config(
+        state_configs=behavior.state_configs,
+        transitions=behavior.transitions,
+        clock=clock,
+        dog_id=dog_id,
+        rng=None if rng is None else random.Random(rng.getrandbits(64)),
+    )
     body = Body(
-        fur=Fur.random(),
+        fur=Fur.random(rng=rng) if fur is None else fur,
         sprite_size=config.SPRITE_SIZE,
         default_direction=config.SPRITE_DIRECTION,
-        sprite_conf_per_state=config.SPRITE_CONF_PER_STATE,
+        sprite_conf_per_state=behavior.sprite_conf_per_state,
+        scale=scale,
+        frame_store=get_frame_store(),
     )
 
     return Dog(
         brain=brain,
         body=body,
-        world_ground=config.WORLD_GROUND,
+        world_ground=ground,
         world_width=config.WORLD_WIDTH,
+        rng=rng,
+        terrain=terrain,
     )
 
 
-def build_landscape() -> Landscape:
-    """Build the background landscape."""
-    biome = Biome.random()
+def build_dogs(
+    count: int,
+    clock: Clock | None = None,
+    scale: tuple[float, float] | None = None,
+    rng: random.Random | None = None,
+    heightmap: Sequence[int] | None = None,
+) -> list[Dog]:
+    """Build a pack of dogs, ordered by depth, from the farthest to the closest.
+
+    The dogs get different furs as long as there are enough of them. The first dog
+    walks on the ground, the others a bit farther, to spread the pack in depth. The
+    heightmap of the landscape, if given, makes them follow the terrain.
+    """
+    rng = rng or random.Random()
+    terrain = (
+        None
+        if heightmap is None
+        else tuple(config.WORLD_GROUND - top for top in heightmap)
+    )
+    furs = rng.sample(list(Fur), k=len(Fur))
+    dogs = [
+        build_dog(
+            clock=clock,
+            scale=scale,
+            dog_id=dog_id,
+            fur=furs[dog_id % len(furs)],
+            ground=config.WORLD_GROUND
+            - (rng.randint(0, config.DOG_GROUND_DEPTH) if dog_id else 0),  # nosec
+            rng=rng,
+            terrain=terrain,
+        )
+        for dog_id in range(count)
+    ]
+
+    return sorted(dogs, key=lambda dog: dog.world_ground)
+
+
+def build_landscape(
+    size: tuple[int, int] | None = None, rng: random.Random | None = None
+) -> Landscape:
+    """Build the background landscape.
+
+    Size is given when the world is rendered at another size.
+    """
+    biome = Biome.random(rng=rng)
 
-    return Landscape(biome=biome)
+    return Landscape(biome=biome, size=size, atlas=get_atlas())
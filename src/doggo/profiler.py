@@ -0,0 +1,99 @@
+# Profiler module times the phases of the world frames.
+from __future__ import annotations
+
+import time
+
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+
+class Phase(IntEnum):
+    """The phases of a world frame."""
+
+    GET_DT = 0
+    PROCESS_INPUTS = 1
+    UPDATE = 2
+    RENDER = 3
+    WAIT = 4
+
+    def __str__(self) -> str:
+        return self.name.lower()
+
+
+class FrameProfiler:
+    """Record the duration of each phase of the last frames in a ring buffer.
+
+    A frame is dropped when its work, i.e. everything but the wait, takes longer than
+    the frame budget. The statistics are logged each time the buffer is filled again.
+    """
+
+    def __init__(self, budget: float, size: int = 3600) -> None:
+        assert size > 0, "The profiler needs room for at least one frame"
+
+        import numpy as np
+
+        self.budget: float = budget
+        self.size: int = size
+        self.timings = np.zeros((size, len(Phase)), dtype=np.float64)
+        self.frames: int = 0
+        self.dropped_frames: int = 0
+        self._frame: list[float] = [0.0] * len(Phase)
+        self._lap: float = 0.0
+
+    def start_frame(self) -> None:
+        """Start timing a new frame."""
+        self._lap = time.perf_counter()
+
+    def lap(self, phase: Phase) -> None:
+        """Record the time spent since the previous lap in the given phase."""
+        lap = time.perf_counter()
+        self._frame[phase] = lap - self._lap
+        self._lap = lap
+
+    def end_frame(self) -> None:
+        """Store the timings of the frame."""
+        self.timings[self.frames % self.size] = self._frame
+        self.frames += 1
+        if sum(self._frame) - self._frame[Phase.WAIT] > self.budget:
+            self.dropped_frames += 1
+        self._frame = [0.0] * len(Phase)
+
+        if self.frames % self.size == 0:
+            logger.info("Frame profile:\n{}", self.report())
+
+    def percentiles(self, q: list[float]) -> npt.NDArray[np.float64]:
+        """Return the given percentiles of each phase, and of the whole frame, in ms.
+
+        The rows are the percentiles, the columns the phases then the whole frame.
+        """
+        import numpy as np
+
+        timings = self.timings[: min(self.frames, self.size)]
+        timings = np.column_stack((timings, timings.sum(axis=1)))
+        if not len(timings):
+            return np.zeros((len(q), len(Phase) + 1))
+
+        return np.percentile(timings, q, axis=0) * 1000
+
+    def report(self) -> str:
+        """Human-readable statistics of the recorded frames."""
+        names = [str(phase) for phase in Phase] + ["frame"]
+        stats = self.percentiles([50, 95, 99, 100])
+        lines = [
+            f"{self.frames} frames, {self.dropped_frames} dropped "
+            f"(budget {self.budget * 1000:.2f}ms).",
+            f"{'phase (ms)':<16}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}",
+        ]
+        for column, name in enumerate(names):
+            lines.append(
+                f"{name:<16}" + "".join(f"{value:>10.3f}" for value in stats[:, column])
+            )
+
+        return "\n".join(lines)
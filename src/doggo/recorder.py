@@ -0,0 +1,143 @@
+# Recorder module writes the transitions of the brains to a compact binary log, and
+# feeds them back to the brains to replay a run.
+from __future__ import annotations
+
+import struct
+
+from collections import defaultdict
+from collections import deque
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+
+from doggo.dog import StateID
+from doggo.dog.brain import Brain
+from doggo.dog.brain import Direction
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from doggo.dog.brain import StateConfig
+
+
+MAGIC = b"DOGGOREC"
+VERSION = 1
+HEADER = struct.Struct(f"<{len(MAGIC)}sH")  # Magic, version.
+RECORD = struct.Struct("<dHBIB")  # Time, dog id, state, countdown, direction.
+
+
+class Transition(NamedTuple):
+    """A recorded transition of a brain."""
+
+    time: float
+    dog_id: int
+    state: StateID
+    countdown: int
+    direction: Direction
+
+
+class TransitionRecorder:
+    """Write each transition of the brains to a binary log.
+
+    The log is a header followed by fixed size records, 16 bytes per transition, so
+    recording costs a single pack and a buffered write.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = path
+        self.count: int = 0
+        self._file = path.open("wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION))
+
+    def add(self, brain: Brain) -> None:
+        """Record the transitions of the brain, starting with its current state."""
+        brain.recorder = self
+        self.record(brain)
+
+    def record(self, brain: Brain) -> None:
+        """Record the current state of the brain."""
+        state = brain.current_state
+        self._file.write(
+            RECORD.pack(
+                state.started_at,
+                brain.dog_id,
+                state.id,
+                state.countdown,
+                state.direction,
+            )
+        )
+        self.count += 1
+
+    def close(self) -> None:
+        """Flush and close the log."""
+        self._file.close()
+
+
+def read_transitions(path: Path) -> Iterator[Transition]:
+    """Read the transitions of a log, in their recording order."""
+    data = memoryview(path.read_bytes())
+    if len(data) < HEADER.size:
+        raise ValueError(f"Not a transition log: {path}")
+
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a transition log: {path}")
+
+    records = data[HEADER.size :]
+    # A log cut short, e.g. by a crash, is read up to its last whole record.
+    records = records[: len(records) - len(records) % RECORD.size]
+    for time, dog_id, state, countdown, direction in RECORD.iter_unpack(records):
+        yield Transition(time, dog_id, StateID(state), countdown, Direction(direction))
+
+
+class TransitionPlayer:
+    """Feed recorded transitions to the brains, instead of drawing them.
+
+    Each brain plays the transitions of its dog in order, and goes back to its own
+    random draws when they run out.
+    """
+
+    def __init__(self, transitions: Iterable[Transition]) -> None:
+        self._transitions: defaultdict[int, deque[Transition]] = defaultdict(deque)
+        for transition in transitions:
+            self._transitions[transition.dog_id].append(transition)
+
+    def add(self, brain: Brain) -> None:
+        """Play the transitions of the brain, starting with its recorded first state."""
+        brain.player = self
+        transition = self.next(brain.dog_id)
+        if transition is not None:
+            brain.play(transition, now=brain.current_state.started_at)
+
+    def next(self, dog_id: int) -> Transition | None:
+        """Return the next transition of the dog, if any."""
+        transitions = self._transitions.get(dog_id)
+        return transitions.popleft() if transitions else None
+
+    def __len__(self) -> int:
+        """Number of transitions left to play."""
+        return sum(len(transitions) for transitions in self._transitions.values())
+
+
+def replay(
+    transitions: Iterable[Transition], state_configs: list[StateConfig]
+) -> dict[int, Brain]:
+    """Feed the transitions through brains, at their recorded times.
+
+    It replays the exact state changes workload of a recorded run, e.g. to benchmark
+    it, and returns the brains by dog id.
+    """
+    brains: dict[int, Brain] = {}
+    for transition in transitions:
+        brain = brains.get(transition.dog_id)
+        if brain is None:
+            brain = brains[transition.dog_id] = Brain.from_config(
+                state_configs=state_configs,
+                default_state_id=transition.state,
+                dog_id=transition.dog_id,
+            )
+        brain.play(transition, now=transition.time)
+
+    return brains
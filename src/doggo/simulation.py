@@ -0,0 +1,222 @@
+# Simulation module runs the dog brains headless, on a virtual clock.
+from __future__ import annotations
+
+import random
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from numpy.random import default_rng
+
+from doggo.dog import StateID
+from doggo.dog.brain import State
+from doggo.dog.brain import TransitionTable
+from doggo.dog.pool import BrainPool
+
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    from doggo.dog.brain import StateConfig
+
+
+# From this number of dogs, enough brains expire at once for the numpy batches to
+# step them faster than one by one.
+BATCH_MIN_DOGS = 1000
+
+
+class SimulationReport:
+    """The behavior statistics gathered during a simulation."""
+
+    def __init__(
+        self,
+        dogs: int,
+        duration: float,
+        occupancy: npt.NDArray[np.float64],
+        dwell_times: npt.NDArray[np.float64],
+        stays: npt.NDArray[np.int64],
+        transition_counts: npt.NDArray[np.int64],
+    ) -> None:
+        self.dogs: int = dogs
+        self.duration: float = duration
+        self.occupancy: npt.NDArray[np.float64] = occupancy
+        self.dwell_times: npt.NDArray[np.float64] = dwell_times
+        self.stays: npt.NDArray[np.int64] = stays
+        self.transition_counts: npt.NDArray[np.int64] = transition_counts
+
+    @property
+    def transitions(self) -> int:
+        """Total number of transitions."""
+        return int(self.transition_counts.sum())
+
+    @property
+    def occupancy_share(self) -> npt.NDArray[np.float64]:
+        """Share of the simulated time spent in each state."""
+        return self.occupancy / (self.dogs * self.duration)
+
+    @property
+    def mean_dwell_times(self) -> npt.NDArray[np.float64]:
+        """Mean time spent in each state before leaving it, NaN if never left."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.dwell_times / self.stays
+
+    def __str__(self) -> str:
+        """Human-readable report."""
+        lines = [
+            f"{self.dogs} dog(s) simulated for {self.duration:.0f}s, "
+            f"{self.transitions} transitions.",
+            "",
+            f"{'state':<20}{'occupancy':>12}{'mean dwell':>12}{'stays':>12}",
+        ]
+        for state_id in StateID:
+            lines.append(
+                f"{state_id!s:<20}"
+                f"{self.occupancy_share[state_id]:>11.2%} "
+                f"{self.mean_dwell_times[state_id]:>11.2f}s"
+                f"{self.stays[state_id]:>12}"
+            )
+
+        lines += ["", "Transition counts (from rows to columns):"]
+        lines.append(" " * 20 + "".join(f"{state_id:>8}" for state_id in StateID))
+        for state_id in StateID:
+            lines.append(
+                f"{state_id!s:<20}"
+                + "".join(f"{count:>8}" for count in self.transition_counts[state_id])
+            )
+
+        return "\n".join(lines)
+
+
+def simulate(
+    state_configs: list[StateConfig],
+    dogs: int = 1,
+    duration: float = 86400.0,
+    seed: int | np.random.SeedSequence | None = None,
+    transitions: TransitionTable | None = None,
+) -> SimulationReport:
+    """Simulate the brains of the dogs for the given duration, in seconds.
+
+    The virtual clock jumps from a deadline to the next one, so the cost only depends
+    on the number of transitions and not on the simulated duration. The transitions
+    can be given already compiled, to share them between simulations.
+
+    Below `BATCH_MIN_DOGS` dogs, too few brains expire at once for the numpy batches
+    to pay off, and the brains are stepped one by one instead.
+    """
+    assert dogs > 0, "At least one dog must be simulated"
+    assert duration > 0, "The simulated duration must be positive"
+
+    rng = default_rng(seed)
+    if transitions is None:
+        transitions = TransitionTable.from_states(
+            [State(**state_config) for state_config in state_configs]
+        )
+    if dogs < BATCH_MIN_DOGS:
+        dwell_times, transition_counts, ongoing = step_brains(
+            state_configs, transitions, dogs=dogs, duration=duration, rng=rng
+        )
+    else:
+        pool = BrainPool.from_config(
+            state_configs=state_configs,
+            size=dogs,
+            now=0.0,
+            rng=rng,
+            transitions=transitions,
+        )
+        dwell_times, transition_counts, ongoing = step_pool(pool, duration=duration)
+
+    # Completed stays only are used for the dwell times, the ongoing ones still count
+    # in the occupancy.
+    return SimulationReport(
+        dogs=dogs,
+        duration=duration,
+        occupancy=dwell_times + ongoing,
+        dwell_times=dwell_times,
+        stays=transition_counts.sum(axis=1),
+        transition_counts=transition_counts,
+    )
+
+
+def step_pool(
+    pool: BrainPool, duration: float
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+    """Step a pool of brains in batches until the given time.
+
+    Return the time spent in the completed stays of each state, the transition
+    counts, and the time spent in each state by the ongoing stays.
+    """
+    nb_states = len(StateID)
+    dwell_times = np.zeros(nb_states, dtype=np.float64)
+    transition_counts = np.zeros(nb_states * nb_states, dtype=np.int64)
+
+    now = float(pool.deadlines.min())
+    while now < duration:
+        expired, left_state_ids, stay_times = pool.step(now)
+        dwell_times += np.bincount(
+            left_state_ids, weights=stay_times, minlength=nb_states
+        )
+        transition_counts += np.bincount(
+            left_state_ids * nb_states + pool.state_ids[expired],
+            minlength=nb_states * nb_states,
+        )
+        now = float(pool.deadlines.min())
+
+    ongoing = np.bincount(
+        pool.state_ids, weights=duration - pool.started_at, minlength=nb_states
+    )
+
+    return dwell_times, transition_counts.reshape(nb_states, nb_states), ongoing
+
+
+def step_brains(
+    state_configs: list[StateConfig],
+    transitions: TransitionTable,
+    dogs: int,
+    duration: float,
+    rng: np.random.Generator,
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+    """Step the brains one by one until the given time, in plain Python.
+
+    The brains are independent, so each one is stepped to the end before the next
+    one, with the alias tables inlined. Return the same statistics as `step_pool`.
+    """
+    nb_states = len(StateID)
+    configs = sorted(state_configs, key=lambda state_config: state_config["id"])
+    min_countdowns = [config["time_range"][0] for config in configs]
+    countdown_spans = [
+        config["time_range"][1] - config["time_range"][0] + 1 for config in configs
+    ]
+    probs = transitions.probs.tolist()
+    aliases = transitions.aliases.tolist()
+    draw = random.Random(int(rng.integers(2**63))).random  # nosec
+
+    dwell_times = [0] * nb_states
+    transition_counts = [[0] * nb_states for _ in range(nb_states)]
+    ongoing = [0.0] * nb_states
+    for _ in range(dogs):
+        state_id = int(draw() * nb_states)
+        countdown = min_countdowns[state_id] + int(draw() * countdown_spans[state_id])
+        deadline = countdown
+        while deadline < duration:
+            column_draw = draw() * nb_states
+            column = int(column_draw)
+            if column_draw - column < probs[state_id][column]:
+                next_state_id = column
+            else:
+                next_state_id = aliases[state_id][column]
+            dwell_times[state_id] += countdown
+            transition_counts[state_id][next_state_id] += 1
+
+            state_id = next_state_id
+            countdown = min_countdowns[state_id] + int(
+                draw() * countdown_spans[state_id]
+            )
+            deadline += countdown
+        ongoing[state_id] += duration - (deadline - countdown)
+
+    return (
+        np.array(dwell_times, dtype=np.float64),
+        np.array(transition_counts, dtype=np.int64),
+        np.array(ongoing, dtype=np.float64),
+    )
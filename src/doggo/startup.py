@@ -0,0 +1,119 @@
+# Startup module measures the cost of the imports and initialization of doggo.
+from __future__ import annotations
+
+import builtins
+import sys
+import time
+
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+    from types import ModuleType
+
+
+class StartupTimer:
+    """Time the modules imported by doggo and the initialization steps.
+
+    Like `python -X importtime`, but only the imports made from the doggo modules are
+    timed, and their time includes the one of the modules they import themselves.
+    """
+
+    def __init__(self) -> None:
+        self.start: float = time.perf_counter()
+        # (depth, importer, imported module, seconds)
+        self.imports: list[tuple[int, str, str, float]] = []
+        # (step, seconds since the start)
+        self.marks: list[tuple[str, float]] = []
+        self._import = builtins.__import__
+        self._depth: int = 0
+
+    def install(self) -> None:
+        """Start timing the imports."""
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self) -> None:
+        """Stop timing the imports."""
+        builtins.__import__ = self._import
+
+    def _timed_import(
+        self,
+        name: str,
+        globals: Mapping[str, object] | None = None,
+        locals: Mapping[str, object] | None = None,
+        fromlist: Sequence[str] | None = (),
+        level: int = 0,
+    ) -> ModuleType:
+        importer = str((globals or {}).get("__name__", ""))
+        if name in sys.modules or not importer.startswith("doggo"):
+            return self._import(name, globals, locals, fromlist, level)
+
+        # Reserve the line now, so the imports are listed in their import order.
+        entry = len(self.imports)
+        self.imports.append((self._depth, importer, name, 0.0))
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return self._import(name, globals, locals, fromlist, level)
+        finally:
+            self._depth -= 1
+            self.imports[entry] = (
+                self._depth,
+                importer,
+                name,
+                time.perf_counter() - start,
+            )
+
+    def mark(self, step: str) -> None:
+        """Record the end of an initialization step."""
+        self.marks.append((step, time.perf_counter() - self.start))
+
+    def report(self) -> str:
+        """Human-readable startup timings, in ms."""
+        lines = ["Imports (cumulative ms):"]
+        for depth, importer, name, seconds in self.imports:
+            lines.append(f"{seconds * 1000:>9.1f}  {'  ' * depth}{name} ({importer})")
+
+        lines.append("Steps (ms since the start):")
+        previous = 0.0
+        for step, seconds in self.marks:
+            lines.append(
+                f"{seconds * 1000:>9.1f}  {step} (+{(seconds - previous) * 1000:.1f})"
+            )
+            previous = seconds
+
+        return "\n".join(lines)
+
+
+_timer: StartupTimer | None = None
+
+
+def start() -> None:
+    """Start timing the startup."""
+    global _timer
+
+    _timer = StartupTimer()
+    _timer.install()
+
+
+def mark(step: str) -> None:
+    """Record the end of an initialization step, if the startup is timed."""
+    if _timer is not None:
+        _timer.mark(step)
+
+
+def done(step: str) -> None:
+    """Record the last step and log the startup timings, if the startup is timed."""
+    global _timer
+
+    if _timer is None:
+        return
+
+    from loguru import logger
+
+    _timer.mark(step)
+    _timer.uninstall()
+    logger.info("Startup timings:\n{}", _timer.report())
+    _timer = None
@@ -0,0 +1,269 @@
+# Sweep module simulates a grid of state configuration variants, over all the cores.
+from __future__ import annotations
+
+import itertools
+import json
+import math
+import multiprocessing
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from doggo.dog import StateID
+from doggo.dog.brain import TransitionTable
+from doggo.simulation import simulate
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import numpy.typing as npt
+
+    from doggo.dog.brain import StateConfig
+
+
+# A transition, from a state to another one.
+TransitionKey = tuple[StateID, StateID]
+
+
+def apply_variant(
+    state_configs: list[StateConfig], probs: dict[TransitionKey, float]
+) -> list[StateConfig]:
+    """Return a copy of the state configurations with the given probabilities.
+
+    The other transitions of a changed state are rescaled, so they still sum to 1.
+    Raise a ValueError if they can't be.
+    """
+    configs: list[StateConfig] = [
+        {**state_config, "transitions": dict(state_config["transitions"])}
+        for state_config in state_configs
+    ]
+    configs_by_id = {state_config["id"]: state_config for state_config in configs}
+    for source in {source for source, _ in probs}:
+        transitions = configs_by_id[source]["transitions"]
+        fixed = {
+            target: p for (state_id, target), p in probs.items() if state_id == source
+        }
+        rest = sum(p for target, p in transitions.items() if target not in fixed)
+        if not all(0 <= p <= 1 for p in fixed.values()):
+            raise ValueError(
+                f"The transition probabilities of state {source} must be within [0, 1]"
+            )
+        if sum(fixed.values()) > 1 or not (
+            rest or math.isclose(sum(fixed.values()), 1.0)
+        ):
+            raise ValueError(
+                f"The transition probabilities of state {source} can't sum to 1"
+            )
+        scale = (1 - sum(fixed.values())) / rest if rest else 0.0
+        for target, p in transitions.items():
+            transitions[target] = fixed.get(target, p * scale)
+
+    return configs
+
+
+def parse_grid_axis(text: str) -> tuple[TransitionKey, list[float]]:
+    """Parse a grid axis written as `SOURCE:TARGET=p1,p2,...`."""
+    transition, _, values = text.partition("=")
+    source, _, target = transition.partition(":")
+    try:
+        key = (StateID[source.upper()], StateID[target.upper()])
+    except KeyError as error:
+        raise ValueError(f"Unknown state {error}") from None
+
+    probs = [float(value) for value in values.split(",")]
+    for p in probs:
+        if not 0 <= p <= 1:
+            raise ValueError(f"Probability {p} isn't within [0, 1]")
+
+    return key, probs
+
+
+class Sweep:
+    """A grid of state configuration variants, each simulated several times.
+
+    Each task simulates a variant once, with its own seed spawned from the sweep
+    seed, so the results don't depend on how the tasks are spread over the workers.
+    The variants are checked when the sweep is created, before any worker starts.
+    """
+
+    def __init__(
+        self,
+        state_configs: list[StateConfig],
+        grid: dict[TransitionKey, list[float]],
+        replicates: int = 1,
+        dogs: int = 100,
+        duration: float = 86400.0,
+        seed: int | None = None,
+    ) -> None:
+        assert replicates > 0, "A sweep needs at least one replicate"
+
+        self.state_configs: list[StateConfig] = state_configs
+        self.keys: list[TransitionKey] = list(grid)
+        self.variants: list[tuple[float, ...]] = list(itertools.product(*grid.values()))
+        self.replicates: int = replicates
+        self.dogs: int = dogs
+        self.duration: float = duration
+        self.seed_sequence = np.random.SeedSequence(seed)
+        # Compiled lazily in each worker, once per variant, and shared by the
+        # replicates of the variant.
+        self._compiled: dict[int, tuple[list[StateConfig], TransitionTable]] = {}
+
+        for values in self.variants:
+            apply_variant(state_configs, dict(zip(self.keys, values, strict=True)))
+
+    def __len__(self) -> int:
+        """Number of simulations of the sweep."""
+        return len(self.variants) * self.replicates
+
+    @property
+    def columns(self) -> dict[str, str]:
+        """The result columns and their types, named to be valid file names."""
+        return {
+            "variant": "<i4",
+            "replicate": "<i4",
+            **{f"p.{source.name}.{target.name}": "<f8" for source, target in self.keys},
+            "transitions": "<i8",
+            **{f"share.{state_id.name}": "<f8" for state_id in StateID},
+            **{f"dwell.{state_id.name}": "<f8" for state_id in StateID},
+        }
+
+    def get_configs(self, variant: int) -> tuple[list[StateConfig], TransitionTable]:
+        """Return the state configurations of a variant and their transition table."""
+        compiled = self._compiled.get(variant)
+        if compiled is None:
+            probs = dict(zip(self.keys, self.variants[variant], strict=True))
+            configs = apply_variant(self.state_configs, probs)
+            transitions = TransitionTable(
+                matrix=[
+                    [config["transitions"][state_id] for state_id in StateID]
+                    for config in sorted(configs, key=lambda config: config["id"])
+                ]
+            )
+            compiled = self._compiled[variant] = (configs, transitions)
+
+        return compiled
+
+    def run(self, task: int) -> list[float]:
+        """Simulate a task and return its row of results."""
+        variant, replicate = divmod(task, self.replicates)
+        seed = np.random.SeedSequence(self.seed_sequence.entropy, spawn_key=(task,))
+        configs, transitions = self.get_configs(variant)
+        report = simulate(
+            state_configs=configs,
+            dogs=self.dogs,
+            duration=self.duration,
+            seed=seed,
+            transitions=transitions,
+        )
+
+        return [
+            variant,
+            replicate,
+            *self.variants[variant],
+            report.transitions,
+            *report.occupancy_share,
+            *report.mean_dwell_times,
+        ]
+
+
+class ColumnWriter:
+    """Stream rows of results to a columnar output.
+
+    The output is a folder with a raw little endian file per column, described by a
+    JSON schema, so a column is read at once with `numpy.fromfile`. The rows are
+    buffered and appended to the columns by batches.
+    """
+
+    def __init__(self, path: Path, columns: dict[str, str], batch: int = 256) -> None:
+        self.path: Path = path
+        self.columns: dict[str, str] = columns
+        self.batch: int = batch
+        self.count: int = 0
+        self._rows: list[list[float]] = []
+
+        path.mkdir(parents=True, exist_ok=True)
+        path.joinpath("columns.json").write_text(json.dumps(columns))
+        self._files = {
+            name: path.joinpath(f"{name}.bin").open("wb") for name in columns
+        }
+
+    def write(self, row: list[float]) -> None:
+        """Add a row of results."""
+        self._rows.append(row)
+        if len(self._rows) >= self.batch:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append the buffered rows to the columns."""
+        if not self._rows:
+            return
+
+        for values, (name, dtype) in zip(
+            zip(*self._rows, strict=True), self.columns.items(), strict=True
+        ):
+            self._files[name].write(np.array(values, dtype=dtype).tobytes())
+        self.count += len(self._rows)
+        self._rows.clear()
+
+    def close(self) -> None:
+        """Flush the rows and close the columns."""
+        self.flush()
+        for file in self._files.values():
+            file.close()
+
+
+def read_columns(path: Path) -> dict[str, npt.NDArray[np.generic]]:
+    """Read the columns of a sweep output."""
+    columns: dict[str, str] = json.loads(path.joinpath("columns.json").read_text())
+
+    return {
+        name: np.fromfile(path.joinpath(f"{name}.bin"), dtype=dtype)
+        for name, dtype in columns.items()
+    }
+
+
+# The sweep of the worker process, received once when the worker starts.
+_worker_sweep: Sweep | None = None
+
+
+def _init_worker(sweep: Sweep) -> None:
+    """Keep the sweep in the worker, so the tasks only carry their index."""
+    global _worker_sweep
+    _worker_sweep = sweep
+
+
+def _run_task(task: int) -> list[float]:
+    """Run a task of the worker sweep."""
+    assert _worker_sweep is not None, "The worker wasn't initialized"
+    return _worker_sweep.run(task)
+
+
+def run_sweep(sweep: Sweep, output: Path, workers: int | None = None) -> int:
+    """Run the sweep over a pool of processes, one per core by default.
+
+    The sweep is sent once to each worker and the tasks are sent by chunks, so the
+    workers only exchange indices and rows of results. The rows are streamed to the
+    output in the tasks order. Return the number of rows written.
+    """
+    workers = workers or os.cpu_count() or 1
+    writer = ColumnWriter(path=output, columns=sweep.columns)
+    # Enough chunks per worker to balance the load, few enough to limit the messages.
+    chunksize = max(1, len(sweep) // (workers * 4))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            # Fresh workers, the threads of the parent (e.g. the logs) aren't forked.
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(sweep,),
+        ) as executor:
+            for row in executor.map(_run_task, range(len(sweep)), chunksize=chunksize):
+                writer.write(row)
+    finally:
+        writer.close()
+
+    return writer.count
@@ -1,38 +1,47 @@
 from __future__ import annotations
 
-from typing import cast
-
 import pygame as pg
 
 
 class DraggableWindow:
     """A draggable window.
 
-    Allow the user to drag the window by clicking and dragging it.
+    Allow the user to drag the window by clicking and dragging it. The mouse motions
+    are coalesced, the window is moved at most once per frame, by `update`, to the
+    latest mouse position.
     """
 
     def __init__(self, window: pg.window.Window) -> None:
         self.window: pg.window.Window = window
-        self.start_position = pg.Vector2(self.window.position)
+        self.start_position: tuple[int, int] = self.window.position
         self.dragged = False
+        self.moved = False
 
     def process_event(self, event: pg.event.Event) -> None:
         """Process the event to drag the window."""
         if event.type == pg.MOUSEBUTTONDOWN:
             self.dragged = True
-            self.start_position = pg.Vector2(pg.mouse.get_pos())
+            self.start_position = pg.mouse.get_pos()
             pg.mouse.set_cursor(pg.SYSTEM_CURSOR_SIZEALL)
 
         elif event.type == pg.MOUSEMOTION:
-            if self.dragged:
-                window_position = pg.Vector2(self.window.position)
-                mouse_position = pg.Vector2(pg.mouse.get_pos())
-
-                self.window.position = cast(
-                    tuple[int, int],
-                    window_position + mouse_position - self.start_position,
-                )
+            self.moved = self.dragged
 
         elif event.type == pg.MOUSEBUTTONUP:
+            self.update()  # Don't miss the last move.
             self.dragged = False
             pg.mouse.set_cursor(pg.SYSTEM_CURSOR_ARROW)
+
+    def update(self) -> None:
+        """Move the dragged window, if the mouse moved since the last update."""
+        if not self.moved:
+            return
+
+        self.moved = False
+        window_x, window_y = self.window.position
+        mouse_x, mouse_y = pg.mouse.get_pos()
+        start_x, start_y = self.start_position
+        self.window.position = (
+            window_x + mouse_x - start_x,
+            window_y + mouse_y - start_y,
+        )
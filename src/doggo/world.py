@@ -1,7 +1,7 @@
 from __future__ import annotations
 
+import random
 import sys
-import time
 
 from typing import TYPE_CHECKING
 
@@ -9,18 +9,45 @@ import pygame as pg
 
 from loguru import logger
 
+from doggo import startup
+from doggo.clock import MonotonicClock
+from doggo.dog import StateID
 from doggo.dog.dog import Dog
-from doggo.prepare import build_dog
+from doggo.dog.scheduler import Scheduler
+from doggo.prepare import build_dogs
 from doggo.prepare import build_landscape
+from doggo.prepare import get_behavior
+from doggo.profiler import Phase
 from doggo.ui import DraggableWindow
 
 
 if TYPE_CHECKING:
     from pathlib import Path
 
+    from doggo.behavior import ProfileWatcher
+    from doggo.clock import Clock
+    from doggo.profiler import FrameProfiler
+    from doggo.recorder import TransitionPlayer
+    from doggo.recorder import TransitionRecorder
+
+
+# The only events handled, the others are blocked and never reach the queue. The
+# mouse motions are only allowed while dragging the window.
+HANDLED_EVENTS = [
+    pg.QUIT,
+    pg.KEYDOWN,
+    pg.MOUSEBUTTONDOWN,
+    pg.MOUSEBUTTONUP,
+    pg.WINDOWMINIMIZED,
+    pg.WINDOWHIDDEN,
+    pg.WINDOWRESTORED,
+    pg.WINDOWSHOWN,
+    pg.WINDOWEXPOSED,
+]
+
 
 class World:
-    """The world where the dog lives.
+    """The world where the dogs live.
 
     It contains the game loop and the main logic of the game.
     """
@@ -32,8 +59,40 @@ class World:
         icon: Path,
         fps: int = 60,
         render_size: tuple[int, int] | None = None,
+        clock: Clock | None = None,
+        dirty_rects: bool = False,
+        prescale: bool = True,
+        profiler: FrameProfiler | None = None,
+        dogs: int = 1,
+        time_step: float = 1 / 60,
+        max_backlog: float = 0.25,
+        seed: int | None = None,
+        recorder: TransitionRecorder | None = None,
+        player: TransitionPlayer | None = None,
+        watcher: ProfileWatcher | None = None,
     ) -> None:
-        pg.init()
+        """Initialize the world.
+
+        When a render size is given, the assets are scaled once at load time and the
+        frames are composed directly at the render size (prescale), or the frames are
+        composed at the world size and scaled as a whole at each frame.
+        The profiler, if given, times each phase of the frames.
+        The world is simulated by fixed time steps, whatever the frame rate, and the
+        dogs are drawn interpolated between their last two steps. When the simulation
+        is more than the max backlog (real seconds) late, e.g. after a stall or an idle
+        sleep, the late time is skipped by the dogs, so they never teleport.
+        The seed, if given, makes the landscape and the dogs reproducible. The brains
+        transitions are written by the recorder, or fed back by the player. The
+        watcher, if given, hot reloads the behavior profile into the brains.
+        Only the display subsystem is used, the others, e.g. audio or joysticks, are
+        never started.
+        """
+        assert dogs > 0, "The world needs at least one dog"
+
+        pg.display.init()
+        pg.event.set_blocked(None)
+        pg.event.set_allowed(HANDLED_EVENTS)
+        startup.mark("display init")
         self.window: pg.window.Window = pg.window.Window(
             title=title,
             size=render_size if render_size else size,
@@ -41,17 +100,68 @@ class World:
             always_on_top=True,
         )
         self._running: bool = False
+        # The event which woke the world up, handled before the queued ones.
+        self._pending_event: pg.event.Event | None = None
+        self.visible: bool = True
         self.window_surf: pg.Surface = self.window.get_surface()
-        self.screen: pg.Surface = pg.Surface(size=size)
         self.window.set_icon(pg.image.load(icon).convert_alpha())
         self.draggable: DraggableWindow = DraggableWindow(window=self.window)
         self.render_size: tuple[int, int] | None = render_size
+        self.scale: tuple[float, float] | None = None
+        self._scaled_screen: pg.Surface | None = None
+        if render_size and prescale:
+            self.scale = (render_size[0] / size[0], render_size[1] / size[1])
+            self.screen: pg.Surface = self.window_surf
+        else:
+            self.screen = pg.Surface(size=size)
+            if render_size:
+                self._scaled_screen = pg.Surface(size=render_size)
         self.fps: int = fps
         self.clock: pg.time.Clock = pg.time.Clock()
+        self.time: Clock = clock or MonotonicClock()
         self.dt: float = 0.0
-        self.prev_time: float = time.time()
-        self.landscape = build_landscape()
-        self.dog: Dog = build_dog()
+        self.now: float = self.time.now()
+        self.prev_time: float = self.now
+        # Fixed time step simulation state.
+        self.time_step: float = time_step
+        self.max_backlog: float = max_backlog
+        self.sim_now: float = self.now
+        self.accumulator: float = 0.0
+        startup.mark("window")
+        rng = random.Random(seed)
+        self.landscape = build_landscape(
+            size=render_size if self.scale else None, rng=rng
+        )
+        # Ordered by depth, so they are drawn from the farthest to the closest.
+        self.dogs: list[Dog] = build_dogs(
+            count=dogs,
+            clock=self.time,
+            scale=self.scale,
+            rng=rng,
+            heightmap=self.landscape.heightmap,
+        )
+        self.recorder: TransitionRecorder | None = recorder
+        self.watcher: ProfileWatcher | None = watcher
+        # The brains are only woken up when their state expires.
+        self.scheduler: Scheduler = Scheduler()
+        for dog in self.dogs:
+            if player is not None:
+                player.add(dog.brain)
+            if recorder is not None:
+                recorder.add(dog.brain)
+            self.scheduler.add(dog.brain)
+        # Dirty rectangles rendering state.
+        self.dirty_rects: bool = dirty_rects
+        self._full_redraw: bool = True
+        self._prev_rects: list[pg.Rect] = []
+        self._prev_images: list[pg.Surface] = []
+        self.profiler: FrameProfiler | None = profiler
+        startup.mark("assets")
+
+    @property
+    def dog(self) -> Dog:
+        """The closest dog of the world."""
+        return self.dogs[-1]
 
     def is_running(self) -> bool:
         """Check if the world is running."""
@@ -61,67 +171,313 @@ class World:
         """Adapt the screen to the window size if fullscreen.
 
         Didn't respect the aspect ratio, to use only if the display ratio is the same
-        as the default window size one.
+        as the default window size one. The scaled frame is drawn into the same
+        preallocated surface at each frame.
         """
-        if self.render_size:
-            return pg.transform.scale(self.screen, self.render_size)
+        if self._scaled_screen is not None:
+            return pg.transform.scale(
+                self.screen, self._scaled_screen.get_size(), self._scaled_screen
+            )
 
         return self.screen
 
+    def present(self, rects: list[pg.Rect] | None = None) -> None:
+        """Push the screen, or only the given areas of it, to the window."""
+        if self.screen is not self.window_surf:
+            if rects is None or self._scaled_screen is not None:
+                # Scaled areas wouldn't match exactly the scaled frame, the whole
+                # frame is scaled instead.
+                self.window_surf.blit(self.get_screen(), (0, 0))
+            else:
+                for rect in rects:
+                    self.window_surf.blit(self.screen, rect, area=rect)
+
+        self.window.flip()
+        startup.done("first frame")
+
     def process_inputs(self) -> None:
-        """Process the inputs of the world."""
-        for event in pg.event.get():
+        """Process the inputs of the world.
+
+        The window is moved once, after all the events, whatever the number of mouse
+        motions. The mouse motions are only let through while the window is dragged,
+        so hovering the window doesn't wake the world up. Clicking a dog makes it
+        bark.
+        """
+        events = pg.event.get()
+        if self._pending_event is not None:
+            events.insert(0, self._pending_event)
+            self._pending_event = None
+
+        for event in events:
             if event.type == pg.QUIT or (
                 event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE
             ):
                 self.stop()
+            elif event.type in (pg.WINDOWMINIMIZED, pg.WINDOWHIDDEN):
+                self.visible = False
+            elif event.type in (pg.WINDOWRESTORED, pg.WINDOWSHOWN, pg.WINDOWEXPOSED):
+                self.visible = True
+                self.invalidate()
+            elif event.type == pg.MOUSEBUTTONDOWN and event.button == pg.BUTTON_LEFT:
+                self.poke(pos=event.pos)
 
             self.draggable.process_event(event=event)
 
+        self.draggable.update()
+        if self.draggable.dragged == pg.event.get_blocked(pg.MOUSEMOTION):
+            if self.draggable.dragged:
+                pg.event.set_allowed(pg.MOUSEMOTION)
+            else:
+                pg.event.set_blocked(pg.MOUSEMOTION)
+
+    def get_dog_at(self, pos: tuple[int, int]) -> Dog | None:
+        """Return the closest dog on the given point of the window, if any."""
+        if self._scaled_screen is not None:
+            # The screen is scaled up to the window, map the point back to it.
+            (width, height), (window_width, window_height) = (
+                self.screen.get_size(),
+                self._scaled_screen.get_size(),
+            )
+            pos = (pos[0] * width // window_width, pos[1] * height // window_height)
+
+        for dog in reversed(self.dogs):
+            if dog.collide_point(pos):
+                return dog
+
+        return None
+
+    def poke(self, pos: tuple[int, int]) -> None:
+        """Make the dog on the given point of the window bark, if any."""
+        dog = self.get_dog_at(pos)
+        if dog is not None:
+            dog.brain.change_state(StateID.STAND_AND_BARK, now=self.sim_now)
+
     def get_dt(self) -> None:
-        """Calculate the delta time."""
-        now = time.time()
-        self.dt = now - self.prev_time
-        self.prev_time = now
+        """Calculate the delta time.
+
+        The time is read once per frame and shared with everything in the world.
+        """
+        self.now = self.time.now()
+        self.dt = self.now - self.prev_time
+        self.prev_time = self.now
 
     def update(self) -> None:
-        """Update the world."""
-        self.dog.update(dt=self.dt)
+        """Update the world.
+
+        Run as many fixed steps as the elapsed time allows, the leftover time is kept
+        for the next frame and used to interpolate the dogs positions.
+        """
+        if self.watcher is not None:
+            self.reload_behavior()
+
+        self.accumulator += self.dt
+        if self.accumulator > self.max_backlog * self.time.scale:
+            # Too late for fixed steps, jump to the last one. The brains still catch
+            # up with the skipped time at this step.
+            logger.debug("Skip {:.3f}s of simulation.", self.accumulator)
+            self.sim_now += self.accumulator - self.time_step
+            self.accumulator = self.time_step
+
+        while self.accumulator >= self.time_step:
+            self.accumulator -= self.time_step
+            self.simulate(dt=self.time_step)
+
+        alpha = self.accumulator / self.time_step
+        for dog in self.dogs:
+            dog.interpolate(alpha=alpha)
+
+    def reload_behavior(self) -> None:
+        """Reload the behavior profile into the brains, if it changed.
+
+        Only the brains are reloaded, the bodies keep their frames.
+        """
+        assert self.watcher is not None, "The world has no behavior watcher"
+
+        profile = self.watcher.poll()
+        if profile is None:
+            return
+
+        for dog in self.dogs:
+            dog.brain.reload(
+                state_configs=profile.state_configs, transitions=profile.transitions
+            )
+        if profile.sprite_conf_per_state != get_behavior().sprite_conf_per_state:
+            logger.warning("The sprites of the behavior profile need a restart.")
+
+    def simulate(self, dt: float) -> None:
+        """Move the simulation forward by the given time."""
+        self.sim_now += dt
+        self.scheduler.update(now=self.sim_now)
+        for dog in self.dogs:
+            dog.update(dt=dt, now=self.sim_now)
+
+    def get_blits(self) -> list[tuple[pg.Surface, pg.Rect]]:
+        """Return the images of all the dogs and their areas, ordered by depth."""
+        return [blit for dog in self.dogs for blit in dog.get_blits()]
+
+    def draw_dogs(self, blits: list[tuple[pg.Surface, pg.Rect]]) -> None:
+        """Draw all the dogs in a single batch."""
+        self.screen.fblits(blits)
 
     def render(self) -> None:
         """Render the world."""
-        self.screen.fill((135, 206, 235))
+        if self.dirty_rects:
+            self.render_dirty()
+            return
+
         self.landscape.background.draw(screen=self.screen)
-        self.dog.draw(screen=self.screen)
+        self.draw_dogs(self.get_blits())
         self.landscape.foreground.draw(screen=self.screen)
-        self.window_surf.blit(self.get_screen(), (0, 0))
-        self.window.flip()
+        self.present()
+
+    def invalidate(self) -> None:
+        """Force the next dirty rectangles rendering to redraw the whole world."""
+        self._full_redraw = True
+
+    def render_dirty(self) -> None:
+        """Render only the areas of the world which changed since the last frame.
+
+        The baked background of the landscape never changes, it's used to erase the
+        previous areas of the sprites before drawing them again. Nothing is drawn nor
+        flipped when the sprites didn't move nor change.
+        """
+        blits = self.get_blits()
+        rects = [rect for _, rect in blits]
+        images = [image for image, _ in blits]
+        screen_rect = self.screen.get_rect()
+        background = self.landscape.background
+
+        if self._full_redraw:
+            self._full_redraw = False
+            background.draw(screen=self.screen)
+            dirty = [screen_rect]
+        elif rects == self._prev_rects and all(
+            image is prev_image
+            for image, prev_image in zip(images, self._prev_images, strict=True)
+        ):
+            return
+        else:
+            dirty = [
+                rect.clip(screen_rect)
+                for rect in self._prev_rects + rects
+                if rect.colliderect(screen_rect)
+            ]
+            for rect in dirty:
+                self.screen.blit(
+                    background.image,
+                    rect,
+                    area=rect.move(-background.rect.x, -background.rect.y),
+                )
+
+        self.draw_dogs(blits)
+        foreground = self.landscape.foreground
+        for rect in dirty:
+            self.screen.blit(
+                foreground.image,
+                rect,
+                area=rect.move(-foreground.rect.x, -foreground.rect.y),
+            )
+
+        self._prev_rects = rects
+        self._prev_images = images
+        self.present(rects=dirty)
+
+    def get_idle_time(self) -> float:
+        """Return how long, in real seconds, nothing visible will change.
+
+        While the window is hidden, only the next state change matters.
+        """
+        if self.draggable.dragged:
+            return 0.0
+
+        # The simulation lags behind by the accumulated time.
+        now = self.sim_now + self.accumulator
+        if self.visible:
+            next_change = min(dog.get_next_change_time(now=now) for dog in self.dogs)
+        else:
+            next_change = self.scheduler.next_deadline
+
+        return max(0.0, (next_change - now) / self.time.scale)
+
+    def wait(self) -> None:
+        """Wait for the next frame.
+
+        Tick at the world frame rate while something moves, otherwise sleep in the
+        event queue until the next visible change, the inputs still wake the world up
+        immediately.
+        """
+        idle_time = self.get_idle_time()
+        if idle_time <= 1 / self.fps:
+            self.clock.tick(self.fps)
+            return
+
+        event = pg.event.wait(round(idle_time * 1000))
+        if event.type != pg.NOEVENT:
+            # Kept for the next inputs processing, ahead of the events queued after it.
+            self._pending_event = event
 
     def start(self) -> None:
         """Start the world"""
         logger.info("World started. Dog is awake.")
-        logger.info(
-            f"Dog parachuted in the world and start to {self.dog.current_state} "
-            f"for {self.dog.brain.current_state.countdown}s."
-        )
+        for dog in self.dogs:
+            dog.brain.logger.info(
+                "Dog parachuted in the world and start to {state} for {countdown}s.",
+                state=dog.current_state,
+                countdown=dog.brain.current_state.countdown,
+            )
 
         self._running = True
         self.run()
 
+    def step(self) -> None:
+        """Run a frame of the world."""
+        self.get_dt()
+        self.process_inputs()
+        self.update()
+        if self.visible:
+            self.render()
+        self.wait()
+
+    def profiled_step(self) -> None:
+        """Run a frame of the world, timing each of its phases."""
+        assert self.profiler is not None, "The world has no profiler"
+
+        profiler = self.profiler
+        profiler.start_frame()
+        self.get_dt()
+        profiler.lap(Phase.GET_DT)
+        self.process_inputs()
+        profiler.lap(Phase.PROCESS_INPUTS)
+        self.update()
+        profiler.lap(Phase.UPDATE)
+        if self.visible:
+            self.render()
+        profiler.lap(Phase.RENDER)
+        self.wait()
+        profiler.lap(Phase.WAIT)
+        profiler.end_frame()
+
     def run(self) -> None:
         """World game loop."""
+        # The loop is chosen once, so it costs nothing when not profiled.
+        step = self.step if self.profiler is None else self.profiled_step
         try:
             while self.is_running():
-                self.get_dt()
-                self.process_inputs()
-                self.update()
-                self.render()
-                self.clock.tick(self.fps)
+                step()
         except KeyboardInterrupt:
             logger.info("A mysterious force stopped the world.")
         except Exception as error:
-            logger.error(f"World crashed: {error}.")
+            logger.error("World crashed: {}.", error)
         finally:
+            if self.profiler is not None:
+                logger.info("Frame profile:\n{}", self.profiler.report())
+            if self.recorder is not None:
+                self.recorder.close()
+                logger.info(
+                    "{} transitions recorded in {}.",
+                    self.recorder.count,
+                    self.recorder.path,
+                )
             self.destroy()
 
     def stop(self) -> None:
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import os
+
 import pygame as pg
 import pytest
 
 
+# Tests must not write the sprite atlas in the user cache, the atlas is tested on its
+# own with a temporary cache.
+os.environ["DOGGO_ATLAS"] = "0"
+
+
 @pytest.fixture(scope="session")
 def pygame_test():
     """Start and stop pygame instance for a test."""
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import gc
+
 import pygame as pg
 import pytest
 
@@ -7,6 +9,7 @@ from doggo import ASSETS_PATH
 from doggo import config
 from doggo.dog import StateID
 from doggo.dog.body import Body
+from doggo.dog.body import FrameStore
 from doggo.dog.body import Fur
 from doggo.dog.body import SpriteSheet
 from doggo.dog.brain import Brain
@@ -19,7 +22,7 @@ def test_fur_random_returns_a_fur_color():
     assert isinstance(fur, Fur)
 
 
-def test_body_get_image_returns_surface_cyclically(pygame_test):
+def test_body_get_image_samples_the_frames_from_the_state_time(pygame_test):
     body = Body(
         fur=Fur.random(),
         sprite_size=config.SPRITE_SIZE,
@@ -30,22 +33,24 @@ def test_body_get_image_returns_surface_cyclically(pygame_test):
     brain = Brain.from_config(
         state_configs=config.DOG_STATES, default_state_id=StateID.SLEEP
     )
-    frames = []
+    brain.change_state(StateID.SLEEP, now=10.0)
+    state = brain.current_state
+    frames = body.images[StateID.SLEEP][state.direction]
+    rate = state.animation_time_rate
 
-    # Test the first cyclic of the get_image method.
-    for index in range(0, config.SPRITE_CONF_PER_STATE[StateID.SLEEP][0]):
-        image = body.get_image(brain=brain)
-        frames.append(image)
+    for index in range(len(frames)):
+        image = body.get_image(brain=brain, now=10.0 + (index + 0.5) * rate)
 
         assert isinstance(image, pg.Surface)
-        assert image is body.images[StateID.SLEEP][brain.current_state.direction][index]
+        assert image is frames[index]
 
-    # The next call should return the first frame.
-    next_cycle_image = body.get_image(brain=brain)
-    assert next_cycle_image is frames[0]
+    # After the last frame, the animation loops.
+    assert body.get_image(brain=brain, now=10.0 + len(frames) * rate) is frames[0]
+    # A long frame skips the frames instead of slowing the animation down.
+    assert body.get_image(brain=brain, now=10.0 + 6.5 * rate) is frames[2]
 
 
-def test_body_return_cycle_images_while_brain_state_is_the_same(pygame_test):
+def test_body_images_restart_with_the_brain_state(pygame_test):
     body = Body(
         fur=Fur.random(),
         sprite_size=config.SPRITE_SIZE,
@@ -55,23 +60,194 @@ def test_body_return_cycle_images_while_brain_state_is_the_same(pygame_test):
     brain = Brain.from_config(
         state_configs=config.DOG_STATES, default_state_id=StateID.SLEEP
     )
+    brain.change_state(StateID.SLEEP, now=0.0)
     brain.current_state.direction = Direction.LEFT
 
-    first_image = body.get_image(brain=brain)
-    second_image = body.get_image(brain=brain)
-
-    assert first_image is body.images[StateID.SLEEP][Direction.LEFT][0]
-    assert second_image is body.images[StateID.SLEEP][Direction.LEFT][1]
+    assert body.get_image(brain=brain, now=0.0) is (
+        body.images[StateID.SLEEP][Direction.LEFT][0]
+    )
+    assert body.get_image(brain=brain, now=0.25) is (
+        body.images[StateID.SLEEP][Direction.LEFT][1]
+    )
 
     # Change the brain state to test the switch of the images.
-    brain.change_state(StateID.IDLE)
+    brain.change_state(StateID.IDLE, now=0.3)
     brain.current_state.direction = Direction.RIGHT
 
-    third_image = body.get_image(brain=brain)
-    fourth_image = body.get_image(brain=brain)
+    assert body.get_image(brain=brain, now=0.3) is (
+        body.images[StateID.IDLE][Direction.RIGHT][0]
+    )
+
+
+def test_bodies_share_their_frame_tables(pygame_test):
+    frame_store = FrameStore(sprite_size=config.SPRITE_SIZE)
+    bodies = [
+        Body(
+            fur=Fur.GREY,
+            sprite_size=config.SPRITE_SIZE,
+            default_direction=config.SPRITE_DIRECTION,
+            sprite_conf_per_state=config.SPRITE_CONF_PER_STATE,
+            frame_store=frame_store,
+        )
+        for _ in range(2)
+    ]
+
+    assert bodies[0].images is bodies[1].images
+
+
+def test_body_scales_its_frames_once(pygame_test):
+    body = Body(
+        fur=Fur.random(),
+        sprite_size=config.SPRITE_SIZE,
+        default_direction=config.SPRITE_DIRECTION,
+        sprite_conf_per_state=config.SPRITE_CONF_PER_STATE,
+        scale=(2.0, 3.0),
+    )
+
+    assert body.frame_size == (64, 48)
+    for images_per_direction in body.images.values():
+        for images in images_per_direction.values():
+            assert {image.get_size() for image in images} == {(128, 144)}
+
+
+def test_body_shares_identical_frames(pygame_test):
+    body = Body(
+        fur=Fur.random(),
+        sprite_size=config.SPRITE_SIZE,
+        default_direction=config.SPRITE_DIRECTION,
+        sprite_conf_per_state=config.SPRITE_CONF_PER_STATE,
+    )
+
+    # IDLE and IDLE_AND_BARK use the same row of the sprite sheet.
+    for direction in Direction:
+        idle_frames = body.images[StateID.IDLE][direction]
+        idle_and_bark_frames = body.images[StateID.IDLE_AND_BARK][direction]
+        for idle_frame, idle_and_bark_frame in zip(idle_frames, idle_and_bark_frames):
+            assert idle_frame is idle_and_bark_frame
+
+
+def test_body_builds_a_mask_per_frame_once(pygame_test):
+    frame_store = FrameStore(sprite_size=config.SPRITE_SIZE)
+    body = Body(
+        fur=Fur.random(),
+        sprite_size=config.SPRITE_SIZE,
+        default_direction=config.SPRITE_DIRECTION,
+        sprite_conf_per_state=config.SPRITE_CONF_PER_STATE,
+        frame_store=frame_store,
+    )
+
+    for state, masks_per_direction in body.masks.items():
+        for direction, masks in masks_per_direction.items():
+            frames = body.images[state][direction]
+            assert [mask.get_size() for mask in masks] == [
+                frame.get_size() for frame in frames
+            ]
+    # IDLE and IDLE_AND_BARK use the same row of the sprite sheet.
+    assert body.masks[StateID.IDLE][Direction.LEFT][0] is (
+        body.masks[StateID.IDLE_AND_BARK][Direction.LEFT][0]
+    )
+
+
+def test_body_get_mask_follows_the_image(pygame_test):
+    body = Body(
+        fur=Fur.random(),
+        sprite_size=config.SPRITE_SIZE,
+        default_direction=config.SPRITE_DIRECTION,
+        sprite_conf_per_state=config.SPRITE_CONF_PER_STATE,
+    )
+    brain = Brain.from_config(
+        state_configs=config.DOG_STATES, default_state_id=StateID.WALK
+    )
+    brain.change_state(StateID.WALK, now=0.0, direction=Direction.RIGHT)
+    now = brain.current_state.animation_time_rate * 1.5
+
+    mask = body.get_mask(brain=brain, now=now)
+
+    assert mask is body.masks[StateID.WALK][Direction.RIGHT][1]
+    assert mask.count() == pg.mask.from_surface(body.get_image(brain, now)).count()
+
+
+def test_bodies_share_the_frames_of_their_frame_store(pygame_test):
+    frame_store = FrameStore(sprite_size=config.SPRITE_SIZE)
+    first, second = (
+        Body(
+            fur=Fur.GREY,
+            sprite_size=config.SPRITE_SIZE,
+            default_direction=config.SPRITE_DIRECTION,
+            sprite_conf_per_state=config.SPRITE_CONF_PER_STATE,
+            frame_store=frame_store,
+        )
+        for _ in range(2)
+    )
+
+    assert first.images[StateID.WALK][Direction.RIGHT][0] is (
+        second.images[StateID.WALK][Direction.RIGHT][0]
+    )
+
+
+def test_frame_store_hands_out_subsurfaces_for_unflipped_frames(pygame_test):
+    frame_store = FrameStore(sprite_size=config.SPRITE_SIZE)
+
+    frame = frame_store.get_frame(fur=Fur.GREY, loc=(1, 2))
+    flipped_frame = frame_store.get_frame(fur=Fur.GREY, loc=(1, 2), flip_x=True)
+
+    assert frame.get_parent() is not None
+    assert flipped_frame.get_parent() is None
+    assert frame is frame_store.get_frame(fur=Fur.GREY, loc=(1, 2))
+
+
+def test_frame_store_evicts_the_least_recently_used_furs(pygame_test):
+    frame_store = FrameStore(sprite_size=config.SPRITE_SIZE, max_frames=3)
+    first = frame_store.get_frame(fur=Fur.GREY, loc=(0, 0))
+    frame_store.get_frame(fur=Fur.ORANGE, loc=(0, 0))
+
+    frame_store.get_frame(fur=Fur.GREY, loc=(1, 0))  # Grey is used again.
+    frame_store.get_frame(fur=Fur.WHITE, loc=(0, 0))
+
+    assert len(frame_store) == 3
+    assert frame_store.get_frame(fur=Fur.GREY, loc=(0, 0)) is first
+    assert Fur.ORANGE not in frame_store._sprite_sheets
+
+
+def build_store_body(frame_store, fur):
+    return Body(
+        fur=fur,
+        sprite_size=config.SPRITE_SIZE,
+        default_direction=config.SPRITE_DIRECTION,
+        sprite_conf_per_state=config.SPRITE_CONF_PER_STATE,
+        frame_store=frame_store,
+    )
+
+
+def test_frame_store_keeps_the_furs_of_the_living_bodies(pygame_test):
+    frame_store = FrameStore(sprite_size=config.SPRITE_SIZE, max_frames=300)
+
+    # More dogs than the budget holds, all the furs twice.
+    bodies = [build_store_body(frame_store, fur) for _ in range(2) for fur in Fur]
+
+    assert len(frame_store) > 300
+    assert set(frame_store._frames) == set(Fur)
+    for body, same_fur_body in zip(bodies[: len(Fur)], bodies[len(Fur) :]):
+        assert same_fur_body.images is body.images
+        assert same_fur_body.masks is body.masks
+
+
+def test_frame_store_bounds_the_frames_of_the_unused_furs(pygame_test):
+    frame_store = FrameStore(sprite_size=config.SPRITE_SIZE, max_frames=300)
+    bodies = [build_store_body(frame_store, fur) for fur in Fur]
+    orange_body = bodies[Fur.ORANGE]
+    del bodies
+    gc.collect()
+
+    frame_store.get_frame(fur=Fur.GREY, loc=(0, 0), scale=(2.0, 2.0))
 
-    assert third_image is body.images[StateID.IDLE][Direction.RIGHT][0]
-    assert fourth_image is body.images[StateID.IDLE][Direction.RIGHT][1]
+    assert len(frame_store) <= 300
+    assert set(frame_store._frames) == {Fur.ORANGE, Fur.GREY}
+    # Only the tables of the kept furs remain, the evicted ones are released.
+    assert {key[0] for key in frame_store._frame_tables} == {Fur.ORANGE, Fur.GREY}
+    assert {key[0] for key in frame_store._mask_tables} == {Fur.ORANGE, Fur.GREY}
+    assert {key[0] for key in frame_store._masks} == {Fur.ORANGE, Fur.GREY}
+    assert build_store_body(frame_store, Fur.ORANGE).images is orange_body.images
 
 
 def test_sprite_sheet_get_sprite_returns_a_sprite(pygame_test):
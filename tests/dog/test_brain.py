@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import random
+
+import numpy as np
+import pytest
+
+from doggo.clock import VirtualClock
 from doggo.config import DOG_STATES
 from doggo.dog import StateID
+from doggo.dog.brain import BehaviorAnalysis
 from doggo.dog.brain import Brain
 from doggo.dog.brain import Direction
 from doggo.dog.brain import State
-from freezegun import freeze_time
+from doggo.dog.brain import TransitionTable
+from doggo.simulation import simulate
 
 
 def full_range(range_: tuple[int, int]) -> list[int]:
@@ -316,20 +324,21 @@ def test_get_random_direction():
 
 
 def test_state_is_done_when_time_is_up():
-    with freeze_time("2024-07-01 00:00:00"):
-        state = state_factory(StateID.IDLE)
+    state = state_factory(StateID.IDLE)
+    state.wind_up(now=10.0)
     state.countdown = 1
 
-    with freeze_time("2024-07-01 00:00:01"):
-        assert state.is_done() is True
+    assert state.is_done(now=10.5) is False
+    assert state.is_done(now=11.0) is True
 
 
 def test_wind_up_sets_countdown_and_direction():
     state = state_factory(StateID.IDLE)
     state.countdown = 0
 
-    state.wind_up()
+    state.wind_up(now=10.0)
 
+    assert state.started_at == 10.0
     assert state.countdown in full_range(state.time_range)
 
 
@@ -352,12 +361,197 @@ def test_change_state_of_brain():
 
 
 def test_update_brain_changes_state_when_time_is_up():
-    with freeze_time("2024-07-01 00:00:00"):
-        brain = Brain(states=get_states_test(), default_state_id=StateID.IDLE)
+    clock = VirtualClock()
+    brain = Brain(states=get_states_test(), default_state_id=StateID.IDLE, clock=clock)
     brain.current_state.countdown = 1
 
-    with freeze_time("2024-07-01 00:00:01"):
-        brain.update()
+    clock.advance(1)
+    brain.update()
 
     assert brain.current_state.id != StateID.IDLE
+    assert brain.current_state.started_at == 1.0
     assert brain.current_state.countdown in full_range(brain.current_state.time_range)
+
+
+def test_update_brain_uses_the_given_time_over_its_clock():
+    brain = Brain(
+        states=get_states_test(), default_state_id=StateID.IDLE, clock=VirtualClock()
+    )
+    brain.current_state.countdown = 1
+
+    brain.update(now=0.5)
+
+    assert brain.current_state.id == StateID.IDLE
+
+    brain.update(now=1.0)
+
+    assert brain.current_state.id != StateID.IDLE
+    assert brain.current_state.started_at == 1.0
+
+
+def test_transition_table_is_compiled_in_state_id_order():
+    states = get_states_test()
+    random.shuffle(states)
+
+    table = TransitionTable.from_states(states)
+
+    assert table.matrix.shape == (len(StateID), len(StateID))
+    for state in states:
+        assert table.matrix[state.id].tolist() == state.transitions
+
+
+def test_transition_table_never_picks_impossible_states():
+    table = TransitionTable.from_states(get_states_test())
+    rng = random.Random(42)
+
+    next_state_ids = {
+        table.next_state_id(state_id=StateID.RUN, rng=rng) for _ in range(1000)
+    }
+
+    assert next_state_ids == {
+        StateID.IDLE,
+        StateID.IDLE_AND_BARK,
+        StateID.WALK,
+        StateID.WALK_AND_BARK,
+        StateID.RUN,
+        StateID.RUN_AND_BARK,
+    }
+
+
+def test_transition_table_follows_transition_probabilities():
+    table = TransitionTable.from_states(get_states_test())
+    rng = random.Random(42)
+    draws = 50_000
+
+    counts = np.bincount(
+        [table.next_state_id(state_id=StateID.SLEEP, rng=rng) for _ in range(draws)],
+        minlength=len(StateID),
+    )
+
+    assert np.allclose(counts / draws, table.matrix[StateID.SLEEP], atol=0.01)
+
+
+def test_seeded_brains_take_the_same_decisions():
+    brains = [
+        Brain.from_config(state_configs=DOG_STATES, rng=random.Random(42))
+        for _ in range(2)
+    ]
+
+    for _ in range(100):
+        for brain in brains:
+            brain.current_state.countdown = 0
+            brain.update()
+
+        first, second = brains
+        assert first.current_state.id == second.current_state.id
+        assert first.current_state.countdown == second.current_state.countdown
+        assert first.current_state.direction == second.current_state.direction
+
+
+def chain(matrix):
+    # Pad a small chain with states always going back to the first one.
+    size = len(StateID)
+    padded = [[0.0] * size for _ in range(size)]
+    for row in range(size):
+        if row < len(matrix):
+            padded[row][: len(matrix)] = matrix[row]
+        else:
+            padded[row][0] = 1.0
+
+    return padded
+
+
+def test_behavior_analysis_stationary_distribution_is_invariant():
+    analysis = BehaviorAnalysis.from_config(state_configs=DOG_STATES)
+    distribution = analysis.stationary_distribution
+
+    assert np.isclose(distribution.sum(), 1.0)
+    assert np.allclose(distribution @ analysis.matrix, distribution)
+    assert analysis.unreachable_states == []
+    assert analysis.absorbing_states == []
+
+
+def test_behavior_analysis_matches_a_long_simulation():
+    analysis = BehaviorAnalysis.from_config(state_configs=DOG_STATES)
+    report = simulate(state_configs=DOG_STATES, dogs=1000, duration=3600.0, seed=42)
+
+    assert np.allclose(analysis.time_share, report.occupancy_share, atol=0.005)
+
+
+def test_behavior_analysis_time_share_is_weighted_by_the_dwell_times():
+    # Two states alternating, the second lasting three times longer.
+    analysis = BehaviorAnalysis(
+        matrix=chain([[0.0, 1.0], [1.0, 0.0]]), dwell_times=[1.0] + [3.0] * 12
+    )
+
+    assert np.allclose(analysis.stationary_distribution[:2], [0.5, 0.5])
+    assert np.allclose(analysis.time_share[:2], [0.25, 0.75])
+    assert analysis.unreachable_states == list(StateID)[2:]
+
+
+def test_behavior_analysis_mean_first_passage_times():
+    analysis = BehaviorAnalysis(
+        matrix=chain([[0.5, 0.5], [1.0, 0.0]]), dwell_times=[2.0] * 13
+    )
+
+    steps = analysis.mean_first_passage_steps
+    times = analysis.mean_first_passage_times
+    # Geometric number of tries to leave the first state.
+    assert steps[StateID.IDLE, StateID.IDLE_AND_BARK] == pytest.approx(2.0)
+    assert steps[StateID.IDLE_AND_BARK, StateID.IDLE] == pytest.approx(1.0)
+    # Mean recurrence is the inverse of the stationary probability.
+    assert steps[StateID.IDLE, StateID.IDLE] == pytest.approx(1.5)
+    assert times[StateID.IDLE, StateID.IDLE_AND_BARK] == pytest.approx(4.0)
+    # The other states are never reached.
+    assert np.isinf(steps[StateID.IDLE, StateID.SLEEP])
+
+
+def test_behavior_analysis_first_passage_is_infinite_when_it_may_never_happen():
+    # The first state may fall into the third one, absorbing, instead of the second.
+    analysis = BehaviorAnalysis(
+        matrix=chain([[0.0, 0.5, 0.5], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]]),
+        dwell_times=[1.0] * 13,
+    )
+    steps = analysis.mean_first_passage_steps
+    idle, bark, sleep = list(StateID)[:3]
+
+    assert np.isinf(steps[idle, bark])
+    assert np.isinf(steps[bark, bark])
+    assert np.isinf(steps[list(StateID)[5], bark])
+    assert steps[bark, idle] == pytest.approx(1.0)
+    assert steps[idle, sleep] == pytest.approx(3.0)
+    assert steps[sleep, sleep] == pytest.approx(1.0)
+
+
+def test_behavior_analysis_flags_absorbing_states():
+    analysis = BehaviorAnalysis(
+        matrix=chain([[0.0, 1.0], [0.0, 1.0]]), dwell_times=[1.0] * 13
+    )
+
+    assert analysis.absorbing_states == [StateID.IDLE_AND_BARK]
+    assert analysis.time_share[StateID.IDLE_AND_BARK] == pytest.approx(1.0)
+
+
+def test_brain_reload_keeps_the_current_state_going():
+    brain = Brain.from_config(state_configs=DOG_STATES)
+    brain.change_state(StateID.WALK, now=10.0, countdown=5, direction=Direction.LEFT)
+    state_configs = [
+        {**state_config, "transitions": {**state_config["transitions"]}}
+        for state_config in DOG_STATES
+    ]
+    for state_config in state_configs:
+        state_config["transitions"] = {
+            state_id: float(state_id == StateID.SLEEP) for state_id in StateID
+        }
+
+    brain.reload(state_configs=state_configs)
+
+    state = brain.current_state
+    assert (state.id, state.started_at, state.countdown, state.direction) == (
+        StateID.WALK,
+        10.0,
+        5,
+        Direction.LEFT,
+    )
+    brain.transition(now=15.0)
+    assert brain.current_state.id == StateID.SLEEP
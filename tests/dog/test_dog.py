@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import pygame as pg
 import pytest
 
 from doggo.dog import StateID
@@ -90,20 +91,91 @@ def test_dog_draw_on_screen(pygame_test, pg_screen_mock):
 
     dog.draw(screen=pg_screen_mock)
 
-    pg_screen_mock.blit.assert_called_once_with(dog.image, dest=dog.rect)
+    pg_screen_mock.fblits.assert_called_once_with([(dog.image, dog.rect)])
 
 
-def test_dog_draw_on_screen_with_its_clone(mocker, pygame_test, pg_screen_mock):
+def test_dog_draw_on_screen_with_its_clone(pygame_test, pg_screen_mock):
     dog = build_dog()
     dog.clone.visible = True
 
     dog.draw(screen=pg_screen_mock)
 
-    assert pg_screen_mock.blit.call_count == 2
-    assert pg_screen_mock.blit.call_args_list == [
-        mocker.call(dog.image, dest=dog.rect),
-        mocker.call(dog.image, dest=dog.clone.rect),
-    ]
+    pg_screen_mock.fblits.assert_called_once_with(
+        [(dog.image, dog.rect), (dog.image, dog.clone.rect)]
+    )
+
+
+def test_dog_blits_are_mapped_to_the_screen_when_scaled(pygame_test):
+    dog = build_dog(scale=(2.0, 3.0))
+    dog.rect.topleft = (10, 20)
+    dog.clone.visible = False
+
+    ((image, rect),) = dog.get_blits()
+
+    assert dog.rect.size == (64, 48)
+    assert image is dog.image
+    assert rect == pg.Rect(20, 60, 128, 144)
+
+
+def test_dog_collide_point_only_on_its_visible_pixels(pygame_test):
+    dog = build_dog()
+    dog.rect.topleft = (100, 10)
+    dog.clone.visible = False
+    mask = dog.body.get_mask(brain=dog.brain, now=dog.sampled_at)
+    x, y = mask.outline()[0]
+
+    assert dog.collide_point((100 + x, 10 + y))
+    assert not dog.collide_point((99, 10 + y))
+
+
+def test_dog_collide_point_on_its_clone(pygame_test):
+    dog = build_dog()
+    dog.rect.topleft = (100, 10)
+    dog.clone.rect.topleft = (300, 10)
+    dog.clone.visible = True
+    mask = dog.body.get_mask(brain=dog.brain, now=dog.sampled_at)
+    x, y = mask.outline()[0]
+
+    assert dog.collide_point((300 + x, 10 + y))
+
+
+def test_dog_follows_the_terrain(pygame_test):
+    dog = build_dog(ground=90, terrain=[0] * 100 + [5] * 240)
+    dog.brain.change_state(StateID.WALK)
+    dog.brain.current_state.direction = Direction.RIGHT
+    dog.x = 100.0 - dog.rect.width / 2 - 1
+
+    dog.update(dt=0.0)
+
+    assert dog.rect.bottom == 90
+
+    dog.update(dt=2 / dog.speed)
+
+    assert dog.rect.bottom == 85
+
+
+def test_dog_clone_follows_the_terrain(pygame_test):
+    dog = build_dog(ground=90, terrain=[3] * 20 + [0] * 300 + [1] * 20)
+    dog.x = dog.world_width - dog.rect.width / 2
+    dog.prev_x = dog.x
+
+    dog.interpolate(alpha=1.0)
+
+    assert dog.clone.visible
+    assert dog.rect.bottom == dog.clone.rect.bottom == 87
+
+
+def test_dog_blits_keep_the_subpixel_position_when_scaled(pygame_test):
+    dog = build_dog(scale=(4.0, 4.0))
+    dog.prev_x, dog.x = 10.0, 11.0
+
+    positions = []
+    for alpha in (0.0, 0.25, 0.5, 0.75):
+        dog.interpolate(alpha=alpha)
+        ((_, rect), *_) = dog.get_blits()
+        positions.append(rect.x)
+
+    assert positions == [40, 41, 42, 43]
 
 
 def test_dog_brain_info_are_accessible_from_dog(pygame_test):
@@ -112,3 +184,20 @@ def test_dog_brain_info_are_accessible_from_dog(pygame_test):
     assert isinstance(dog.current_state, StateID)
     assert isinstance(dog.speed, int)
     assert isinstance(dog.direction, Direction)
+
+
+def test_dog_next_change_is_now_when_moving(pygame_test):
+    dog = build_dog()
+    dog.brain.change_state(StateID.RUN, now=0.0)
+
+    assert dog.get_next_change_time(now=1.0) == 1.0
+
+
+def test_dog_next_change_is_the_next_frame_or_state_when_still(pygame_test):
+    dog = build_dog()
+    dog.brain.change_state(StateID.SLEEP, now=0.0)
+    dog.brain.current_state.countdown = 10
+
+    # SLEEP animation rate is 0.2s.
+    assert dog.get_next_change_time(now=1.05) == pytest.approx(1.2)
+    assert dog.get_next_change_time(now=9.9) == 10.0
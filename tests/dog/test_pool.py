@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import numpy as np
+
+from doggo.config import DOG_STATES
+from doggo.dog import StateID
+from doggo.dog.brain import Direction
+from doggo.dog.pool import BrainPool
+
+
+def test_brain_pool_initializes_correctly():
+    pool = BrainPool.from_config(
+        state_configs=DOG_STATES, size=100, now=10.0, rng=np.random.default_rng(42)
+    )
+    time_ranges = {config["id"]: config["time_range"] for config in DOG_STATES}
+
+    assert len(pool) == 100
+    assert str(pool) == "BrainPool(100)"
+    assert np.all(pool.started_at == 10.0)
+    assert np.all(pool.deadlines == 10.0 + pool.countdowns)
+    for state_id, countdown in zip(pool.state_ids, pool.countdowns, strict=True):
+        min_countdown, max_countdown = time_ranges[StateID(state_id)]
+        assert min_countdown <= countdown <= max_countdown
+    assert set(pool.directions.tolist()) <= set(Direction)
+
+
+def test_brain_pool_updates_only_expired_brains():
+    pool = BrainPool.from_config(
+        state_configs=DOG_STATES,
+        size=1000,
+        default_state_id=StateID.RUN,
+        rng=np.random.default_rng(42),
+    )
+    previous_deadlines = pool.deadlines.copy()
+
+    changed = pool.update(now=5.0)
+
+    expired = previous_deadlines <= 5.0
+    assert np.array_equal(changed, np.flatnonzero(expired))
+    assert np.all(pool.started_at[expired] == 5.0)
+    assert np.all(pool.deadlines[~expired] == previous_deadlines[~expired])
+    assert np.all(pool.state_ids[~expired] == StateID.RUN)
+    # RUN can only lead to these states.
+    assert set(pool.state_ids[expired].tolist()) <= {
+        StateID.IDLE,
+        StateID.IDLE_AND_BARK,
+        StateID.WALK,
+        StateID.WALK_AND_BARK,
+        StateID.RUN,
+        StateID.RUN_AND_BARK,
+    }
+
+
+def test_brain_pool_step_returns_the_left_states_and_stays():
+    pool = BrainPool.from_config(
+        state_configs=DOG_STATES, size=1000, rng=np.random.default_rng(42)
+    )
+    previous_state_ids = pool.state_ids.copy()
+
+    expired, left_state_ids, stay_times = pool.step(now=5.0)
+
+    assert np.array_equal(left_state_ids, previous_state_ids[expired])
+    assert np.all(stay_times == 5.0)
+
+
+def test_brain_pool_states_attributes_follow_state_ids():
+    pool = BrainPool.from_config(
+        state_configs=DOG_STATES, size=1000, rng=np.random.default_rng(42)
+    )
+    pool.update(now=100.0)
+    states = {config["id"]: config for config in DOG_STATES}
+
+    for index in range(len(pool)):
+        config = states[StateID(pool.state_ids[index])]
+        assert pool.speeds[index] == config.get("speed", 50)
+        assert pool.animation_time_rates[index] == config.get(
+            "animation_time_rate", 0.1
+        )
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import math
+import random
+
+from doggo.clock import VirtualClock
+from doggo.config import DOG_STATES
+from doggo.dog import StateID
+from doggo.dog.brain import Brain
+from doggo.dog.scheduler import Scheduler
+
+
+def build_brain(countdown: int) -> Brain:
+    brain = Brain.from_config(
+        state_configs=DOG_STATES,
+        default_state_id=StateID.SLEEP,
+        rng=random.Random(42),
+        clock=VirtualClock(),
+    )
+    brain.current_state.countdown = countdown
+
+    return brain
+
+
+def test_scheduler_wakes_up_only_the_expired_brains():
+    brains = [build_brain(countdown) for countdown in (5, 1, 3)]
+    scheduler = Scheduler()
+    for brain in brains:
+        scheduler.add(brain)
+
+    expired = scheduler.update(now=3.0)
+
+    assert expired == [brains[1], brains[2]]
+    assert brains[0].current_state.started_at == 0.0
+    assert brains[1].current_state.started_at == 3.0
+    assert brains[2].current_state.started_at == 3.0
+
+
+def test_scheduler_next_deadline_follows_the_state_changes():
+    brain = build_brain(countdown=5)
+    scheduler = Scheduler()
+
+    assert scheduler.next_deadline == math.inf
+
+    scheduler.add(brain)
+    assert scheduler.next_deadline == 5
+
+    brain.change_state(StateID.WALK, now=1.0)  # The brain reschedules itself.
+    assert len(scheduler) == 1
+    assert scheduler.next_deadline == brain.deadline
+
+
+def test_scheduler_changes_a_brain_once_per_update():
+    brain = build_brain(countdown=1)
+    scheduler = Scheduler()
+    scheduler.add(brain)
+    scheduler.schedule(brain)  # The first entry is now outdated.
+
+    expired = scheduler.update(now=1.0)
+
+    assert expired == [brain]
+
+
+def test_scheduler_postpones_the_extended_states():
+    brain = build_brain(countdown=1)
+    scheduler = Scheduler()
+    scheduler.add(brain)
+    brain.current_state.countdown = 10
+
+    expired = scheduler.update(now=2.0)
+
+    assert expired == []
+    assert scheduler.next_deadline == 10
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+import shutil
+
+import pygame as pg
+
+from doggo import ASSETS_PATH
+from doggo import config
+from doggo.atlas import SpriteAtlas
+from doggo.atlas import dog_frame_key
+from doggo.atlas import hash_assets
+from doggo.atlas import landscape_layer_key
+from doggo.atlas import load_atlas
+from doggo.dog.body import FrameStore
+from doggo.dog.body import Fur
+from doggo.landscape import Biome
+from doggo.landscape import Landscape
+from doggo.prepare import iter_asset_frames
+
+
+def test_sprite_atlas_returns_the_frames_it_was_built_with(pygame_test, tmp_path):
+    frame = pg.Surface((4, 3), pg.SRCALPHA)
+    frame.fill((10, 20, 30, 128))
+    frame.set_at((1, 2), (200, 100, 50, 255))
+    path = tmp_path.joinpath("atlas.bin")
+
+    SpriteAtlas.build(path=path, frames=[("frame", frame)])
+    atlas = SpriteAtlas(path=path)
+
+    assert "frame" in atlas
+    assert len(atlas) == 1
+    assert atlas.get("missing") is None
+    loaded_frame = atlas.get("frame")
+    assert loaded_frame.get_size() == (4, 3)
+    assert pg.image.tobytes(loaded_frame, "RGBA") == pg.image.tobytes(frame, "RGBA")
+    # Stored in the display format, the frame is blitted without a conversion.
+    assert loaded_frame.get_masks() == frame.convert_alpha().get_masks()
+
+
+def test_load_atlas_builds_it_only_once(pygame_test, tmp_path):
+    builds = []
+
+    def build_frames():
+        builds.append(True)
+        return [("frame", pg.Surface((2, 2), pg.SRCALPHA))]
+
+    first_atlas = load_atlas(cache_path=tmp_path, build_frames=build_frames)
+    second_atlas = load_atlas(cache_path=tmp_path, build_frames=build_frames)
+
+    assert len(builds) == 1
+    assert first_atlas.path == second_atlas.path
+
+
+def test_load_atlas_is_rebuilt_when_the_assets_change(pygame_test, tmp_path):
+    assets_path = tmp_path.joinpath("assets")
+    cache_path = tmp_path.joinpath("cache")
+    shutil.copytree(ASSETS_PATH.joinpath("dogs"), assets_path.joinpath("dogs"))
+
+    def build_frames():
+        return [("frame", pg.Surface((2, 2), pg.SRCALPHA))]
+
+    old_atlas = load_atlas(cache_path, build_frames, assets_path=assets_path)
+    assets_path.joinpath("dogs/00.png").write_bytes(b"new pixels")
+    new_atlas = load_atlas(cache_path, build_frames, assets_path=assets_path)
+
+    assert new_atlas.path != old_atlas.path
+    assert list(cache_path.glob("atlas-*.bin")) == [new_atlas.path]
+
+
+def test_hash_assets_changes_with_the_modification_time(tmp_path):
+    asset_path = tmp_path.joinpath("00.png")
+    asset_path.write_bytes(b"pixels")
+    old_hash = hash_assets(tmp_path)
+
+    os.utime(asset_path, ns=(0, 0))
+
+    assert hash_assets(tmp_path) != old_hash
+
+
+def test_atlas_frames_match_the_sliced_assets(pygame_test, tmp_path):
+    atlas = load_atlas(cache_path=tmp_path, build_frames=iter_asset_frames)
+    frame_store = FrameStore(sprite_size=config.SPRITE_SIZE)
+
+    for loc, flip_x in (((0, 0), False), ((3, 5), True)):
+        key = dog_frame_key(Fur.GREY, loc[1], loc[0], flip_x)
+        frame = frame_store.get_frame(fur=Fur.GREY, loc=loc, flip_x=flip_x)
+
+        assert pg.image.tobytes(atlas.get(key), "RGBA") == pg.image.tobytes(
+            frame, "RGBA"
+        )
+    assert landscape_layer_key(Biome.MOUNTAIN, 1) in atlas
+
+
+def test_frame_store_and_landscape_use_the_atlas(pygame_test, tmp_path, mocker):
+    atlas = load_atlas(cache_path=tmp_path, build_frames=iter_asset_frames)
+    sprite_sheet_mock = mocker.patch("doggo.dog.body.SpriteSheet")
+    landscape_sheet_mock = mocker.patch("doggo.landscape.SpriteSheet")
+
+    frame_store = FrameStore(sprite_size=config.SPRITE_SIZE, atlas=atlas)
+    frame = frame_store.get_frame(fur=Fur.GREY, loc=(1, 2), scale=(2.0, 2.0))
+    landscape = Landscape(biome=Biome.MOUNTAIN, atlas=atlas)
+
+    assert frame.get_size() == (128, 96)
+    assert landscape.foreground.image.get_size() == (340, 106)
+    sprite_sheet_mock.assert_not_called()
+    landscape_sheet_mock.assert_not_called()
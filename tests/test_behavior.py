@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from doggo import config
+from doggo.behavior import BehaviorProfile
+from doggo.behavior import ProfileWatcher
+from doggo.behavior import dump_profile
+from doggo.behavior import read_profile
+from doggo.clock import VirtualClock
+from doggo.dog import StateID
+
+
+DEFAULT_PROFILE = BehaviorProfile(
+    state_configs=config.DOG_STATES,
+    sprite_conf_per_state=config.SPRITE_CONF_PER_STATE,
+)
+
+
+def load(path):
+    return read_profile(
+        path,
+        default_sprite_conf=config.SPRITE_CONF_PER_STATE,
+        sprite_size=config.SPRITE_SIZE,
+    )
+
+
+def write_profile(path, update=None):
+    data = dump_profile(DEFAULT_PROFILE)
+    if update:
+        update(data["states"])
+    path.write_text(json.dumps(data))
+
+    return path
+
+
+def test_read_profile_compiles_the_tables(tmp_path):
+    profile = load(write_profile(tmp_path.joinpath("dog.json")))
+
+    assert profile.state_configs == DEFAULT_PROFILE.state_configs
+    assert profile.sprite_conf_per_state == config.SPRITE_CONF_PER_STATE
+    assert (profile.transitions.matrix == DEFAULT_PROFILE.transitions.matrix).all()
+
+
+def test_read_profile_from_toml(tmp_path):
+    lines = []
+    for state_id in StateID:
+        lines += [
+            f"[states.{state_id.name}]",
+            "time_range = [1, 3]",
+            "sprite = [4, 8]",
+            f"[states.{state_id.name}.transitions]",
+            "SLEEP = 0.5",
+            "IDLE = 0.5",
+        ]
+    path = tmp_path.joinpath("dog.toml")
+    path.write_text("\n".join(lines))
+
+    profile = load(path)
+
+    assert profile.state_configs[StateID.WALK]["time_range"] == (1, 3)
+    assert profile.state_configs[StateID.WALK]["transitions"][StateID.SLEEP] == 0.5
+    assert profile.state_configs[StateID.WALK]["transitions"][StateID.RUN] == 0.0
+    assert profile.sprite_conf_per_state[StateID.WALK] == (4, 8)
+
+
+def test_read_profile_reports_all_the_errors(tmp_path):
+    def update(states):
+        del states["SLEEP"]
+        states["FLY"] = states["RUN"]
+        states["IDLE"]["transitions"]["IDLE"] = 0.5
+        states["WALK"]["time_range"] = [5, 2]
+        states["RUN"]["sprite"] = [20, 0]
+
+    with pytest.raises(ValueError) as error:
+        load(write_profile(tmp_path.joinpath("dog.json"), update=update))
+
+    message = str(error.value)
+    assert "unknown state FLY" in message
+    assert "missing state SLEEP" in message
+    assert "IDLE: transition probabilities must sum to 1" in message
+    assert "WALK: time_range must be two positive ordered integers" in message
+    assert "RUN: sprite must be [frames, row] within the sprite sheet" in message
+
+
+def test_profile_watcher_reloads_a_changed_profile(tmp_path):
+    path = write_profile(tmp_path.joinpath("dog.json"))
+    clock = VirtualClock()
+    watcher = ProfileWatcher(path=path, load=load, interval=1.0, clock=clock)
+
+    assert watcher.poll() is None
+
+    write_profile(path, update=lambda states: states["SLEEP"].update(speed=1))
+    mtime = path.stat().st_mtime_ns
+    watcher._mtime = mtime - 1  # The file system time may be too coarse.
+
+    assert watcher.poll() is None  # Not checked before the interval.
+
+    clock.advance(1.0)
+    profile = watcher.poll()
+
+    assert profile.state_configs[StateID.SLEEP]["speed"] == 1
+    clock.advance(1.0)
+    assert watcher.poll() is None
+
+
+def test_profile_watcher_keeps_the_profile_when_the_change_is_invalid(tmp_path):
+    path = write_profile(tmp_path.joinpath("dog.json"))
+    clock = VirtualClock()
+    watcher = ProfileWatcher(path=path, load=load, interval=1.0, clock=clock)
+
+    path.write_text("{")
+    watcher._mtime = None
+    clock.advance(1.0)
+
+    assert watcher.poll() is None
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from doggo.clock import MonotonicClock
+from doggo.clock import ScaledClock
+from doggo.clock import VirtualClock
+
+
+def test_monotonic_clock_goes_forward():
+    clock = MonotonicClock()
+
+    first = clock.now()
+    time.sleep(0.01)
+
+    assert clock.now() > first
+
+
+def test_virtual_clock_only_moves_when_advanced():
+    clock = VirtualClock(start=10.0)
+
+    assert clock.now() == 10.0
+    assert clock.now() == 10.0
+
+    clock.advance(2.5)
+
+    assert clock.now() == 12.5
+
+
+def test_virtual_clock_cannot_go_back_in_time():
+    clock = VirtualClock()
+
+    with pytest.raises(AssertionError, match="can't go back in time"):
+        clock.advance(-1.0)
+
+
+def test_scaled_clock_speeds_up_its_source():
+    source = VirtualClock(start=100.0)
+    clock = ScaledClock(scale=100, source=source)
+
+    assert clock.now() == 100.0
+
+    source.advance(0.5)
+
+    assert clock.now() == 150.0
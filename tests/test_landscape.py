@@ -3,6 +3,7 @@ from __future__ import annotations
 import pygame as pg
 
 from doggo.landscape import Biome
+from doggo.landscape import Landscape
 from doggo.landscape import LandscapeLayer
 
 
@@ -23,3 +24,70 @@ def test_landscape_layer_draw_on_screen(pg_screen_mock):
     pg_screen_mock.blit.assert_called_once_with(
         landscape_layer.image, landscape_layer.rect
     )
+
+
+def test_landscape_layers_are_scaled_to_the_given_size(pygame_test):
+    landscape = Landscape(biome=Biome.MOUNTAIN, size=(1280, 400))
+
+    assert landscape.background.image.get_size() == (1280, 400)
+    assert landscape.foreground.image.get_size() == (1280, 400)
+
+
+def test_landscape_background_is_baked_with_the_sky(pygame_test):
+    landscape = Landscape(biome=Biome.MOUNTAIN)
+    background = landscape.background.image
+
+    assert not background.get_flags() & pg.SRCALPHA
+    assert background.get_at((0, 0))[:3] == Landscape.sky_color
+
+
+def test_landscape_foreground_is_rle_accelerated(pygame_test):
+    landscape = Landscape(biome=Biome.MOUNTAIN)
+
+    assert landscape.foreground.image.get_flags() & pg.RLEACCELOK
+
+
+def test_landscape_layers_are_rebuilt_only_when_needed(pygame_test):
+    landscape = Landscape(biome=Biome.MOUNTAIN)
+    background = landscape.background
+
+    landscape.load(biome=Biome.MOUNTAIN)
+
+    assert landscape.background is background
+
+    landscape.load(biome=Biome.MOUNTAIN, size=(1280, 400))
+
+    assert landscape.background is not background
+    assert landscape.size == (1280, 400)
+
+
+def test_landscape_heightmap_is_the_ground_reaching_the_bottom(pygame_test):
+    layer = pg.Surface((3, 10), pg.SRCALPHA)
+    layer.fill((0, 0, 0, 255), pg.Rect(0, 6, 3, 4))
+    layer.fill((0, 0, 0, 255), pg.Rect(1, 1, 1, 2))  # Floating above the ground.
+
+    assert Landscape.build_heightmap(layer, radius=0) == (6, 6, 6)
+
+
+def test_landscape_heightmap_smooths_out_the_grass(pygame_test):
+    layer = pg.Surface((5, 10), pg.SRCALPHA)
+    layer.fill((0, 0, 0, 255), pg.Rect(0, 6, 5, 4))
+    layer.fill((0, 0, 0, 255), pg.Rect(2, 3, 1, 3))  # A grass blade.
+
+    assert Landscape.build_heightmap(layer, radius=1) == (6, 6, 6, 6, 6)
+
+
+def test_landscape_heightmap_of_the_biomes_is_smooth(pygame_test):
+    for biome in Biome:
+        heightmap = Landscape(biome=biome).heightmap
+
+        steps = [abs(top - heightmap[x - 1]) for x, top in enumerate(heightmap)]
+        assert max(steps) <= 1
+
+
+def test_landscape_heightmap_is_measured_before_scaling(pygame_test):
+    landscape = Landscape(biome=Biome.MOUNTAIN, size=(1280, 400))
+    foreground_height = Landscape(biome=Biome.MOUNTAIN).foreground.image.get_height()
+
+    assert len(landscape.heightmap) == 340
+    assert all(0 <= top <= foreground_height for top in landscape.heightmap)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import io
+import sys
+import threading
+
+from doggo.log import QueueSink
+from doggo.log import setup_logging
+from loguru import logger
+
+
+def test_queue_sink_writes_the_messages_from_its_thread():
+    stream = io.StringIO()
+    handler_id = logger.add(QueueSink(stream=stream), format="{message}")
+
+    logger.bind(dog_id=1).info("Dog's brain decided to {state}.", state="SIT")
+    logger.remove(handler_id)  # Stops the sink, after it wrote everything.
+
+    line = stream.getvalue()
+    assert " | INFO     | " in line
+    assert "Dog's brain decided to SIT. | dog_id=1 state=SIT\n" in line
+
+
+def test_queue_sink_drops_the_messages_when_full(mocker):
+    mocker.patch("doggo.log.threading.Thread")  # No thread to drain the queue.
+    sink = QueueSink(stream=io.StringIO(), max_size=2)
+
+    for _ in range(5):
+        sink.write(mocker.Mock())
+
+    assert sink.dropped == 3
+
+
+def test_queue_sink_counts_the_drops_of_all_the_threads(mocker):
+    thread_class = threading.Thread
+    mocker.patch("doggo.log.threading.Thread")  # No thread to drain the queue.
+    sink = QueueSink(stream=io.StringIO(), max_size=2)
+    message = mocker.Mock()
+
+    def write():
+        for _ in range(1000):
+            sink.write(message)
+
+    threads = [thread_class(target=write) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sink.dropped == 4 * 1000 - 2
+
+
+class Report:
+    formatted = 0
+
+    def __format__(self, format_spec):
+        Report.formatted += 1
+        return "report"
+
+
+def test_setup_logging_skips_the_filtered_messages(mocker):
+    mocker.patch("doggo.log.atexit.register")
+    stream = io.StringIO()
+    sink = setup_logging(level="INFO", stream=stream)
+    report = Report()
+
+    logger.debug("Not formatted: {}", report)
+    logger.info("Formatted")
+    logger.remove()
+    logger.add(sys.stderr)  # Put back the default sink.
+
+    assert sink.dropped == 0
+    assert Report.formatted == 0
+    assert "Not formatted" not in stream.getvalue()
+    assert "Formatted" in stream.getvalue()
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import random
+
+from doggo import config
 from doggo.dog.body import Body
 from doggo.dog.brain import Brain
 from doggo.dog.brain import State
@@ -7,6 +10,7 @@ from doggo.dog.dog import Dog
 from doggo.landscape import Landscape
 from doggo.landscape import LandscapeLayer
 from doggo.prepare import build_dog
+from doggo.prepare import build_dogs
 from doggo.prepare import build_landscape
 
 
@@ -19,9 +23,55 @@ def test_build_dog(pygame_test):
     assert isinstance(dog.body, Body)
 
 
+def test_build_dogs_ordered_by_depth_with_different_furs(pygame_test):
+    dogs = build_dogs(count=5)
+
+    assert len(dogs) == 5
+    assert len({dog.body.fur for dog in dogs}) == 5
+    assert sorted({dog.brain.dog_id for dog in dogs}) == [0, 1, 2, 3, 4]
+    grounds = [dog.rect.bottom for dog in dogs]
+    assert grounds == sorted(grounds)
+    assert all(
+        config.WORLD_GROUND - config.DOG_GROUND_DEPTH <= ground <= config.WORLD_GROUND
+        for ground in grounds
+    )
+
+
+def test_build_dogs_follow_the_heightmap(pygame_test):
+    heightmap = [config.WORLD_GROUND - 4] * config.WORLD_WIDTH
+    dogs = build_dogs(count=3, heightmap=heightmap)
+
+    for dog in dogs:
+        assert dog.rect.bottom == dog.world_ground - 4
+
+
 def test_build_landscape(pygame_test):
     landscape = build_landscape()
 
     assert isinstance(landscape, Landscape)
     assert isinstance(landscape.background, LandscapeLayer)
     assert isinstance(landscape.foreground, LandscapeLayer)
+
+
+def test_build_dogs_is_reproducible_with_a_seeded_rng(pygame_test):
+    def snapshot(dogs):
+        for dog in dogs:
+            dog.brain.transition(now=10.0)
+
+        return [
+            (
+                dog.brain.dog_id,
+                dog.body.fur,
+                dog.x,
+                dog.rect.bottom,
+                dog.current_state,
+                dog.brain.current_state.countdown,
+                dog.direction,
+            )
+            for dog in dogs
+        ]
+
+    first = snapshot(build_dogs(count=3, rng=random.Random(42)))
+    second = snapshot(build_dogs(count=3, rng=random.Random(42)))
+
+    assert first == second
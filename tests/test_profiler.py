@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import numpy as np
+
+from doggo.profiler import FrameProfiler
+from doggo.profiler import Phase
+
+
+def record_frame(profiler, mocker, timings):
+    mocker.patch(
+        "doggo.profiler.time.perf_counter",
+        side_effect=np.cumsum([0.0, *timings]).tolist(),
+    )
+    profiler.start_frame()
+    for phase in Phase:
+        profiler.lap(phase)
+    profiler.end_frame()
+
+
+def test_frame_profiler_records_the_phases_of_the_frames(mocker):
+    profiler = FrameProfiler(budget=0.1)
+
+    record_frame(profiler, mocker, [0.001, 0.002, 0.003, 0.004, 0.05])
+
+    assert profiler.frames == 1
+    assert profiler.dropped_frames == 0
+    assert np.allclose(profiler.timings[0], [0.001, 0.002, 0.003, 0.004, 0.05])
+
+
+def test_frame_profiler_counts_the_frames_over_budget_but_the_wait(mocker):
+    profiler = FrameProfiler(budget=0.01)
+
+    record_frame(profiler, mocker, [0.0, 0.0, 0.0, 0.005, 1.0])
+    record_frame(profiler, mocker, [0.0, 0.0, 0.005, 0.01, 0.0])
+
+    assert profiler.dropped_frames == 1
+
+
+def test_frame_profiler_keeps_only_the_last_frames(mocker):
+    profiler = FrameProfiler(budget=1.0, size=2)
+    log_info = mocker.patch("doggo.profiler.logger.info")
+
+    for update_time in (0.1, 0.2, 0.3):
+        record_frame(profiler, mocker, [0.0, 0.0, update_time, 0.0, 0.0])
+
+    assert profiler.frames == 3
+    assert np.allclose(profiler.timings[:, Phase.UPDATE], [0.3, 0.2])
+    log_info.assert_called_once()
+
+
+def test_frame_profiler_percentiles_in_milliseconds(mocker):
+    profiler = FrameProfiler(budget=1.0)
+    for render_time in (0.001, 0.002, 0.003):
+        record_frame(profiler, mocker, [0.0, 0.0, 0.0, render_time, 0.0])
+
+    p50, p100 = profiler.percentiles([50, 100])
+
+    assert np.isclose(p50[Phase.RENDER], 2.0)
+    assert np.isclose(p100[Phase.RENDER], 3.0)
+    assert np.isclose(p100[-1], 3.0)  # The whole frame.
+
+
+def test_frame_profiler_report():
+    profiler = FrameProfiler(budget=1 / 60)
+
+    report = profiler.report()
+
+    assert report.startswith("0 frames, 0 dropped (budget 16.67ms).")
+    for name in ("get_dt", "process_inputs", "update", "render", "wait", "frame"):
+        assert name in report
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import pytest
+
+from doggo import config
+from doggo.dog import StateID
+from doggo.dog.brain import Brain
+from doggo.dog.brain import Direction
+from doggo.recorder import HEADER
+from doggo.recorder import RECORD
+from doggo.recorder import Transition
+from doggo.recorder import TransitionPlayer
+from doggo.recorder import TransitionRecorder
+from doggo.recorder import read_transitions
+from doggo.recorder import replay
+
+
+def record_brain(path, transitions=5):
+    brain = Brain.from_config(state_configs=config.DOG_STATES, dog_id=3)
+    recorder = TransitionRecorder(path=path)
+    recorder.add(brain)
+    for step in range(transitions):
+        brain.transition(now=float(step))
+    recorder.close()
+
+    return recorder
+
+
+def test_recorder_writes_each_transition_as_a_fixed_size_record(tmp_path):
+    path = tmp_path.joinpath("run.rec")
+    brain = Brain.from_config(state_configs=config.DOG_STATES, dog_id=3)
+    recorder = TransitionRecorder(path=path)
+    recorder.add(brain)
+    brain.change_state(StateID.WALK, now=12.5, countdown=7, direction=Direction.LEFT)
+    recorder.close()
+
+    transitions = list(read_transitions(path))
+
+    assert recorder.count == 2
+    assert path.stat().st_size == HEADER.size + 2 * RECORD.size
+    assert transitions[-1] == Transition(12.5, 3, StateID.WALK, 7, Direction.LEFT)
+
+
+def test_read_transitions_skips_a_truncated_record(tmp_path):
+    path = tmp_path.joinpath("run.rec")
+    record_brain(path, transitions=2)
+    path.write_bytes(path.read_bytes()[:-1])
+
+    assert len(list(read_transitions(path))) == 2
+
+
+def test_read_transitions_rejects_other_files(tmp_path):
+    path = tmp_path.joinpath("run.rec")
+    path.write_bytes(b"not a log at all")
+
+    with pytest.raises(ValueError, match="Not a transition log"):
+        list(read_transitions(path))
+
+
+def test_player_feeds_the_recorded_transitions_to_the_brain(tmp_path):
+    path = tmp_path.joinpath("run.rec")
+    record_brain(path)
+    transitions = list(read_transitions(path))
+    brain = Brain.from_config(state_configs=config.DOG_STATES, dog_id=3)
+    player = TransitionPlayer(transitions)
+
+    player.add(brain)
+    played = [brain.current_state.id]
+    for step in range(5):
+        brain.transition(now=float(step))
+        played.append(brain.current_state.id)
+        assert brain.current_state.countdown == transitions[step + 1].countdown
+        assert brain.current_state.direction == transitions[step + 1].direction
+
+    assert played == [transition.state for transition in transitions]
+    assert len(player) == 0
+
+
+def test_replay_feeds_the_transitions_through_brains_at_their_times(tmp_path):
+    path = tmp_path.joinpath("run.rec")
+    record_brain(path)
+    transitions = list(read_transitions(path))
+
+    brains = replay(transitions=transitions, state_configs=config.DOG_STATES)
+
+    assert list(brains) == [3]
+    state = brains[3].current_state
+    last = transitions[-1]
+    assert (state.id, state.started_at, state.countdown) == (
+        last.state,
+        last.time,
+        last.countdown,
+    )
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from doggo.__main__ import build_parser
+from doggo.__main__ import run
+from doggo.config import DOG_STATES
+from doggo.dog import StateID
+from doggo.simulation import BATCH_MIN_DOGS
+from doggo.simulation import SimulationReport
+from doggo.simulation import simulate
+
+
+@pytest.mark.parametrize("dogs", [10, BATCH_MIN_DOGS])
+def test_simulate_returns_a_consistent_report(dogs):
+    report = simulate(state_configs=DOG_STATES, dogs=dogs, duration=3600.0, seed=42)
+
+    assert isinstance(report, SimulationReport)
+    assert np.isclose(report.occupancy.sum(), dogs * 3600.0)
+    assert np.isclose(report.occupancy_share.sum(), 1.0)
+    assert report.transitions == report.stays.sum()
+    assert np.array_equal(report.transition_counts.sum(axis=1), report.stays)
+
+
+def test_simulate_never_takes_impossible_transitions():
+    report = simulate(state_configs=DOG_STATES, dogs=100, duration=3600.0, seed=42)
+    matrix = np.array(
+        [
+            [config["transitions"][state_id] for state_id in StateID]
+            for config in DOG_STATES
+        ]
+    )
+
+    assert np.all(report.transition_counts[matrix == 0.0] == 0)
+
+
+def test_simulate_dwell_times_are_within_time_ranges():
+    report = simulate(state_configs=DOG_STATES, dogs=100, duration=3600.0, seed=42)
+
+    for config in DOG_STATES:
+        low, high = config["time_range"]
+        assert low <= report.mean_dwell_times[config["id"]] <= high
+
+
+def test_simulate_steps_the_small_and_large_pools_alike():
+    one_by_one = simulate(
+        state_configs=DOG_STATES, dogs=BATCH_MIN_DOGS - 1, duration=3600.0, seed=42
+    )
+    batched = simulate(
+        state_configs=DOG_STATES, dogs=BATCH_MIN_DOGS, duration=3600.0, seed=42
+    )
+
+    assert np.allclose(one_by_one.occupancy_share, batched.occupancy_share, atol=0.01)
+    assert np.allclose(one_by_one.mean_dwell_times, batched.mean_dwell_times, rtol=0.05)
+
+
+def test_simulate_is_reproducible_with_a_seed():
+    first = simulate(state_configs=DOG_STATES, dogs=10, duration=3600.0, seed=42)
+    second = simulate(state_configs=DOG_STATES, dogs=10, duration=3600.0, seed=42)
+
+    assert np.array_equal(first.transition_counts, second.transition_counts)
+    assert str(first) == str(second)
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["simulate", "--dogs", "0"],
+        ["simulate", "--days", "0"],
+        ["sweep", "--grid", "idle:sleep=0.5", "--dogs", "0"],
+        ["sweep", "--grid", "idle:sleep=0.5", "--replicates", "0"],
+        ["sweep", "--grid", "idle:sleep=0.5", "--days", "-1"],
+    ],
+)
+def test_simulation_commands_reject_empty_runs(args):
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(args)
+
+
+def test_simulation_commands_dont_log_the_settings(mocker, capsys):
+    mocker.patch("sys.argv", ["doggo", "analyze"])
+    mocker.patch("doggo.__main__.setup_logging")
+    log_settings = mocker.patch("doggo.config.log_settings")
+
+    run()
+
+    log_settings.assert_not_called()
+    assert "stationary" in capsys.readouterr().out
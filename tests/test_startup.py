@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import builtins
+import os
+import subprocess  # nosec
+import sys
+
+from doggo import startup
+from doggo.startup import StartupTimer
+
+
+def test_startup_timer_times_only_the_new_imports_of_doggo(mocker):
+    mocker.patch.dict(sys.modules)
+    sys.modules.pop("colorsys", None)
+    timer = StartupTimer()
+
+    timer.install()
+    try:
+        timer._timed_import("colorsys", {"__name__": "doggo.test"})
+        timer._timed_import("colorsys", {"__name__": "doggo.test"})  # Already loaded.
+        timer._timed_import("json", {"__name__": "other"})
+    finally:
+        timer.uninstall()
+
+    assert [entry[:3] for entry in timer.imports] == [(0, "doggo.test", "colorsys")]
+    assert builtins.__import__ is timer._import
+
+
+def test_startup_timer_report():
+    timer = StartupTimer()
+    timer.imports = [(0, "doggo", "doggo.config", 0.1), (1, "doggo.config", "x", 0.05)]
+    timer.marks = [("imports", 0.2), ("first frame", 0.25)]
+
+    report = timer.report()
+
+    assert "    100.0  doggo.config (doggo)" in report
+    assert "     50.0    x (doggo.config)" in report
+    assert "    250.0  first frame (+50.0)" in report
+
+
+def test_startup_functions_do_nothing_when_not_timed(mocker):
+    mocker.patch.object(startup, "_timer", None)
+    log_info = mocker.patch("loguru.logger.info")
+
+    startup.mark("step")
+    startup.done("first frame")
+
+    log_info.assert_not_called()
+
+
+def test_startup_done_logs_the_timings_once(mocker):
+    mocker.patch.object(startup, "_timer", None)
+    log_info = mocker.patch("loguru.logger.info")
+    startup.start()
+
+    startup.mark("step")
+    startup.done("first frame")
+    startup.done("first frame")
+
+    log_info.assert_called_once()
+    assert startup._timer is None
+    assert builtins.__import__.__module__ == "builtins"
+
+
+def test_startup_does_not_load_the_headless_commands():
+    code = (
+        "import sys, doggo.__main__; "
+        "print([m for m in ('doggo.sweep', 'doggo.simulation') if m in sys.modules])"
+    )
+    result = subprocess.run(  # nosec
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={
+            **os.environ,
+            "SDL_VIDEODRIVER": "dummy",
+            "PYGAME_HIDE_SUPPORT_PROMPT": "1",
+            "PYTHONPATH": os.pathsep.join(sys.path),
+        },
+    )
+
+    assert result.stdout.strip().splitlines()[-1] == "[]"
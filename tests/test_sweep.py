@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from doggo import simulation as simulate_module
+from doggo.config import DOG_STATES
+from doggo.dog import StateID
+from doggo.sweep import ColumnWriter
+from doggo.sweep import Sweep
+from doggo.sweep import apply_variant
+from doggo.sweep import parse_grid_axis
+from doggo.sweep import read_columns
+from doggo.sweep import run_sweep
+
+
+def test_apply_variant_rescales_the_other_transitions():
+    configs = apply_variant(DOG_STATES, {(StateID.IDLE, StateID.SLEEP): 0.5})
+    transitions = configs[StateID.IDLE]["transitions"]
+
+    assert transitions[StateID.SLEEP] == 0.5
+    assert math.isclose(sum(transitions.values()), 1.0)
+    assert transitions[StateID.WALK] == pytest.approx(0.05)
+    # The original configuration is left untouched.
+    assert DOG_STATES[StateID.IDLE]["transitions"][StateID.SLEEP] == 0.0
+
+
+def test_parse_grid_axis():
+    assert parse_grid_axis("idle:sleep=0,0.5") == (
+        (StateID.IDLE, StateID.SLEEP),
+        [0.0, 0.5],
+    )
+    with pytest.raises(ValueError, match="Unknown state"):
+        parse_grid_axis("idle:fly=0.1")
+    with pytest.raises(ValueError, match="within"):
+        parse_grid_axis("idle:sleep=0.5,2")
+
+
+def test_apply_variant_rejects_rows_which_cant_sum_to_one():
+    with pytest.raises(ValueError, match="can't sum to 1"):
+        apply_variant(
+            DOG_STATES,
+            {(StateID.IDLE, StateID.SLEEP): 0.8, (StateID.IDLE, StateID.WALK): 0.5},
+        )
+
+
+def test_sweep_checks_its_variants_before_running(tmp_path):
+    with pytest.raises(ValueError, match="can't sum to 1"):
+        Sweep(
+            state_configs=DOG_STATES,
+            grid={
+                (StateID.IDLE, StateID.SLEEP): [0.2, 0.8],
+                (StateID.IDLE, StateID.WALK): [0.5],
+            },
+        )
+
+
+def test_sweep_compiles_each_variant_once(mocker):
+    sweep = Sweep(
+        state_configs=DOG_STATES,
+        grid={(StateID.IDLE, StateID.SLEEP): [0.0, 0.5]},
+        replicates=3,
+        dogs=1,
+        duration=60.0,
+    )
+    simulate = mocker.patch("doggo.sweep.simulate", wraps=simulate_module.simulate)
+
+    for task in range(len(sweep)):
+        sweep.run(task)
+
+    tables = [call.kwargs["transitions"] for call in simulate.call_args_list]
+    assert len({id(table) for table in tables}) == 2
+    assert tables[0] is tables[2]
+    assert tables[3] is tables[5]
+
+
+def test_column_writer_streams_the_rows_by_column(tmp_path):
+    columns = {"index": "<i4", "value": "<f8"}
+    writer = ColumnWriter(path=tmp_path, columns=columns, batch=2)
+    for index in range(5):
+        writer.write([index, index / 2])
+    writer.close()
+
+    results = read_columns(tmp_path)
+
+    assert writer.count == 5
+    assert np.array_equal(results["index"], np.arange(5))
+    assert np.array_equal(results["value"], np.arange(5) / 2)
+
+
+def test_run_sweep_is_reproducible_whatever_the_number_of_workers(tmp_path):
+    sweep = Sweep(
+        state_configs=DOG_STATES,
+        grid={(StateID.IDLE, StateID.SLEEP): [0.0, 0.5]},
+        replicates=2,
+        dogs=10,
+        duration=600.0,
+        seed=42,
+    )
+
+    rows = run_sweep(sweep, output=tmp_path.joinpath("one"), workers=1)
+    one = read_columns(tmp_path.joinpath("one"))
+    run_sweep(sweep, output=tmp_path.joinpath("two"), workers=2)
+    two = read_columns(tmp_path.joinpath("two"))
+
+    assert rows == len(sweep) == 4
+    assert list(one) == list(sweep.columns)
+    assert np.array_equal(one["variant"], [0, 0, 1, 1])
+    assert np.array_equal(one["p.IDLE.SLEEP"], [0.0, 0.0, 0.5, 0.5])
+    assert one["share.SLEEP"][2] > one["share.SLEEP"][0]
+    for name in one:
+        assert np.array_equal(one[name], two[name], equal_nan=True)
@@ -36,10 +36,31 @@ def test_draggable_window_can_be_moved_around(pg_window_mock, pg_mouse_mock):
 
     # Move the window a first time
     draggable_window.process_event(mouse_motion_event)
+    draggable_window.update()
 
     assert draggable_window.window.position == (10, 10)
 
     # Move the window a second time
     draggable_window.process_event(mouse_motion_event)
+    draggable_window.update()
 
     assert draggable_window.window.position == (30, 30)
+
+
+def test_draggable_window_moves_once_per_update(mocker, pg_window_mock, pg_mouse_mock):
+    pg_mouse_mock.get_pos.side_effect = [(10, 10), (40, 25)]
+    position = mocker.PropertyMock(return_value=(100, 100))
+    type(pg_window_mock).position = position
+    draggable_window = DraggableWindow(window=pg_window_mock)
+    draggable_window.process_event(pg.event.Event(pg.MOUSEBUTTONDOWN))
+    position.reset_mock()
+
+    for _ in range(10):
+        draggable_window.process_event(pg.event.Event(pg.MOUSEMOTION))
+    draggable_window.update()
+    draggable_window.update()
+
+    # A single mouse read and window move, to the latest mouse position.
+    assert pg_mouse_mock.get_pos.call_count == 2
+    position.assert_any_call((130, 115))
+    assert position.call_args_list.count(mocker.call((130, 115))) == 1
@@ -6,15 +6,35 @@ import pygame as pg
 import pytest
 
 from doggo import ASSETS_PATH
+from doggo.behavior import ProfileWatcher
+from doggo.clock import VirtualClock
+from doggo.dog import StateID
+from doggo.dog.brain import Direction
+from doggo.prepare import get_behavior
+from doggo.profiler import FrameProfiler
+from doggo.recorder import TransitionPlayer
+from doggo.recorder import TransitionRecorder
+from doggo.recorder import read_transitions
 from doggo.world import World
 
 
 @pytest.fixture
-def create_world(mocker):
-    mocker.patch("doggo.world.pg.init")
+def create_world():
     world = None
 
-    def _(render_size=None):
+    def _(
+        render_size=None,
+        clock=None,
+        dirty_rects=False,
+        prescale=True,
+        profiler=None,
+        dogs=1,
+        time_step=1 / 60,
+        seed=None,
+        recorder=None,
+        player=None,
+        watcher=None,
+    ):
         nonlocal world
         world = World(
             title="Doggo Test",
@@ -22,6 +42,16 @@ def create_world(mocker):
             icon=ASSETS_PATH.joinpath("icon.png"),
             fps=30,
             render_size=render_size,
+            clock=clock,
+            dirty_rects=dirty_rects,
+            prescale=prescale,
+            profiler=profiler,
+            dogs=dogs,
+            time_step=time_step,
+            seed=seed,
+            recorder=recorder,
+            player=player,
+            watcher=watcher,
         )
 
         return world
@@ -47,9 +77,12 @@ def test_world_initializes_correctly(create_world):
     assert world.dt == 0.0
 
 
+@pytest.mark.parametrize("prescale", [True, False])
 @pytest.mark.parametrize("render_size", [(1280, 400), None])
-def test_world_screen_is_scaled_regarding_render_size(create_world, render_size):
-    world = create_world(render_size)
+def test_world_screen_is_scaled_regarding_render_size(
+    create_world, render_size, prescale
+):
+    world = create_world(render_size, prescale=prescale)
     screen = world.get_screen()
 
     if render_size:
@@ -58,6 +91,25 @@ def test_world_screen_is_scaled_regarding_render_size(create_world, render_size)
         assert screen.get_size() == (340, 106)
 
 
+def test_world_prescaled_composes_frames_at_render_size(create_world):
+    world = create_world(render_size=(1280, 400), prescale=True)
+
+    assert world.screen is world.window_surf
+    assert world.get_screen() is world.window_surf
+    assert world.scale == (1280 / 340, 400 / 106)
+    assert world.landscape.background.image.get_size() == (1280, 400)
+    assert world.landscape.foreground.image.get_size() == (1280, 400)
+    assert world.dog.body.scale == world.scale
+
+
+def test_world_not_prescaled_reuses_the_scaled_screen(create_world):
+    world = create_world(render_size=(1280, 400), prescale=False)
+
+    assert world.scale is None
+    assert world.screen.get_size() == (340, 106)
+    assert world.get_screen() is world.get_screen()
+
+
 def test_world_get_dt(create_world):
     world = create_world()
     time.sleep(0.1)
@@ -67,6 +119,18 @@ def test_world_get_dt(create_world):
     assert world.dt > 0.0
 
 
+def test_world_get_dt_reads_the_given_clock(create_world):
+    clock = VirtualClock(start=10.0)
+    world = create_world(clock=clock)
+    clock.advance(0.5)
+
+    world.get_dt()
+
+    assert world.now == 10.5
+    assert world.dt == 0.5
+    assert world.dog.brain.clock is clock
+
+
 @pytest.mark.parametrize(
     "event",
     [
@@ -85,33 +149,258 @@ def test_world_stop_at_some_events(mocker, create_world, event):
 
 
 def test_world_update(mocker, create_world):
-    world = create_world()
-    world.dt = 0.1
+    world = create_world(time_step=0.125)
+    world.dt = 0.25
+    update = mocker.patch.object(world.dog, "update", spec=True)
+    mocker.patch.object(world.dog, "interpolate", spec=True)
+
+    world.update()
+
+    assert update.call_args_list == [
+        mocker.call(dt=0.125, now=world.now + 0.125),
+        mocker.call(dt=0.125, now=world.now + 0.25),
+    ]
+    world.dog.interpolate.assert_called_once_with(alpha=0.0)
+
+
+def test_world_update_keeps_the_leftover_time_for_the_next_frame(mocker, create_world):
+    world = create_world(time_step=0.125)
     mocker.patch.object(world.dog, "update", spec=True)
+    mocker.patch.object(world.dog, "interpolate", spec=True)
+
+    world.dt = 0.0625
+    world.update()
+
+    world.dog.update.assert_not_called()
+    world.dog.interpolate.assert_called_once_with(alpha=0.5)
 
+    world.dt = 0.0625
     world.update()
 
-    world.dog.update.assert_called_once_with(dt=0.1)
+    world.dog.update.assert_called_once_with(dt=0.125, now=world.now + 0.125)
+    assert world.accumulator == 0
+
+
+def test_world_update_interpolates_the_dogs_between_two_steps(create_world):
+    world = create_world(time_step=0.125)
+    dog = world.dog
+    dog.brain.change_state(StateID.WALK)
+    dog.brain.current_state.direction = Direction.RIGHT
+    dog.brain.current_state.countdown = 100
+    world.scheduler.schedule(dog.brain)
+    dog.x = 100.0
+
+    world.dt = 0.1875
+    world.update()
+
+    step = dog.speed * 0.125
+    assert dog.prev_x == 100.0
+    assert dog.x == 100.0 + step
+    assert dog.rect.x == int(100.0 + step / 2)
+
+
+def test_world_update_skips_the_time_of_a_stall(mocker, create_world):
+    world = create_world(time_step=0.25)
+    mocker.patch.object(world.dog, "update", spec=True)
+
+    world.dt = 10.0
+    world.update()
+
+    # The dog never moves by more than one step.
+    world.dog.update.assert_called_once_with(dt=0.25, now=world.now + 10.0)
 
 
 def test_world_render(mocker, create_world):
     world = create_world()
     screen = mocker.patch.object(world, "screen", spec=True)
     landscape = mocker.patch.object(world, "landscape", spec=True)
-    dog = mocker.patch.object(world, "dog", spec=True)
+    get_blits = mocker.patch.object(world, "get_blits", spec=True)
     window_surf = mocker.patch.object(world, "window_surf", spec=True)
     window = mocker.patch.object(world, "window", spec=True)
 
     world.render()
 
-    screen.fill.assert_called_once_with((135, 206, 235))
+    screen.fill.assert_not_called()
     landscape.background.draw.assert_called_once_with(screen=screen)
-    dog.draw.assert_called_once_with(screen=screen)
+    screen.fblits.assert_called_once_with(get_blits.return_value)
     landscape.foreground.draw.assert_called_once_with(screen=screen)
     window_surf.blit.assert_called_once_with(screen, (0, 0))
     window.flip.assert_called_once()
 
 
+def test_world_update_only_wakes_up_the_expired_brains(mocker, create_world):
+    clock = VirtualClock()
+    world = create_world(clock=clock, dogs=3)
+    for dog, countdown in zip(world.dogs, (30, 10, 20), strict=True):
+        dog.brain.change_state(StateID.SLEEP)
+        dog.brain.current_state.countdown = countdown
+        world.scheduler.schedule(dog.brain)
+    is_done = mocker.patch("doggo.dog.brain.State.is_done")
+
+    clock.advance(15)
+    world.get_dt()
+    world.update()
+
+    is_done.assert_not_called()
+    assert [dog.brain.current_state.started_at for dog in world.dogs] == [
+        0,
+        pytest.approx(15),
+        0,
+    ]
+    # The woken brain may have drawn a shorter state than the one left asleep.
+    assert world.scheduler.next_deadline == min(20, world.dogs[1].brain.deadline)
+
+
+def test_world_needs_at_least_one_dog(create_world):
+    with pytest.raises(AssertionError, match="at least one dog"):
+        create_world(dogs=0)
+
+
+def test_world_with_a_pack_of_dogs(mocker, create_world):
+    world = create_world(dogs=3)
+    for dog in world.dogs:
+        mocker.patch.object(dog, "update", spec=True)
+    world.dt = world.time_step
+
+    world.update()
+
+    assert len(world.dogs) == 3
+    assert world.dog is world.dogs[-1]
+    for dog in world.dogs:
+        dog.update.assert_called_once_with(dt=world.time_step, now=world.sim_now)
+
+
+def test_world_with_a_seed_is_reproducible(create_world):
+    def snapshot(world):
+        return [
+            (dog.body.fur, dog.x, dog.current_state, dog.brain.current_state.countdown)
+            for dog in world.dogs
+        ]
+
+    first = snapshot(create_world(dogs=3, seed=42))
+    second = snapshot(create_world(dogs=3, seed=42))
+
+    assert first == second
+
+
+def test_world_records_and_replays_the_transitions(tmp_path, create_world):
+    path = tmp_path.joinpath("run.rec")
+    recorder = TransitionRecorder(path=path)
+    world = create_world(dogs=2, recorder=recorder)
+    for dog in world.dogs:
+        dog.brain.transition(now=world.now)
+    recorder.close()
+    recorded = {
+        dog.brain.dog_id: (dog.current_state, dog.direction) for dog in world.dogs
+    }
+
+    player = TransitionPlayer(read_transitions(path))
+    world = create_world(dogs=2, player=player)
+    for dog in world.dogs:
+        dog.brain.transition(now=world.now)
+
+    assert recorder.count == 4
+    assert {
+        dog.brain.dog_id: (dog.current_state, dog.direction) for dog in world.dogs
+    } == recorded
+    assert len(player) == 0
+
+
+def test_world_hot_reloads_the_behavior_profile_into_the_brains(mocker, create_world):
+    watcher = mocker.Mock(spec=ProfileWatcher)
+    world = create_world(dogs=2, watcher=watcher)
+    profile = get_behavior()
+    watcher.poll.return_value = profile
+    reloads = [mocker.patch.object(dog.brain, "reload") for dog in world.dogs]
+
+    world.update()
+
+    for reload in reloads:
+        reload.assert_called_once_with(
+            state_configs=profile.state_configs, transitions=profile.transitions
+        )
+
+
+def test_world_draws_all_the_dogs_in_one_batch_by_depth(mocker, create_world):
+    world = create_world(dogs=3)
+    for dog in world.dogs:
+        dog.clone.visible = False
+    screen = mocker.patch.object(world, "screen", spec=True)
+    mocker.patch.object(world, "landscape", spec=True)
+    mocker.patch.object(world, "window_surf", spec=True)
+    mocker.patch.object(world, "window", spec=True)
+
+    world.render()
+
+    screen.fblits.assert_called_once_with([(dog.image, dog.rect) for dog in world.dogs])
+
+
+def test_world_idle_time_is_the_one_of_the_next_changing_dog(create_world):
+    clock = VirtualClock()
+    world = create_world(clock=clock, dogs=3)
+    for dog, countdown in zip(world.dogs, (30, 10, 20), strict=True):
+        dog.brain.change_state(StateID.SLEEP)
+        dog.brain.current_state.countdown = countdown
+        world.scheduler.schedule(dog.brain)
+    world.visible = False
+
+    assert world.get_idle_time() == 10
+
+
+def test_world_render_dirty_draws_the_whole_world_first(mocker, create_world):
+    world = create_world(dirty_rects=True)
+    window_surf = mocker.patch.object(world, "window_surf", spec=True)
+    window = mocker.patch.object(world, "window", spec=True)
+    screen_rect = world.screen.get_rect()
+
+    world.render()
+
+    window_surf.blit.assert_called_once_with(
+        world.screen, screen_rect, area=screen_rect
+    )
+    window.flip.assert_called_once()
+
+
+def test_world_render_dirty_skips_unchanged_frames(mocker, create_world):
+    world = create_world(dirty_rects=True)
+    window = mocker.patch.object(world, "window", spec=True)
+
+    world.render()
+    world.render()
+
+    window.flip.assert_called_once()
+
+
+def test_world_render_dirty_only_pushes_changed_areas(mocker, create_world):
+    world = create_world(dirty_rects=True)
+    world.dog.rect.x = 100
+    world.dog.clone.visible = False
+    window = mocker.patch.object(world, "window", spec=True)
+    world.render()
+    window_surf = mocker.patch.object(world, "window_surf", spec=True)
+    previous_rect = world.dog.rect.copy()
+
+    world.dog.rect.x += 5
+    world.render()
+
+    assert window_surf.blit.call_args_list == [
+        mocker.call(world.screen, previous_rect, area=previous_rect),
+        mocker.call(world.screen, world.dog.rect, area=world.dog.rect),
+    ]
+    assert window.flip.call_count == 2
+
+
+def test_world_render_dirty_redraws_everything_when_invalidated(mocker, create_world):
+    world = create_world(dirty_rects=True)
+    window = mocker.patch.object(world, "window", spec=True)
+    world.render()
+
+    world.invalidate()
+    world.render()
+
+    assert window.flip.call_count == 2
+
+
 def test_world_start(mocker, create_world):
     world = create_world()
     run = mocker.patch.object(world, "run", spec=True)
@@ -129,7 +418,7 @@ def test_world_run_game_loop(mocker, create_world):
     process_inputs = mocker.patch.object(world, "process_inputs", spec=True)
     update = mocker.patch.object(world, "update", spec=True)
     render = mocker.patch.object(world, "render", spec=True)
-    clock = mocker.patch.object(world, "clock", spec=True)
+    wait = mocker.patch.object(world, "wait", spec=True)
     destroy = mocker.patch.object(world, "destroy", spec=True)
 
     world.run()
@@ -138,10 +427,153 @@ def test_world_run_game_loop(mocker, create_world):
     process_inputs.assert_called_once()
     update.assert_called_once()
     render.assert_called_once()
-    clock.tick.assert_called_once_with(world.fps)
+    wait.assert_called_once()
     destroy.assert_called_once()
 
 
+def test_world_run_game_loop_does_not_render_when_hidden(mocker, create_world):
+    world = create_world()
+    world.visible = False
+    mocker.patch.object(world, "is_running", side_effect=[True, False])
+    mocker.patch.object(world, "process_inputs", spec=True)
+    mocker.patch.object(world, "wait", spec=True)
+    mocker.patch.object(world, "destroy", spec=True)
+    render = mocker.patch.object(world, "render", spec=True)
+
+    world.run()
+
+    render.assert_not_called()
+
+
+def test_world_run_profiled_game_loop(mocker, create_world):
+    world = create_world(profiler=FrameProfiler(budget=1 / 30))
+    mocker.patch.object(world, "is_running", side_effect=[True, True, False])
+    for method in ("get_dt", "process_inputs", "update", "render", "wait"):
+        mocker.patch.object(world, method, spec=True)
+    mocker.patch.object(world, "destroy", spec=True)
+    log_info = mocker.patch("doggo.world.logger.info")
+
+    world.run()
+
+    assert world.profiler.frames == 2
+    world.render.assert_called()
+    log_info.assert_called_once_with("Frame profile:\n{}", world.profiler.report())
+
+
+@pytest.mark.parametrize(
+    "event, visible",
+    [
+        (pg.event.Event(pg.WINDOWMINIMIZED), False),
+        (pg.event.Event(pg.WINDOWHIDDEN), False),
+        (pg.event.Event(pg.WINDOWRESTORED), True),
+        (pg.event.Event(pg.WINDOWSHOWN), True),
+    ],
+)
+def test_world_visibility_follows_window_events(mocker, create_world, event, visible):
+    mocker.patch("pygame.event.get", return_value=[event])
+    world = create_world()
+    world.visible = not visible
+
+    world.process_inputs()
+
+    assert world.visible is visible
+
+
+def test_world_blocks_the_events_it_never_handles(create_world):
+    create_world()
+
+    assert pg.event.get_blocked(pg.KEYUP)
+    assert pg.event.get_blocked(pg.MOUSEWHEEL)
+    assert pg.event.get_blocked(pg.MOUSEMOTION)
+    assert not pg.event.get_blocked(pg.QUIT)
+    assert not pg.event.get_blocked(pg.MOUSEBUTTONDOWN)
+
+
+def test_world_allows_the_mouse_motions_only_while_dragging(
+    mocker, create_world, pg_mouse_mock
+):
+    pg_mouse_mock.get_pos.return_value = (0, 0)
+    world = create_world()
+    get = mocker.patch("pygame.event.get")
+
+    get.return_value = [
+        pg.event.Event(pg.MOUSEBUTTONDOWN, button=pg.BUTTON_LEFT, pos=(0, 0))
+    ]
+    world.process_inputs()
+
+    assert not pg.event.get_blocked(pg.MOUSEMOTION)
+
+    get.return_value = [pg.event.Event(pg.MOUSEBUTTONUP)]
+    world.process_inputs()
+
+    assert pg.event.get_blocked(pg.MOUSEMOTION)
+
+
+def test_world_wait_ticks_at_frame_rate_while_the_dog_moves(mocker, create_world):
+    world = create_world(clock=VirtualClock())
+    world.dog.brain.change_state(StateID.WALK)
+    clock = mocker.patch.object(world, "clock", spec=True)
+    event_wait = mocker.patch("pygame.event.wait")
+
+    world.wait()
+
+    clock.tick.assert_called_once_with(world.fps)
+    event_wait.assert_not_called()
+
+
+def test_world_wait_sleeps_until_the_next_animation_frame(mocker, create_world):
+    clock = VirtualClock()
+    world = create_world(clock=clock)
+    world.dog.brain.change_state(StateID.SLEEP)
+    world.dog.brain.current_state.countdown = 10
+    clock.advance(0.05)
+    world.get_dt()
+    world.update()
+    clock = mocker.patch.object(world, "clock", spec=True)
+    event_wait = mocker.patch(
+        "pygame.event.wait", return_value=pg.event.Event(pg.NOEVENT)
+    )
+
+    world.wait()
+
+    clock.tick.assert_not_called()
+    event_wait.assert_called_once_with(150)  # SLEEP animation rate is 0.2s.
+
+
+def test_world_wait_sleeps_until_the_next_state_when_hidden(mocker, create_world):
+    world = create_world(clock=VirtualClock())
+    world.dog.brain.change_state(StateID.WALK)
+    world.dog.brain.current_state.countdown = 3
+    world.scheduler.schedule(world.dog.brain)
+    world.visible = False
+    event_wait = mocker.patch(
+        "pygame.event.wait", return_value=pg.event.Event(pg.NOEVENT)
+    )
+
+    world.wait()
+
+    event_wait.assert_called_once_with(3000)
+
+
+def test_world_handles_the_waking_event_first(mocker, create_world, pg_mouse_mock):
+    pg_mouse_mock.get_pos.return_value = (0, 0)
+    world = create_world(clock=VirtualClock())
+    world.dog.brain.change_state(StateID.SLEEP)
+    button_down = pg.event.Event(pg.MOUSEBUTTONDOWN, button=pg.BUTTON_RIGHT, pos=(0, 0))
+    button_up = pg.event.Event(pg.MOUSEBUTTONUP, button=pg.BUTTON_RIGHT, pos=(0, 0))
+    mocker.patch("pygame.event.wait", return_value=button_down)
+    mocker.patch("pygame.event.get", return_value=[button_up])
+    process_event = mocker.spy(world.draggable, "process_event")
+
+    world.wait()
+    world.process_inputs()
+
+    events = [call.kwargs["event"] for call in process_event.call_args_list]
+    assert events == [button_down, button_up]
+    assert not world.draggable.dragged
+    assert pg.event.get_blocked(pg.MOUSEMOTION)
+
+
 @pytest.mark.parametrize("raise_exception", [KeyboardInterrupt, Exception])
 def test_world_run_initializes_dedstruction_on_exception(
     mocker, create_world, raise_exception
@@ -176,3 +608,31 @@ def test_world_destroy(mocker, create_world):
 
     pg_quit.assert_called_once()
     sys_exit.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "render_size, prescale, factor",
+    [(None, True, 1), ((680, 212), True, 1), ((680, 212), False, 2)],
+)
+def test_world_clicked_dog_barks(
+    mocker, create_world, pg_mouse_mock, render_size, prescale, factor
+):
+    pg_mouse_mock.get_pos.return_value = (0, 0)
+    world = create_world(render_size=render_size, prescale=prescale)
+    dog = world.dog
+    dog.clone.visible = False
+    dog.brain.change_state(StateID.SLEEP, now=world.sim_now)
+    mask = dog.body.get_mask(brain=dog.brain, now=dog.sampled_at)
+    x, y = mask.outline()[0]
+    rect = dog.to_screen(dog.rect)
+    pos = ((rect.x + x) * factor, (rect.y + y) * factor)
+    mocker.patch(
+        "pygame.event.get",
+        return_value=[
+            pg.event.Event(pg.MOUSEBUTTONDOWN, button=pg.BUTTON_LEFT, pos=pos),
+        ],
+    )
+
+    world.process_inputs()
+
+    assert dog.current_state == StateID.STAND_AND_BARK